@@ -0,0 +1,84 @@
+"""
+LogEvent serialization: the original to_dict + json.dumps / LogEvent(**dict) path
+against the codec module (JSONL and binary records).
+
+    python benchmarks/bench_codec.py [--events N]
+"""
+
+import argparse
+import io
+import json
+import timeit
+from datetime import datetime, timedelta
+
+from bumpers.logging import codec
+from bumpers.logging.base import LogEvent
+
+
+def make_events(count):
+    start = datetime(2024, 3, 1, 7, 13, 5, 123456)
+    return [
+        LogEvent(
+            timestamp=start + timedelta(milliseconds=i),
+            event_type="validation" if i % 4 else "intervention",
+            validation_point="pre_action",
+            validator_name="content_filter",
+            status="pass" if i % 3 else "fail",
+            message="Found forbidden words: ['rm -rf']" if i % 3 == 0 else "ok",
+            context={"action": "shell", "action_input": "ls -la /tmp " * 8, "turn": i,
+                     "intervention_type": "block_action"}
+        )
+        for i in range(count)
+    ]
+
+
+def baseline_encode(events):
+    return ''.join(json.dumps(event.to_dict()) + '\n' for event in events)
+
+
+def baseline_decode(data):
+    events = []
+    for line in data.splitlines():
+        event_dict = json.loads(line)
+        event_dict['timestamp'] = datetime.fromisoformat(event_dict['timestamp'])
+        events.append(LogEvent(**event_dict))
+    return events
+
+
+def codec_decode_lines(data):
+    return [codec.decode_event(line) for line in data.splitlines()]
+
+
+def codec_decode_records(data):
+    return [codec.decode_record(payload) for payload in codec.iter_records(io.BytesIO(data))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+    baseline_data = baseline_encode(events)
+    lines_data = codec.encode_lines(events)
+    records_data = codec.encode_records(events)
+
+    cases = [
+        ("encode  baseline json", lambda: baseline_encode(events), len(baseline_data)),
+        (f"encode  codec jsonl ({codec.BACKEND})", lambda: codec.encode_lines(events), len(lines_data)),
+        (f"encode  codec binary ({codec.BACKEND})", lambda: codec.encode_records(events), len(records_data)),
+        ("decode  baseline json", lambda: baseline_decode(baseline_data), None),
+        (f"decode  codec jsonl ({codec.BACKEND})", lambda: codec_decode_lines(lines_data), None),
+        (f"decode  codec binary ({codec.BACKEND})", lambda: codec_decode_records(records_data), None),
+    ]
+    print(f"{args.events} events, best of {args.repeat}")
+    for name, fn, size in cases:
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        per_event = best / args.events * 1e6
+        size_note = f"  {size / args.events:.0f} B/event" if size else ""
+        print(f"{name:<34} {best * 1000:8.1f} ms  {per_event:6.2f} us/event{size_note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Cold-start import cost of bumpers entry points, measured with ``python -X importtime``.
+
+Each target is imported in a fresh interpreter. Reports the cumulative import time of
+the target and of its slowest dependencies, and fails (exit 1) if a lightweight entry
+point pulls in one of the heavy optional backends.
+
+    python benchmarks/bench_import.py [--top N] [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Entry points that must stay free of heavy optional backends
+TARGETS = {
+    "bumpers": (),
+    "bumpers.core": (),
+    "bumpers.validators": ("google.generativeai", "PIL", "numpy"),
+    "bumpers.integrations": ("langchain", "openai"),
+    "bumpers.policy": ("google.generativeai", "PIL", "numpy"),
+    "bumpers.monitoring": (),
+    "bumpers.analytics": ("pyarrow",),
+}
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def measure(target):
+    """(cumulative us per module, modules loaded) for one cold import of ``target``"""
+    code = f"import sys, {target}; print(','.join(sorted(sys.modules)))"
+    env = dict(os.environ, PYTHONPATH=SRC + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, check=True
+    )
+    # importtime prints each module after its dependencies, nested ones indented; keep
+    # the block that ends with the target's own top-level line
+    cumulative, block = {}, {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, total, name = line[len("import time:"):].split("|")
+        block[name.strip()] = int(total)
+        if name.startswith(" ") and not name.startswith("  "):  # top level
+            if name.strip() == target.split(".")[0] or name.strip() == target:
+                cumulative.update(block)
+            block = {}
+    return cumulative, set(proc.stdout.strip().split(","))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--top", type=int, default=5, help="slowest dependencies to list")
+    parser.add_argument("--runs", type=int, default=3, help="cold imports per target (median)")
+    args = parser.parse_args()
+
+    failed = False
+    for target, forbidden in TARGETS.items():
+        runs = [measure(target) for _ in range(args.runs)]
+        total = statistics.median(run[0].get(target, 0) for run in runs)
+        cumulative, modules = runs[-1]
+        print(f"{target:<24} {total / 1000:8.1f} ms")
+        slowest = sorted(
+            ((us, name) for name, us in cumulative.items() if name != target),
+            reverse=True
+        )[:args.top]
+        for us, name in slowest:
+            print(f"    {name:<40} {us / 1000:8.1f} ms")
+        loaded = [m for m in forbidden if m in modules]
+        if loaded:
+            failed = True
+            print(f"    ERROR: imports heavy backends {loaded}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
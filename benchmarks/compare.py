@@ -0,0 +1,98 @@
+"""
+Regression report between two pytest-benchmark runs.
+
+    pytest benchmarks --benchmark-autosave        # baseline
+    ...change code...
+    pytest benchmarks --benchmark-autosave        # candidate
+    python benchmarks/compare.py                  # last two saved runs
+    python benchmarks/compare.py base.json new.json --threshold 0.1 --stat median
+
+Exits with status 1 when any benchmark slowed down by more than the threshold.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+
+
+def load(path):
+    with open(path) as f:
+        data = json.load(f)
+    return {bench['fullname']: bench['stats'] for bench in data['benchmarks']}
+
+
+def latest_runs(storage=".benchmarks", count=2):
+    runs = sorted(
+        glob.glob(os.path.join(storage, "*", "*.json")),
+        key=lambda path: os.path.basename(path)
+    )
+    if len(runs) < count:
+        raise SystemExit(f"Need {count} saved runs in {storage}, found {len(runs)}; "
+                         "run `pytest benchmarks --benchmark-autosave` first")
+    return runs[-count:]
+
+
+def compare(baseline, candidate, stat="median", threshold=0.1):
+    """Return rows of (name, baseline, candidate, relative change, verdict)"""
+    rows = []
+    for name in sorted(set(baseline) | set(candidate)):
+        if name not in candidate:
+            rows.append((name, baseline[name][stat], None, None, "removed"))
+        elif name not in baseline:
+            rows.append((name, None, candidate[name][stat], None, "new"))
+        else:
+            before, after = baseline[name][stat], candidate[name][stat]
+            change = (after - before) / before if before else 0.0
+            if change > threshold:
+                verdict = "REGRESSION"
+            elif change < -threshold:
+                verdict = "improved"
+            else:
+                verdict = ""
+            rows.append((name, before, after, change, verdict))
+    return rows
+
+
+def _format_time(seconds):
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("runs", nargs="*", help="Baseline and candidate JSON files (default: last two saved runs)")
+    parser.add_argument("--storage", default=".benchmarks", help="pytest-benchmark storage directory")
+    parser.add_argument("--stat", default="median", choices=["min", "median", "mean", "max"])
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    if len(args.runs) == 2:
+        base_path, new_path = args.runs
+    elif not args.runs:
+        base_path, new_path = latest_runs(args.storage)
+    else:
+        parser.error("pass either no runs or exactly two")
+
+    rows = compare(load(base_path), load(new_path), args.stat, args.threshold)
+    width = max(len(row[0]) for row in rows) if rows else 10
+    print(f"baseline:  {base_path}\ncandidate: {new_path}\n({args.stat}, threshold {args.threshold:.0%})\n")
+    print(f"{'benchmark':<{width}}  {'baseline':>10}  {'candidate':>10}  {'change':>8}")
+    for name, before, after, change, verdict in rows:
+        change_text = f"{change:+.1%}" if change is not None else "-"
+        print(f"{name:<{width}}  {_format_time(before):>10}  {_format_time(after):>10}  {change_text:>8}  {verdict}")
+
+    regressions = [row for row in rows if row[4] == "REGRESSION"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
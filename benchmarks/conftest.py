@@ -0,0 +1,103 @@
+"""
+Shared fixtures for the benchmark suite.
+
+    pytest benchmarks --benchmark-autosave             # record a run
+    python benchmarks/compare.py                       # compare the last two saved runs
+
+BUMPERS_BENCH_EVENTS scales the analytics benchmarks (default 10**6 events).
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+from io import BytesIO
+
+import pytest
+
+from bumpers.logging.base import BaseLogger, LogEvent
+
+BENCH_EVENTS = int(os.environ.get("BUMPERS_BENCH_EVENTS", 10**6))
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGemini:
+    """Stand-in for genai.GenerativeModel that sleeps ``latency`` seconds per call"""
+
+    def __init__(self, latency=0.0, text='```json\n{"is_safe": true, "concerns": []}\n```'):
+        self.latency = latency
+        self.text = text
+        self.calls = 0
+
+    def generate_content(self, parts):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return FakeResponse(self.text)
+
+
+class MemoryLogger(BaseLogger):
+    """In-memory logger so analytics benchmarks measure the analysis, not disk I/O"""
+
+    def __init__(self, events=None):
+        self.events = list(events or [])
+
+    def log_event(self, event):
+        self.events.append(event)
+
+    def get_events(self, start_time=None, end_time=None, event_type=None):
+        return [
+            e for e in self.events
+            if (not start_time or e.timestamp >= start_time)
+            and (not end_time or e.timestamp <= end_time)
+            and (not event_type or e.event_type == event_type)
+        ]
+
+
+def make_events(count, start=None, spacing=timedelta(milliseconds=50)):
+    """Deterministic mix of validation and intervention events sharing context dicts"""
+    start = start or datetime(2024, 3, 1)
+    contexts = [
+        {"action": action, "intervention_type": kind}
+        for action in ("search", "rm", "curl", "calculate")
+        for kind in ("block_action", "block_response")
+    ]
+    events = []
+    for i in range(count):
+        if i % 5:
+            status = "fail" if i % 7 == 0 else "pass"
+            events.append(LogEvent(
+                timestamp=start + i * spacing,
+                event_type="validation",
+                validation_point="pre_action" if i % 2 else "pre_output",
+                validator_name=("action_whitelist", "content_filter", "vision")[i % 3],
+                status=status,
+                message="Found forbidden words: ['secret']" if status == "fail" else "ok",
+                context=contexts[i % len(contexts)]
+            ))
+        else:
+            events.append(LogEvent(
+                timestamp=start + i * spacing,
+                event_type="intervention",
+                validation_point="pre_action",
+                validator_name="action_whitelist",
+                status="intervention",
+                message="Intervention triggered: block_action",
+                context=contexts[i % len(contexts)]
+            ))
+    return events
+
+
+def png(size=(1280, 800), color=(240, 240, 240)):
+    from PIL import Image
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="session")
+def bench_events():
+    return make_events(BENCH_EVENTS)
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+from bumpers.analytics import BumpersAnalyzer, RollupStore
+from bumpers.monitoring import (
+    AlertCondition,
+    BumpersMonitor,
+    create_high_failure_rate_condition,
+    create_repeated_intervention_condition
+)
+
+from conftest import MemoryLogger, make_events
+
+
+def test_analyzer_raw(benchmark, bench_events):
+    analyzer = BumpersAnalyzer(MemoryLogger(bench_events))
+
+    benchmark.extra_info["events"] = len(bench_events)
+    stats = benchmark.pedantic(analyzer.get_validation_stats, rounds=3, iterations=1)
+    assert stats["total_validations"]
+
+
+def test_analyzer_rollups(benchmark, bench_events):
+    rollups = RollupStore(since=bench_events[0].timestamp, retention={"minute": None, "hour": None})
+    for event in bench_events:
+        rollups.observe(event)
+    logger = MemoryLogger(bench_events)
+    analyzer = BumpersAnalyzer(logger, rollups=rollups)
+    start = bench_events[0].timestamp + timedelta(seconds=30)
+    end = bench_events[-1].timestamp - timedelta(seconds=30)
+
+    benchmark.extra_info["events"] = len(bench_events)
+    stats = benchmark(analyzer.get_validation_stats, start, end)
+    assert stats["total_validations"]
+
+
+def _monitor(logger, streaming):
+    monitor = BumpersMonitor(logger, alert_handlers=[])
+    if streaming:
+        monitor.add_condition(create_high_failure_rate_condition(threshold=0.9))
+        monitor.add_condition(create_repeated_intervention_condition("rm", count=10**9))
+    else:
+        # The list-scanning form conditions took before streaming counters
+        monitor.add_condition(AlertCondition(
+            "failure_rate",
+            lambda events: sum(e.status == "fail" for e in events) > 10**9,
+            "unreachable"
+        ))
+    return monitor
+
+
+def test_monitor_tick_streaming(benchmark):
+    # An hour of history already consumed, then 1,000 new events per tick
+    now = datetime.now()
+    logger = MemoryLogger(make_events(36_000, start=now - timedelta(hours=1), spacing=timedelta(milliseconds=100)))
+    monitor = _monitor(logger, streaming=True)
+    monitor._check_conditions()
+    ticks = iter(range(1, 10**6))
+
+    def new_events():
+        # Each round gets a batch later than everything already consumed
+        tick_start = now + timedelta(seconds=next(ticks))
+        logger.events.extend(make_events(1_000, start=tick_start, spacing=timedelta(microseconds=10)))
+        return (), {}
+
+    benchmark.pedantic(monitor._check_conditions, setup=new_events, rounds=5, iterations=1)
+    assert monitor._newest >= now + timedelta(seconds=5)
+
+
+def test_monitor_tick_list_scan(benchmark):
+    now = datetime.now()
+    logger = MemoryLogger(make_events(36_000, start=now - timedelta(hours=1), spacing=timedelta(milliseconds=100)))
+    monitor = _monitor(logger, streaming=False)
+
+    benchmark.pedantic(monitor._check_conditions, rounds=5, iterations=1)
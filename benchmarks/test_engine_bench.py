@@ -0,0 +1,30 @@
+import pytest
+
+from bumpers.core.engine import CoreValidationEngine, ValidationPoint
+from bumpers.validators.action import ActionWhitelistValidator
+from bumpers.validators.content import ContentFilterValidator
+
+
+@pytest.mark.parametrize("validators", [1, 10, 100])
+def test_validate(benchmark, validators):
+    engine = CoreValidationEngine()
+    for i in range(validators):
+        engine.register_validator(
+            ActionWhitelistValidator(["search", "calculate"], name=f"whitelist_{i}"),
+            ValidationPoint.PRE_ACTION
+        )
+    context = {"action": "search", "action_input": "weather in Paris"}
+
+    results = benchmark(engine.validate, ValidationPoint.PRE_ACTION, context)
+    assert len(results) == validators
+
+
+@pytest.mark.parametrize("blocklist", [10, 1000, 100_000])
+@pytest.mark.parametrize("output_size", [1_000, 100_000])
+def test_content_filter(benchmark, blocklist, output_size):
+    validator = ContentFilterValidator(forbidden_words=[f"term{i:06d}" for i in range(blocklist)])
+    sentence = "the quick brown fox jumps over the lazy dog "
+    context = {"output": (sentence * (output_size // len(sentence) + 1))[:output_size]}
+
+    result = benchmark(validator.validate, context)
+    assert result.passed
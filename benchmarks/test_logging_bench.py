@@ -0,0 +1,36 @@
+import pytest
+
+from bumpers.logging.file_logger import FileLogger
+
+from conftest import make_events
+
+EVENTS = 10_000
+
+
+@pytest.mark.parametrize("format", ["jsonl", "binary"])
+@pytest.mark.parametrize("buffered", [False, True])
+def test_file_logger_write(benchmark, tmp_path_factory, format, buffered):
+    events = make_events(EVENTS)
+
+    def write():
+        logger = FileLogger(str(tmp_path_factory.mktemp("logs")), buffered=buffered, format=format)
+        for event in events:
+            logger.log_event(event)
+        logger.close()
+        return logger
+
+    benchmark.extra_info["events"] = EVENTS
+    benchmark.pedantic(write, rounds=3, iterations=1)
+
+
+@pytest.mark.parametrize("format", ["jsonl", "binary"])
+def test_file_logger_read(benchmark, tmp_path, format):
+    logger = FileLogger(str(tmp_path), buffered=True, format=format)
+    for event in make_events(EVENTS):
+        logger.log_event(event)
+    logger.flush()
+
+    benchmark.extra_info["events"] = EVENTS
+    events = benchmark.pedantic(logger.get_events, rounds=3, iterations=1)
+    assert len(events) == EVENTS
+    logger.close()
@@ -0,0 +1,46 @@
+import pytest
+
+from bumpers.core.engine import CoreValidationEngine, ValidationPoint
+from bumpers.validators.cache import LRUCache
+from bumpers.validators.vision import VisionValidator
+
+from conftest import FakeGemini, png
+
+
+def vision_validator(latency, **kwargs):
+    validator = VisionValidator("No login pages", api_key="benchmark", **kwargs)
+    validator.model = FakeGemini(latency=latency)
+    return validator
+
+
+@pytest.mark.parametrize("latency", [0.0, 0.02])
+def test_vision_validate_uncached(benchmark, latency):
+    validator = vision_validator(latency)
+    context = {"screenshot": png(), "action": "click"}
+
+    result = benchmark.pedantic(validator.validate, args=(context,), rounds=5, iterations=1)
+    assert result.passed
+
+
+def test_vision_validate_cache_hit(benchmark):
+    validator = vision_validator(0.02, cache=LRUCache())
+    context = {"screenshot": png(), "action": "click"}
+    validator.validate(context)
+
+    result = benchmark(validator.validate, context)
+    assert result.passed
+    assert validator.model.calls == 1
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_engine_with_vision_validators(benchmark, concurrent):
+    engine = CoreValidationEngine(concurrent=concurrent)
+    for i in range(4):
+        validator = vision_validator(0.02)
+        validator.name = f"vision_{i}"
+        engine.register_validator(validator, ValidationPoint.PRE_ACTION)
+    context = {"screenshot": png(), "action": "click"}
+
+    results = benchmark.pedantic(engine.validate, args=(ValidationPoint.PRE_ACTION, context), rounds=5, iterations=1)
+    assert len(results) == 4
+    engine.shutdown()
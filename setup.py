@@ -27,8 +27,15 @@ setup(
     extras_require={
         "dev": [
             "pytest",
+            "pytest-benchmark",
             "black",
             "flake8",
+        ],
+        "columnar": [
+            "pyarrow",
+        ],
+        "fast": [
+            "orjson",
         ]
     },
     classifiers=[
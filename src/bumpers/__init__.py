@@ -1,7 +1,7 @@
 """Bumpers - Safety guardrails for AI agents"""
 
-from .types import ValidationPoint, ValidationResult, FailStrategy
+from .types import ValidationPoint, ValidationResult, FailStrategy, CostTier, ContextView
 
 __version__ = "0.1.4"
 
-__all__ = ["ValidationPoint", "ValidationResult", "FailStrategy"] 
\ No newline at end of file
+__all__ = ["ValidationPoint", "ValidationResult", "FailStrategy", "CostTier", "ContextView"] 
\ No newline at end of file
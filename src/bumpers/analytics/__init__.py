@@ -1,3 +1,5 @@
 from .analyzer import BumpersAnalyzer
+from .columnar import ColumnarAnalyzer, export_events
+from .rollups import Rollup, RollupStore
 
-__all__ = ["BumpersAnalyzer"] 
\ No newline at end of file
+__all__ = ["BumpersAnalyzer", "ColumnarAnalyzer", "export_events", "Rollup", "RollupStore"] 
\ No newline at end of file
@@ -2,15 +2,34 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 from collections import Counter
 from ..logging.base import BaseLogger, LogEvent
+from .rollups import RollupStore
 
 class BumpersAnalyzer:
-    def __init__(self, logger: BaseLogger):
+    def __init__(self, logger: BaseLogger, rollups: Optional[RollupStore] = None):
+        """
+        Args:
+            logger: Logger holding the raw events
+            rollups: Pre-aggregated buckets fed from the same events; when given,
+                queries merge buckets and only read raw events at the window edges.
+                Queries without a start_time then cover events from ``rollups.since``.
+        """
         self.logger = logger
+        self.rollups = rollups
         
     def get_validation_stats(self, 
                            start_time: Optional[datetime] = None,
                            end_time: Optional[datetime] = None) -> Dict[str, Any]:
         """Generate statistics about validations"""
+        if self.rollups is not None:
+            rollup = self.rollups.query(start_time, end_time, raw=self.logger, event_type='validation')
+            return {
+                'total_validations': rollup.validations,
+                'failed_validations': rollup.failed_validations,
+                'validator_stats': rollup.validators,
+                'failure_reasons': rollup.failure_reasons,
+                'validation_points': rollup.validation_points
+            }
+
         events = self.logger.get_events(
             start_time=start_time,
             end_time=end_time,
@@ -33,6 +52,14 @@ class BumpersAnalyzer:
                                start_time: Optional[datetime] = None,
                                end_time: Optional[datetime] = None) -> Dict[str, Any]:
         """Analyze intervention patterns"""
+        if self.rollups is not None:
+            rollup = self.rollups.query(start_time, end_time, raw=self.logger, event_type='intervention')
+            return {
+                'total_interventions': rollup.interventions,
+                'intervention_types': rollup.intervention_types,
+                'blocked_actions': rollup.blocked_actions
+            }
+
         events = self.logger.get_events(
             start_time=start_time,
             end_time=end_time,
@@ -0,0 +1,259 @@
+import glob
+import hashlib
+import os
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from ..logging import codec
+from ..logging.base import LogEvent
+
+_FORMATS = ("parquet", "arrow")
+# FileLogger formats that can be exported
+_LOG_EXTENSIONS = (".jsonl", ".bin")
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.dataset
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Columnar export requires pyarrow; install it with `pip install bumpers[columnar]`"
+        ) from e
+    return pyarrow
+
+
+def event_schema():
+    """Arrow schema for exported events"""
+    pa = _pyarrow()
+    return pa.schema([
+        ("timestamp", pa.timestamp("us")),
+        ("event_type", pa.string()),
+        ("validation_point", pa.string()),
+        ("validator_name", pa.string()),
+        ("status", pa.string()),
+        ("message", pa.string()),
+        # Promoted from context so intervention stats never parse JSON
+        ("intervention_type", pa.string()),
+        ("action", pa.string()),
+        ("context", pa.string()),
+    ])
+
+
+def _columns() -> Dict[str, List[Any]]:
+    return {name: [] for name in event_schema().names}
+
+
+def _append(columns: Dict[str, List[Any]], event: LogEvent):
+    context = event.context or {}
+    columns['timestamp'].append(event.timestamp)
+    columns['event_type'].append(event.event_type)
+    columns['validation_point'].append(event.validation_point)
+    columns['validator_name'].append(event.validator_name)
+    columns['status'].append(event.status)
+    columns['message'].append(event.message)
+    intervention_type = context.get('intervention_type')
+    action = context.get('action')
+    columns['intervention_type'].append(intervention_type if isinstance(intervention_type, str) else None)
+    columns['action'].append(action if isinstance(action, str) else None)
+    columns['context'].append(codec.dumps(context).decode())
+
+
+def _read_log(path: str) -> Iterator[LogEvent]:
+    """Decode a JSONL or binary FileLogger log"""
+    with open(path, 'rb') as f:
+        if path.endswith(".bin"):
+            for payload in codec.iter_records(f):
+                yield codec.decode_record(payload)
+        else:
+            for line in f:
+                if line.strip():
+                    yield codec.decode_event(line)
+
+
+class _PartitionWriters:
+    """Open writer per date partition, each appending to one part file"""
+
+    def __init__(self, out_dir: str, fmt: str, part: str):
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.part = part
+        self._writers: Dict[str, Any] = {}
+        self.files: List[str] = []
+
+    def write(self, date: str, table):
+        pa = _pyarrow()
+        writer = self._writers.get(date)
+        if writer is None:
+            directory = os.path.join(self.out_dir, f"date={date}")
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{self.part}.{self.fmt}")
+            if self.fmt == "parquet":
+                writer = pa.parquet.ParquetWriter(path, table.schema, compression="zstd")
+            else:
+                writer = pa.ipc.new_file(path, table.schema)
+            self._writers[date] = writer
+            self.files.append(path)
+        writer.write_table(table)
+
+    def close(self):
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+
+def export_events(sources: Union[str, Iterable[str]],
+                  out_dir: str,
+                  format: str = "parquet",
+                  batch_size: int = 65536) -> List[str]:
+    """
+    Convert FileLogger logs (JSONL or binary) to a date-partitioned Parquet or Arrow IPC dataset.
+
+    Events are converted in batches of ``batch_size`` so memory stays bounded however
+    large the logs are. Output goes to ``out_dir/date=YYYY-MM-DD/<log name>-<path hash>.<format>``,
+    so queries filtered on time only open the partitions they need.
+
+    Args:
+        sources: A FileLogger log directory, a log file, or a list of log files
+        out_dir: Dataset root
+        format: "parquet" or "arrow"
+        batch_size: Events per record batch
+
+    Returns:
+        Paths of the files written
+    """
+    if format not in _FORMATS:
+        raise ValueError(f"format must be one of {_FORMATS}, got '{format}'")
+    pa = _pyarrow()
+    schema = event_schema()
+    if isinstance(sources, str):
+        if os.path.isdir(sources):
+            sources = sorted(
+                path for extension in _LOG_EXTENSIONS
+                for path in glob.glob(os.path.join(sources, f"*{extension}"))
+            )
+        else:
+            sources = [sources]
+
+    written = []
+    for source in sources:
+        # Logs from different directories may share a name; the path hash keeps their
+        # parts apart while re-exporting a log still replaces its own part
+        digest = hashlib.sha1(os.path.abspath(source).encode()).hexdigest()[:10]
+        part = f"{os.path.splitext(os.path.basename(source))[0]}-{digest}"
+        writers = _PartitionWriters(out_dir, format, part)
+
+        def flush(columns):
+            table = pa.table(columns, schema=schema)
+            dates = pa.compute.strftime(table['timestamp'], format="%Y-%m-%d")
+            for date in pa.compute.unique(dates).to_pylist():
+                writers.write(date, table.filter(pa.compute.equal(dates, date)))
+
+        try:
+            columns = _columns()
+            count = 0
+            for event in _read_log(source):
+                _append(columns, event)
+                count += 1
+                if count >= batch_size:
+                    flush(columns)
+                    columns, count = _columns(), 0
+            if count:
+                flush(columns)
+        finally:
+            writers.close()
+        written.extend(writers.files)
+    return written
+
+
+class ColumnarAnalyzer:
+    """
+    BumpersAnalyzer backend over a dataset written by export_events.
+
+    Stats are computed with vectorized Arrow column scans; only the columns a query
+    needs are read. Time filters also select ``date=`` partitions, so files of days
+    outside the window are never opened, and the remaining filters are pushed down
+    to the files.
+
+    Args:
+        path: Dataset root written by export_events
+        format: "parquet" or "arrow"
+    """
+
+    def __init__(self, path: str, format: str = "parquet"):
+        if format not in _FORMATS:
+            raise ValueError(f"format must be one of {_FORMATS}, got '{format}'")
+        pa = _pyarrow()
+        self.path = path
+        self.dataset = pa.dataset.dataset(
+            path,
+            format="ipc" if format == "arrow" else "parquet",
+            schema=event_schema().append(pa.field("date", pa.string())),
+            partitioning=pa.dataset.partitioning(pa.schema([("date", pa.string())]), flavor="hive"),
+            exclude_invalid_files=True
+        )
+
+    @staticmethod
+    def _filter(event_type: str, start_time: Optional[datetime], end_time: Optional[datetime]):
+        pa = _pyarrow()
+        field = pa.dataset.field
+        expression = field("event_type") == event_type
+        # ISO dates order like the days they name, so the partition key prunes by string
+        if start_time:
+            expression &= field("date") >= start_time.date().isoformat()
+            expression &= field("timestamp") >= pa.scalar(start_time, type=pa.timestamp("us"))
+        if end_time:
+            expression &= field("date") <= end_time.date().isoformat()
+            expression &= field("timestamp") <= pa.scalar(end_time, type=pa.timestamp("us"))
+        return expression
+
+    def _scan(self,
+              columns: List[str],
+              event_type: str,
+              start_time: Optional[datetime],
+              end_time: Optional[datetime]):
+        return self.dataset.to_table(
+            columns=columns, filter=self._filter(event_type, start_time, end_time)
+        )
+
+    @staticmethod
+    def _value_counts(column) -> Counter:
+        pa = _pyarrow()
+        counts = pa.compute.value_counts(column)
+        return Counter(dict(zip(
+            counts.field("values").to_pylist(), counts.field("counts").to_pylist()
+        )))
+
+    def get_validation_stats(self,
+                             start_time: Optional[datetime] = None,
+                             end_time: Optional[datetime] = None) -> Dict[str, Any]:
+        """Generate statistics about validations"""
+        pa = _pyarrow()
+        table = self._scan(
+            ["validator_name", "validation_point", "status", "message"],
+            'validation', start_time, end_time
+        )
+        failed = pa.compute.equal(table['status'], 'fail')
+        return {
+            'total_validations': table.num_rows,
+            'failed_validations': pa.compute.sum(failed).as_py() or 0,
+            'validator_stats': self._value_counts(table['validator_name']),
+            'failure_reasons': self._value_counts(table.filter(failed)['message']),
+            'validation_points': self._value_counts(table['validation_point'])
+        }
+
+    def get_intervention_summary(self,
+                                 start_time: Optional[datetime] = None,
+                                 end_time: Optional[datetime] = None) -> Dict[str, Any]:
+        """Analyze intervention patterns"""
+        pa = _pyarrow()
+        table = self._scan(["intervention_type", "action"], 'intervention', start_time, end_time)
+        blocked = pa.compute.equal(table['intervention_type'], 'block_action')
+        return {
+            'total_interventions': table.num_rows,
+            'intervention_types': self._value_counts(table['intervention_type']),
+            'blocked_actions': self._value_counts(table.filter(blocked)['action'])
+        }
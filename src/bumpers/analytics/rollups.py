@@ -0,0 +1,229 @@
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..logging.base import BaseLogger, LogEvent, event_datetime
+
+_MICROSECOND = timedelta(microseconds=1)
+
+# Finest to coarsest
+GRANULARITIES = ("minute", "hour", "day")
+
+_DEFAULT_RETENTION = {
+    "minute": timedelta(days=2),
+    "hour": timedelta(days=60),
+    "day": None,
+}
+
+
+def _floor(timestamp: datetime, granularity: str) -> datetime:
+    if granularity == "minute":
+        return timestamp.replace(second=0, microsecond=0)
+    if granularity == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _span(granularity: str) -> timedelta:
+    return {"minute": timedelta(minutes=1), "hour": timedelta(hours=1), "day": timedelta(days=1)}[granularity]
+
+
+def _ceil(timestamp: datetime, granularity: str) -> datetime:
+    floor = _floor(timestamp, granularity)
+    return floor if floor == timestamp else floor + _span(granularity)
+
+
+class Rollup:
+    """Aggregate counts for the events in one time bucket (or a merge of several)"""
+
+    __slots__ = ("validations", "failed_validations", "validators", "failure_reasons",
+                 "validation_points", "interventions", "intervention_types", "blocked_actions")
+
+    def __init__(self):
+        self.validations = 0
+        self.failed_validations = 0
+        self.validators: Counter = Counter()
+        self.failure_reasons: Counter = Counter()
+        self.validation_points: Counter = Counter()
+        self.interventions = 0
+        self.intervention_types: Counter = Counter()
+        self.blocked_actions: Counter = Counter()
+
+    def add(self, event: LogEvent):
+        if event.event_type == 'validation':
+            self.validations += 1
+            self.validators[event.validator_name] += 1
+            self.validation_points[event.validation_point] += 1
+            if event.status == 'fail':
+                self.failed_validations += 1
+                self.failure_reasons[event.message] += 1
+        elif event.event_type == 'intervention':
+            intervention_type = event.context.get('intervention_type')
+            self.interventions += 1
+            self.intervention_types[intervention_type] += 1
+            if intervention_type == 'block_action':
+                self.blocked_actions[event.context.get('action')] += 1
+
+    def merge(self, other: 'Rollup'):
+        self.validations += other.validations
+        self.failed_validations += other.failed_validations
+        self.validators.update(other.validators)
+        self.failure_reasons.update(other.failure_reasons)
+        self.validation_points.update(other.validation_points)
+        self.interventions += other.interventions
+        self.intervention_types.update(other.intervention_types)
+        self.blocked_actions.update(other.blocked_actions)
+
+
+class RollupStore:
+    """
+    Per-minute, per-hour and per-day aggregates maintained as events are logged.
+
+    Feed it every event, e.g. ``bus.subscribe(rollups.observe)``. A query is split into
+    the coarsest buckets that fit inside the window (whole days, then hours, then
+    minutes at the edges). Only the sub-minute edges, and any span older than the
+    retention of the granularity it needs, are read back from the raw logger, so a
+    week-long query merges a handful of buckets whatever the event volume.
+
+    Args:
+        since: Time from which every event has been observed; defaults to now
+        retention: How long to keep buckets of each granularity (None keeps them forever)
+    """
+
+    def __init__(self,
+                 since: Optional[datetime] = None,
+                 retention: Optional[Dict[str, Optional[timedelta]]] = None):
+        self.since = since or datetime.now()
+        self.retention = dict(_DEFAULT_RETENTION, **(retention or {}))
+        self._buckets: Dict[str, Dict[datetime, Rollup]] = {g: {} for g in GRANULARITIES}
+        # Earliest bucket start per granularity that holds complete counts
+        self._valid_from = {g: _ceil(self.since, g) for g in GRANULARITIES}
+        self._latest: Optional[datetime] = None
+        self._last_prune: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def observe(self, event: LogEvent):
+        """Add one event to its minute, hour and day buckets"""
+        timestamp = event_datetime(event)
+        if timestamp < self.since:
+            return
+        with self._lock:
+            for granularity in GRANULARITIES:
+                buckets = self._buckets[granularity]
+                start = _floor(timestamp, granularity)
+                rollup = buckets.get(start)
+                if rollup is None:
+                    rollup = buckets[start] = Rollup()
+                rollup.add(event)
+            if self._latest is None or timestamp > self._latest:
+                self._latest = timestamp
+                hour = _floor(timestamp, "hour")
+                if hour != self._last_prune:
+                    self._last_prune = hour
+                    self._prune(timestamp)
+
+    def backfill(self, logger: BaseLogger, since: datetime):
+        """Build buckets from events already in a logger, making rollups complete from ``since``"""
+        previous = self.since
+        self.since = since
+        for event in logger.get_events(start_time=since, end_time=previous - _MICROSECOND):
+            self.observe(event)
+        with self._lock:
+            for granularity in GRANULARITIES:
+                # Spans already pruned stay invalid
+                if self._valid_from[granularity] == _ceil(previous, granularity):
+                    self._valid_from[granularity] = _ceil(since, granularity)
+
+    def _prune(self, now: datetime):
+        for granularity in GRANULARITIES:
+            keep = self.retention.get(granularity)
+            if keep is None:
+                continue
+            cutoff = _ceil(now - keep, granularity)
+            buckets = self._buckets[granularity]
+            for start in [s for s in buckets if s < cutoff]:
+                del buckets[start]
+            self._valid_from[granularity] = max(self._valid_from[granularity], cutoff)
+
+    def _cover(self,
+               start: datetime,
+               end: datetime,
+               level: int,
+               pieces: List[Tuple[str, datetime, datetime]]):
+        """Split [start, end) into bucket pieces at ``level`` or finer, and raw pieces"""
+        if start >= end:
+            return
+        if level < 0:
+            if pieces and pieces[-1][0] == "raw" and pieces[-1][2] == start:
+                pieces[-1] = ("raw", pieces[-1][1], end)
+            else:
+                pieces.append(("raw", start, end))
+            return
+        granularity = GRANULARITIES[level]
+        first = max(_ceil(start, granularity), self._valid_from[granularity])
+        last = _floor(end, granularity)
+        if first >= last:
+            self._cover(start, end, level - 1, pieces)
+            return
+        self._cover(start, first, level - 1, pieces)
+        pieces.append((granularity, first, last))
+        self._cover(last, end, level - 1, pieces)
+
+    def query(self,
+              start_time: Optional[datetime] = None,
+              end_time: Optional[datetime] = None,
+              raw: Optional[BaseLogger] = None,
+              event_type: Optional[str] = None) -> Rollup:
+        """
+        Aggregate events with start_time <= timestamp <= end_time.
+
+        Without a start_time the window starts at ``since``, so the raw logger is never
+        scanned for the events from before the store was complete. Pass an explicit
+        earlier start_time to include them, at the cost of reading them all back.
+
+        Args:
+            raw: Logger read for the parts of the window buckets cannot answer exactly;
+                without one those parts are left out
+            event_type: Restrict raw reads to this event type
+        """
+        with self._lock:
+            latest = self._latest
+        if end_time is None:
+            end = _ceil((latest or self.since) + _MICROSECOND, "minute")
+        else:
+            end = end_time + _MICROSECOND
+        start = start_time if start_time is not None else self.since
+
+        pieces: List[Tuple[str, datetime, datetime]] = []
+        with self._lock:
+            self._cover(start, end, len(GRANULARITIES) - 1, pieces)
+            total = Rollup()
+            for granularity, first, last in pieces:
+                if granularity != "raw":
+                    self._merge_range(total, granularity, first, last)
+
+        for granularity, first, last in pieces:
+            if granularity == "raw" and raw is not None:
+                self._merge_events(total, raw.get_events(
+                    start_time=first,
+                    end_time=last - _MICROSECOND,
+                    event_type=event_type
+                ))
+        return total
+
+    def _merge_range(self, total: Rollup, granularity: str, first: datetime, last: datetime):
+        buckets = self._buckets[granularity]
+        span = _span(granularity)
+        if (last - first) // span > len(buckets):
+            starts: Iterable[datetime] = (s for s in buckets if first <= s < last)
+        else:
+            starts = (first + i * span for i in range((last - first) // span))
+        for start in starts:
+            rollup = buckets.get(start)
+            if rollup is not None:
+                total.merge(rollup)
+
+    @staticmethod
+    def _merge_events(total: Rollup, events: Iterable[LogEvent]):
+        for event in events:
+            total.add(event)
@@ -1,3 +1,15 @@
+from .batch import BatchResults
 from .engine import CoreValidationEngine, ValidationPoint, ValidationResult, ValidationError
+from .metrics import EngineMetrics, LatencyHistogram, MetricsServer, SlowCallProfiler
 
-__all__ = ["CoreValidationEngine", "ValidationPoint", "ValidationResult", "ValidationError"] 
\ No newline at end of file
+__all__ = [
+    "CoreValidationEngine",
+    "ValidationPoint",
+    "ValidationResult",
+    "ValidationError",
+    "BatchResults",
+    "EngineMetrics",
+    "LatencyHistogram",
+    "MetricsServer",
+    "SlowCallProfiler"
+]
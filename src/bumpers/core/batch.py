@@ -0,0 +1,74 @@
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from ..types import ValidationPoint
+
+
+@dataclass
+class BatchResults:
+    """
+    Outcome of one validation point over many contexts, one row per context.
+
+    ``failed_by[i]`` is the index in ``validator_names`` of the validator that rejected
+    context ``i`` (the first to reject it, in registration order), or -1 if every
+    validator passed it. Messages and intervention types are only kept for rejected
+    rows, so a large mostly-passing batch costs a few bytes per context.
+    """
+    point: ValidationPoint
+    validator_names: Tuple[str, ...]
+    failed_by: array = field(default_factory=lambda: array('i'))
+    messages: Dict[int, str] = field(default_factory=dict)
+    intervention_types: Dict[int, str] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.failed_by)
+
+    @property
+    def passed(self) -> List[bool]:
+        return [index < 0 for index in self.failed_by]
+
+    @property
+    def blocked(self) -> List[int]:
+        """Rows that some validator rejected"""
+        return [row for row, index in enumerate(self.failed_by) if index >= 0]
+
+    def blocked_by(self, row: int) -> Optional[str]:
+        index = self.failed_by[row]
+        return self.validator_names[index] if index >= 0 else None
+
+    def counts(self) -> Counter:
+        """Number of rejections per validator name"""
+        return Counter(self.validator_names[index] for index in self.failed_by if index >= 0)
+
+    def row(self, row: int) -> Dict[str, Any]:
+        return {
+            'passed': self.failed_by[row] < 0,
+            'validator_name': self.blocked_by(row),
+            'message': self.messages.get(row),
+            'intervention_type': self.intervention_types.get(row)
+        }
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        for row in range(len(self)):
+            yield self.row(row)
+
+    def extend(self, other: 'BatchResults'):
+        """Append the rows of another batch run at the same point with the same validators"""
+        if other.point != self.point or other.validator_names != self.validator_names:
+            raise ValueError("Can only combine batches of the same point and validators")
+        offset = len(self.failed_by)
+        self.failed_by.extend(other.failed_by)
+        self.messages.update((offset + row, message) for row, message in other.messages.items())
+        self.intervention_types.update(
+            (offset + row, kind) for row, kind in other.intervention_types.items()
+        )
+
+    @classmethod
+    def concat(cls, parts: Sequence['BatchResults']) -> 'BatchResults':
+        if not parts:
+            raise ValueError("Nothing to combine")
+        combined = cls(parts[0].point, parts[0].validator_names)
+        for part in parts:
+            combined.extend(part)
+        return combined
@@ -1,25 +1,297 @@
-from typing import Dict, List, Optional, Any
+import asyncio
+import itertools
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 from datetime import datetime
 from ..logging.base import BaseLogger, LogEvent
-from ..types import ValidationPoint, ValidationResult, FailStrategy
+from ..types import ValidationPoint, ValidationResult, FailStrategy, CostTier, ContextView
+from .batch import BatchResults
+from .metrics import EngineMetrics, SlowCallProfiler
+from .stats import ValidatorStats
+
+# Context key under which validation and intervention events carry the id of the step
+# (one validate call) they belong to, so steps can be rebuilt from interleaved logs
+STEP_ID_KEY = 'bumpers_step_id'
 
 class ValidationError(Exception):
     def __init__(self, result: ValidationResult):
         self.result = result
         super().__init__(result.message)
 
+class _Outcome:
+    """
+    Decides who records a call that may time out: the worker that finishes it or the
+    caller that gives up on it. Whichever claims it first records it, exactly once.
+    """
+    __slots__ = ("_lock", "_claimed")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._claimed = False
+
+    def claim(self) -> bool:
+        with self._lock:
+            if self._claimed:
+                return False
+            self._claimed = True
+            return True
+
+
 class CoreValidationEngine:
-    def __init__(self, logger: Optional[BaseLogger] = None):
+    def __init__(self,
+                 logger: Optional[BaseLogger] = None,
+                 max_workers: int = 8,
+                 validator_timeout: Optional[float] = None,
+                 concurrent: bool = False,
+                 cost_aware: bool = False,
+                 reorder_interval: int = 100,
+                 metrics: Optional[EngineMetrics] = None,
+                 profiler: Optional[SlowCallProfiler] = None,
+                 shadow_workers: int = 2,
+                 max_shadow_pending: int = 1000):
+        """
+        Args:
+            logger: Optional logger that receives validation and intervention events
+            max_workers: Size of the thread pool used to run synchronous validators
+                concurrently (validate_async, or validate with concurrent=True)
+            validator_timeout: Default per-validator timeout in seconds for concurrent
+                execution. A validator's own ``timeout`` attribute takes precedence.
+            concurrent: Run the validators at a point in parallel in validate, returning
+                as soon as a failure arrives instead of paying for every call in sequence
+            cost_aware: Order each point's validators by cost tier, then by observed
+                latency per rejection, so cheap high-rejection checks run first. Concurrent
+                and async validation run one tier at a time and skip the remaining tiers
+                once a cheaper tier has rejected the input.
+            reorder_interval: With cost_aware, re-rank a point's validators every this many
+                validations using the latest statistics
+            metrics: Where to record per-validator latency histograms and outcome counts
+                (a fresh EngineMetrics by default; pass one to share it across engines)
+            profiler: Optional SlowCallProfiler that samples synchronous validator calls
+                under cProfile and keeps traces of slow ones
+            shadow_workers: Threads running shadow validators (see register_shadow_validator),
+                separate from the pool live validators run on
+            max_shadow_pending: Shadow runs allowed to wait for a thread; sampled runs
+                beyond this are dropped rather than queued without bound
+        """
+        # Copy-on-write: writers build a new mapping and swap the reference, so
+        # validation reads it without locking and in-flight runs keep their plan
         self._validators: Dict[ValidationPoint, List['BaseValidator']] = {
             point: [] for point in ValidationPoint
         }
+        self._registered: Dict[ValidationPoint, List['BaseValidator']] = {
+            point: [] for point in ValidationPoint
+        }
+        self._shadow: Dict[ValidationPoint, List[Tuple['BaseValidator', float]]] = {
+            point: [] for point in ValidationPoint
+        }
+        self._policy: Optional['CompiledPolicy'] = None
+        self._plan_lock = threading.Lock()
         self.logger = logger
-        
+        self.max_workers = max_workers
+        self.validator_timeout = validator_timeout
+        self.concurrent = concurrent
+        self.cost_aware = cost_aware
+        self.reorder_interval = reorder_interval
+        self.metrics = metrics if metrics is not None else EngineMetrics()
+        self.profiler = profiler
+        self._stats: Dict[Tuple[ValidationPoint, 'BaseValidator'], ValidatorStats] = {}
+        self._ordering: Dict[ValidationPoint, Tuple[List['BaseValidator'], int, List[List['BaseValidator']]]] = {}
+        self._validation_counts: Dict[ValidationPoint, int] = {point: 0 for point in ValidationPoint}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self.shadow_workers = shadow_workers
+        self.max_shadow_pending = max_shadow_pending
+        self.shadow_metrics = EngineMetrics()
+        self.shadow_dropped = 0
+        self._shadow_pending = 0
+        self._shadow_lock = threading.Lock()
+        self._shadow_executor: Optional[ThreadPoolExecutor] = None
+        # Step ids are unique across engines sharing a log: a random prefix per engine
+        self._step_prefix = uuid.uuid4().hex[:12]
+        self._step_counter = itertools.count(1)
+
+    def _next_step(self) -> str:
+        return f"{self._step_prefix}-{next(self._step_counter)}"
+
     def register_validator(self, validator: 'BaseValidator', point: ValidationPoint):
         """Register a validator to run at a specific validation point"""
-        self._validators[point].append(validator)
-        
-    def _log_validation(self, result: ValidationResult):
+        with self._plan_lock:
+            self._registered[point] = self._registered[point] + [validator]
+            self._rebuild_plan()
+
+    def register_shadow_validator(self,
+                                  validator: 'BaseValidator',
+                                  point: ValidationPoint,
+                                  sample_rate: float = 1.0):
+        """
+        Trial a validator on live traffic without enforcing it.
+
+        On a ``sample_rate`` fraction of validations at ``point``, a copy of the context is
+        handed to a background thread pool and the validation returns without waiting
+        for it. The shadow validator's verdict is logged as a 'shadow_validation' event
+        (a failure carries the intervention it would have triggered) and its latency and
+        outcomes are recorded in ``shadow_metrics``. It never raises, never blocks the
+        agent and is invisible to the live results, statistics and cost-aware ordering.
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        with self._plan_lock:
+            self._shadow = {**self._shadow, point: self._shadow[point] + [(validator, sample_rate)]}
+
+    def remove_shadow_validator(self, validator: 'BaseValidator', point: ValidationPoint):
+        """Stop trialling a shadow validator (e.g. once it is registered for enforcement)"""
+        with self._plan_lock:
+            self._shadow = {
+                **self._shadow,
+                point: [(v, rate) for v, rate in self._shadow[point] if v is not validator]
+            }
+
+    def apply_policy(self, policy: 'CompiledPolicy'):
+        """
+        Run a compiled policy's validators, replacing any previously applied policy.
+
+        The new plan is swapped in with a single reference assignment: validations already
+        in progress finish on the old plan and later ones see the new one. Validators added
+        with register_validator are kept and run after the policy's validators.
+        """
+        with self._plan_lock:
+            self._policy = policy
+            self._rebuild_plan()
+            # Drop statistics of validators that are no longer part of any plan
+            live = {(point, v) for point, validators in self._validators.items() for v in validators}
+            self._stats = {key: stats for key, stats in self._stats.items() if key in live}
+
+    @property
+    def policy(self) -> Optional['CompiledPolicy']:
+        """The compiled policy currently applied, if any"""
+        return self._policy
+
+    def _rebuild_plan(self):
+        plan = self._policy.plan if self._policy is not None else {}
+        self._validators = {
+            point: list(plan.get(point, ())) + self._registered[point]
+            for point in ValidationPoint
+        }
+
+    def _stats_for(self, point: ValidationPoint, validator: 'BaseValidator') -> ValidatorStats:
+        stats = self._stats.get((point, validator))
+        if stats is None:
+            stats = self._stats.setdefault((point, validator), ValidatorStats())
+        return stats
+
+    def get_validator_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Observed latency and failure rate per validator, keyed by '<point>:<validator name>'"""
+        return {
+            f"{point.value}:{validator.name}": stats.to_dict()
+            for (point, validator), stats in list(self._stats.items())
+        }
+
+    def _tiers(self, point: ValidationPoint) -> List[List['BaseValidator']]:
+        """Validators at ``point`` in execution order, grouped into cost tiers"""
+        validators = self._validators[point]
+        if not self.cost_aware:
+            return [list(validators)]
+
+        self._validation_counts[point] += 1
+        cached = self._ordering.get(point)
+        if (cached is None
+                or cached[0] is not validators
+                or cached[1] != len(validators)
+                or self._validation_counts[point] % self.reorder_interval == 0):
+            def tier(validator):
+                return getattr(validator, 'cost_tier', CostTier.CHEAP)
+
+            ordered = sorted(
+                validators,
+                key=lambda v: (tier(v), self._stats_for(point, v).score)
+            )
+            cached = (validators, len(validators), [list(group) for _, group in groupby(ordered, key=tier)])
+            self._ordering[point] = cached
+        return cached[2]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="bumpers-validator"
+                    )
+        return self._executor
+
+    def shutdown(self, wait: bool = True):
+        """Release the validator thread pools"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+            shadow_executor, self._shadow_executor = self._shadow_executor, None
+        for pool in (executor, shadow_executor):
+            if pool:
+                pool.shutdown(wait=wait)
+
+    def _get_shadow_executor(self) -> ThreadPoolExecutor:
+        executor = self._shadow_executor
+        if executor is None:
+            with self._executor_lock:
+                if self._shadow_executor is None:
+                    self._shadow_executor = ThreadPoolExecutor(
+                        max_workers=self.shadow_workers,
+                        thread_name_prefix="bumpers-shadow"
+                    )
+                executor = self._shadow_executor
+        return executor
+
+    def _dispatch_shadow(self, point: ValidationPoint, context: Dict[str, Any]):
+        """Hand a sample of validations to the shadow validators at ``point``; never waits"""
+        for validator, sample_rate in self._shadow[point]:
+            if sample_rate < 1.0 and random.random() >= sample_rate:
+                continue
+            with self._shadow_lock:
+                if self._shadow_pending >= self.max_shadow_pending:
+                    self.shadow_dropped += 1
+                    continue
+                self._shadow_pending += 1
+            try:
+                # Copied so later changes the agent makes to its context do not leak in
+                self._get_shadow_executor().submit(self._run_shadow, validator, point, dict(context))
+            except RuntimeError:  # engine shutting down
+                with self._shadow_lock:
+                    self._shadow_pending -= 1
+
+    def _run_shadow(self, validator: 'BaseValidator', point: ValidationPoint, context: Dict[str, Any]):
+        try:
+            error = None
+            started = time.perf_counter()
+            try:
+                result = validator.validate(context)
+                intervention_type = getattr(validator, 'intervention_type', 'block_action')
+            except Exception as e:
+                error = e
+                message = f"Validator failed with error: {str(e)}"
+                result, intervention_type = self._error_result(validator, point, context, message), 'error'
+            elapsed = time.perf_counter() - started
+            self.shadow_metrics.record(point.value, validator.name, elapsed, result.passed, error)
+            if self.logger:
+                self.logger.log_event(LogEvent(
+                    timestamp=datetime.now(),
+                    event_type='shadow_validation',
+                    validation_point=point.value,
+                    validator_name=validator.name,
+                    status='pass' if result.passed else 'fail',
+                    message=result.message,
+                    context=result.context if result.passed else ContextView(
+                        result.context, {'intervention_type': intervention_type}
+                    )
+                ))
+        finally:
+            with self._shadow_lock:
+                self._shadow_pending -= 1
+
+    def _log_validation(self, result: ValidationResult, step: str):
         if self.logger:
             self.logger.log_event(LogEvent(
                 timestamp=datetime.now(),
@@ -28,10 +300,10 @@ class CoreValidationEngine:
                 validator_name=result.validator_name,
                 status='pass' if result.passed else 'fail',
                 message=result.message,
-                context=result.context
+                context=ContextView(result.context, {STEP_ID_KEY: step})
             ))
-            
-    def _log_intervention(self, result: ValidationResult, intervention_type: str):
+
+    def _log_intervention(self, result: ValidationResult, intervention_type: str, step: str):
         if self.logger:
             self.logger.log_event(LogEvent(
                 timestamp=datetime.now(),
@@ -40,41 +312,282 @@ class CoreValidationEngine:
                 validator_name=result.validator_name,
                 status='intervention',
                 message=f"Intervention triggered: {intervention_type}",
-                context={
-                    **result.context,
-                    'intervention_type': intervention_type
-                }
+                context=ContextView(result.context, {'intervention_type': intervention_type,
+                                                     STEP_ID_KEY: step})
             ))
-    
+
+    def _error_result(self,
+                      validator: 'BaseValidator',
+                      point: ValidationPoint,
+                      context: Dict[str, Any],
+                      message: str) -> ValidationResult:
+        return ValidationResult(
+            passed=False,
+            message=message,
+            validator_name=validator.name,
+            validation_point=point,
+            context=context,
+            fail_strategy=validator.fail_strategy
+        )
+
+    def _record(self, result: ValidationResult, intervention_type: str, step: str):
+        """Log a result as part of ``step`` and raise ValidationError if it failed"""
+        self._log_validation(result, step)
+        if not result.passed:
+            self._log_intervention(result, intervention_type, step)
+            raise ValidationError(result)
+
+    def _timeout_for(self, validator: 'BaseValidator') -> Optional[float]:
+        timeout = getattr(validator, 'timeout', None)
+        return self.validator_timeout if timeout is None else timeout
+
+    def _run_validator(self,
+                       validator: 'BaseValidator',
+                       point: ValidationPoint,
+                       context: Dict[str, Any],
+                       outcome: Optional[_Outcome] = None) -> Tuple[ValidationResult, str]:
+        """
+        Run one validator, returning its result and the intervention type to log on failure.
+
+        When the caller may time the call out, it passes an ``outcome`` and the call is
+        only recorded if it finishes before the caller gives up on it.
+        """
+        profile = self.profiler.start() if self.profiler else None
+        error = None
+        started = time.perf_counter()
+        try:
+            # validator.validate should return a ValidationResult
+            result = validator.validate(context)
+            intervention_type = getattr(validator, 'intervention_type', 'block_action')
+        except Exception as e:
+            # unexpected error in validator code
+            error = e
+            message = f"Validator failed with error: {str(e)}"
+            result, intervention_type = self._error_result(validator, point, context, message), 'error'
+        elapsed = time.perf_counter() - started
+        if profile is not None:
+            self.profiler.finish(profile, point.value, validator.name, elapsed)
+        if outcome is None or outcome.claim():
+            self._stats_for(point, validator).record(elapsed, result.passed)
+            self.metrics.record(point.value, validator.name, elapsed, result.passed, error)
+        return result, intervention_type
+
+    def _record_timeout(self, validator: 'BaseValidator', point: ValidationPoint, timeout: float):
+        self._stats_for(point, validator).record(timeout, False)
+        self.metrics.record_timeout(point.value, validator.name)
+
     def validate(self, point: ValidationPoint, context: Dict[str, Any]) -> List[ValidationResult]:
+        if self._shadow[point]:
+            self._dispatch_shadow(point, context)
+        if self.concurrent:
+            return self._validate_concurrent(point, context)
+
         results = []
-        
-        for validator in self._validators[point]:
-            try:
-                # validator.validate should return a ValidationResult
-                result = validator.validate(context)
+        step = self._next_step()
+
+        for tier in self._tiers(point):
+            for validator in tier:
+                result, intervention_type = self._run_validator(validator, point, context)
                 results.append(result)
-                self._log_validation(result)
-                
-                if not result.passed:
-                    self._log_intervention(result, 'block_action')
-                    raise ValidationError(result)
-                    
+                self._record(result, intervention_type, step)
+
+        return results
+
+    def validate_batch(self, point: ValidationPoint, contexts: Iterable[Dict[str, Any]]) -> BatchResults:
+        """
+        Run the validators at ``point`` over many contexts, for offline re-evaluation.
+
+        Nothing is raised, logged or recorded in the statistics: the outcome of every
+        context comes back as one row of a BatchResults. Each validator receives all the
+        contexts that the validators before it passed through its ``validate_many`` hook,
+        so validators that can check a batch in one vectorized pass do. Validators run in
+        registration order (cost-aware ordering does not apply), so the validator reported
+        for a row is the first registered one that rejects it.
+        """
+        contexts = contexts if isinstance(contexts, list) else list(contexts)
+        validators = self._validators[point]
+        results = BatchResults(point, tuple(v.name for v in validators))
+        results.failed_by.extend([-1] * len(contexts))
+
+        pending = list(range(len(contexts)))
+        for index, validator in enumerate(validators):
+            if not pending:
+                break
+            outcomes = self._run_validator_many(validator, point, [contexts[row] for row in pending])
+            remaining = []
+            for row, (result, intervention_type) in zip(pending, outcomes):
+                if result.passed:
+                    remaining.append(row)
+                else:
+                    results.failed_by[row] = index
+                    results.messages[row] = result.message
+                    results.intervention_types[row] = intervention_type
+            pending = remaining
+        return results
+
+    def _run_validator_many(self,
+                            validator: 'BaseValidator',
+                            point: ValidationPoint,
+                            contexts: List[Dict[str, Any]]) -> List[Tuple[ValidationResult, str]]:
+        intervention_type = getattr(validator, 'intervention_type', 'block_action')
+        validate_many = getattr(validator, 'validate_many', None)
+        if validate_many is not None:
+            try:
+                results = validate_many(contexts)
+                if len(results) == len(contexts):
+                    return [(result, intervention_type) for result in results]
+            except Exception:
+                pass  # retry one context at a time so only the offending contexts error
+
+        outcomes = []
+        for context in contexts:
+            try:
+                outcomes.append((validator.validate(context), intervention_type))
             except Exception as e:
-                if not isinstance(e, ValidationError):
-                    # unexpected error in validator code
-                    result = ValidationResult(
-                        passed=False,
-                        message=f"Validator failed with error: {str(e)}",
-                        validator_name=validator.name,
-                        validation_point=point,
-                        context=context,
-                        fail_strategy=validator.fail_strategy
-                    )
-                    results.append(result)
-                    self._log_validation(result)
-                    self._log_intervention(result, 'error')
-                    raise ValidationError(result)
-                raise
-                
+                message = f"Validator failed with error: {str(e)}"
+                outcomes.append((self._error_result(validator, point, context, message), 'error'))
+        return outcomes
+
+    def _validate_concurrent(self, point: ValidationPoint, context: Dict[str, Any]) -> List[ValidationResult]:
+        """
+        Fan the validators at ``point`` out over the thread pool, one cost tier at a time.
+
+        As soon as any validator fails, validators that have not started are cancelled and
+        the ones still running are ignored. Completed results are then logged in registration
+        order, up to and including the first failure in that order, so logs do not depend on
+        which thread happened to finish first. Later tiers never start after a failure.
+        """
+        results = []
+        step = self._next_step()
+
+        for tier in self._tiers(point):
+            for result, intervention_type in self._fan_out(point, tier, context):
+                results.append(result)
+                self._record(result, intervention_type, step)
+
+        return results
+
+    def _fan_out(self,
+                 point: ValidationPoint,
+                 validators: List['BaseValidator'],
+                 context: Dict[str, Any]) -> List[Tuple[ValidationResult, str]]:
+        """Run ``validators`` concurrently until one fails; return completed outcomes in order"""
+        executor = self._get_executor()
+        started = time.monotonic()
+
+        futures = {}
+        deadlines = {}
+        claims = {}
+        for index, validator in enumerate(validators):
+            timeout = self._timeout_for(validator)
+            claim = _Outcome() if timeout is not None else None
+            future = executor.submit(self._run_validator, validator, point, context, claim)
+            futures[future] = index
+            if timeout is not None:
+                deadlines[future] = started + timeout
+                claims[future] = claim
+
+        outcomes: List[Optional[Tuple[ValidationResult, str]]] = [None] * len(validators)
+        pending = set(futures)
+        while pending:
+            wait_for = None
+            pending_deadlines = [deadlines[f] for f in pending if f in deadlines]
+            if pending_deadlines:
+                wait_for = max(0.0, min(pending_deadlines) - time.monotonic())
+
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                outcomes[futures[future]] = future.result()
+
+            now = time.monotonic()
+            for future in [f for f in pending if f in deadlines and deadlines[f] <= now]:
+                pending.discard(future)
+                future.cancel()
+                validator = validators[futures[future]]
+                if not claims[future].claim():
+                    # Finished (and recorded itself) just as its deadline passed
+                    outcomes[futures[future]] = future.result()
+                    continue
+                self._record_timeout(validator, point, self._timeout_for(validator))
+                message = f"Validator timed out after {self._timeout_for(validator)}s"
+                outcomes[futures[future]] = (
+                    self._error_result(validator, point, context, message), 'timeout'
+                )
+
+            if any(outcome and not outcome[0].passed for outcome in outcomes):
+                break
+
+        for future in pending:
+            future.cancel()
+
+        return [outcome for outcome in outcomes if outcome is not None]
+
+    async def _run_validator_async(self,
+                                   validator: 'BaseValidator',
+                                   point: ValidationPoint,
+                                   context: Dict[str, Any]) -> Tuple[ValidationResult, str]:
+        """Async counterpart of _run_validator"""
+        timeout = self._timeout_for(validator)
+
+        avalidate = getattr(validator, 'avalidate', None)
+        if avalidate is None:
+            # _run_validator records its own statistics and never raises
+            loop = asyncio.get_running_loop()
+            claim = _Outcome() if timeout is not None else None
+            call = loop.run_in_executor(
+                self._get_executor(), self._run_validator, validator, point, context, claim
+            )
+            # asyncio.wait leaves the future running on timeout, so a call that finishes
+            # just as the timeout fires still hands back its outcome
+            done, _ = await asyncio.wait({call}, timeout=timeout)
+            if done or not claim.claim():
+                # Finished (and recorded itself) just as the timeout fired
+                return await call
+            self._record_timeout(validator, point, timeout)
+            message = f"Validator timed out after {timeout}s"
+            return self._error_result(validator, point, context, message), 'timeout'
+
+        error = None
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(avalidate(context), timeout)
+            intervention_type = getattr(validator, 'intervention_type', 'block_action')
+        except asyncio.TimeoutError:
+            self.metrics.record_timeout(point.value, validator.name)
+            message = f"Validator timed out after {timeout}s"
+            result, intervention_type = self._error_result(validator, point, context, message), 'timeout'
+        except Exception as e:
+            error = e
+            message = f"Validator failed with error: {str(e)}"
+            result, intervention_type = self._error_result(validator, point, context, message), 'error'
+        elapsed = time.perf_counter() - started
+        self._stats_for(point, validator).record(elapsed, result.passed)
+        if intervention_type != 'timeout':
+            self.metrics.record(point.value, validator.name, elapsed, result.passed, error)
+        return result, intervention_type
+
+    async def validate_async(self, point: ValidationPoint, context: Dict[str, Any]) -> List[ValidationResult]:
+        """
+        Asynchronous counterpart of validate.
+
+        All validators registered at ``point`` run concurrently: validators that define
+        an ``avalidate`` coroutine are awaited directly, plain synchronous validators are
+        run on the engine's bounded thread pool. Results are logged in registration order
+        and the first failure (in that order) raises ValidationError, exactly as validate does.
+        With cost_aware, tiers run one after another and a failure skips the remaining tiers.
+        """
+        if self._shadow[point]:
+            self._dispatch_shadow(point, context)
+
+        results = []
+        step = self._next_step()
+
+        for tier in self._tiers(point):
+            outcomes = await asyncio.gather(*(
+                self._run_validator_async(validator, point, context) for validator in tier
+            ))
+            for result, intervention_type in outcomes:
+                results.append(result)
+                self._record(result, intervention_type, step)
+
         return results
@@ -0,0 +1,361 @@
+import io
+import random
+import threading
+import time
+from collections import Counter, deque
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+# The server and profiler modules are imported when first used, keeping them out of
+# the import time of every process that only records metrics
+if TYPE_CHECKING:
+    import cProfile
+    from http.server import ThreadingHTTPServer
+
+# Linear sub-buckets per power of two: values are kept to within ~6%
+_SUB_BUCKETS = 16
+
+# Bucket boundaries (seconds) used when exporting histograms to Prometheus
+DEFAULT_EXPORT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                          0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _bucket_index(value: int) -> int:
+    if value < 2 * _SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - _SUB_BUCKETS.bit_length()
+    return 2 * _SUB_BUCKETS + (shift - 1) * _SUB_BUCKETS + ((value >> shift) - _SUB_BUCKETS)
+
+
+def _bucket_bounds(index: int) -> Tuple[int, int]:
+    """Inclusive range of values that fall in bucket ``index``"""
+    if index < 2 * _SUB_BUCKETS:
+        return index, index
+    shift = (index - 2 * _SUB_BUCKETS) // _SUB_BUCKETS + 1
+    mantissa = (index - 2 * _SUB_BUCKETS) % _SUB_BUCKETS + _SUB_BUCKETS
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of latencies, recorded in microseconds.
+
+    Each power of two is split into 16 linear buckets, so any percentile is accurate to
+    about 6% across the whole range, from microseconds to minutes, in a few hundred
+    sparse counters and O(1) per recorded value.
+    """
+
+    def __init__(self):
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        index = _bucket_index(max(0, int(seconds * 1e6)))
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self.count += 1
+            self.total += seconds
+            if self.min is None or seconds < self.min:
+                self.min = seconds
+            if self.max is None or seconds > self.max:
+                self.max = seconds
+
+    def _sorted_counts(self) -> List[Tuple[int, int]]:
+        with self._lock:
+            return sorted(self._counts.items())
+
+    def percentile(self, p: float) -> float:
+        """Latency in seconds at percentile ``p`` (0-100)"""
+        counts = self._sorted_counts()
+        total = sum(c for _, c in counts)
+        if not total:
+            return 0.0
+        rank = max(1, int(round(p / 100 * total)))
+        seen = 0
+        for index, count in counts:
+            seen += count
+            if seen >= rank:
+                low, high = _bucket_bounds(index)
+                return min((low + high) / 2 / 1e6, self.max)
+        return self.max
+
+    def cumulative_counts(self, bounds=DEFAULT_EXPORT_BUCKETS) -> List[int]:
+        """Counts of values <= each bound, by bucket upper edge"""
+        counts = self._sorted_counts()
+        result = []
+        for bound in bounds:
+            limit = bound * 1e6
+            result.append(sum(c for index, c in counts if _bucket_bounds(index)[1] <= limit))
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'p999': self.percentile(99.9),
+        }
+
+
+class ValidatorMetrics:
+    """Counters and latency histogram for one validator at one validation point"""
+
+    def __init__(self):
+        self.outcomes: Counter = Counter()  # pass / fail / error
+        self.timeouts = 0
+        self.exceptions: Counter = Counter()  # exception type name -> count
+        self.latency = LatencyHistogram()
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, passed: bool, error: Optional[BaseException] = None):
+        self.latency.record(seconds)
+        with self._lock:
+            if error is not None:
+                self.outcomes['error'] += 1
+                self.exceptions[type(error).__name__] += 1
+            else:
+                self.outcomes['pass' if passed else 'fail'] += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            outcomes = dict(self.outcomes)
+            exceptions = dict(self.exceptions)
+            timeouts = self.timeouts
+        return {
+            'calls': sum(outcomes.values()),
+            'passed': outcomes.get('pass', 0),
+            'failed': outcomes.get('fail', 0),
+            'errors': outcomes.get('error', 0),
+            'timeouts': timeouts,
+            'exceptions': exceptions,
+            'latency': self.latency.snapshot(),
+        }
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+class EngineMetrics:
+    """
+    Per-validator, per-ValidationPoint instrumentation for CoreValidationEngine.
+
+    Every engine records into one of these (``engine.metrics``); several engines can
+    share an instance. Read it with snapshot() or export it with to_prometheus().
+    """
+
+    def __init__(self, export_buckets: Tuple[float, ...] = DEFAULT_EXPORT_BUCKETS):
+        self.export_buckets = export_buckets
+        self._validators: Dict[Tuple[str, str], ValidatorMetrics] = {}
+        self._lock = threading.Lock()
+
+    def for_validator(self, point: str, validator: str) -> ValidatorMetrics:
+        metrics = self._validators.get((point, validator))
+        if metrics is None:
+            with self._lock:
+                metrics = self._validators.setdefault((point, validator), ValidatorMetrics())
+        return metrics
+
+    def record(self,
+               point: str,
+               validator: str,
+               seconds: float,
+               passed: bool,
+               error: Optional[BaseException] = None):
+        self.for_validator(point, validator).record(seconds, passed, error)
+
+    def record_timeout(self, point: str, validator: str):
+        self.for_validator(point, validator).record_timeout()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Metrics keyed by '<point>:<validator name>'"""
+        return {
+            f"{point}:{validator}": metrics.snapshot()
+            for (point, validator), metrics in sorted(self._validators.items())
+        }
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        calls, exceptions, timeouts, histograms = [], [], [], []
+        for (point, validator), metrics in sorted(self._validators.items()):
+            snapshot = metrics.snapshot()
+            for outcome, key in (('pass', 'passed'), ('fail', 'failed'), ('error', 'errors')):
+                calls.append(
+                    f"bumpers_validator_calls_total{_labels(point=point, validator=validator, outcome=outcome)} {snapshot[key]}"
+                )
+            for exception, count in sorted(snapshot['exceptions'].items()):
+                exceptions.append(
+                    f"bumpers_validator_exceptions_total{_labels(point=point, validator=validator, exception=exception)} {count}"
+                )
+            timeouts.append(
+                f"bumpers_validator_timeouts_total{_labels(point=point, validator=validator)} {snapshot['timeouts']}"
+            )
+            latency = metrics.latency
+            for bound, count in zip(self.export_buckets, latency.cumulative_counts(self.export_buckets)):
+                histograms.append(
+                    f"bumpers_validator_latency_seconds_bucket{_labels(point=point, validator=validator, le=repr(bound))} {count}"
+                )
+            histograms.append(
+                f"bumpers_validator_latency_seconds_bucket{_labels(point=point, validator=validator, le='+Inf')} {latency.count}"
+            )
+            histograms.append(f"bumpers_validator_latency_seconds_sum{_labels(point=point, validator=validator)} {latency.total}")
+            histograms.append(f"bumpers_validator_latency_seconds_count{_labels(point=point, validator=validator)} {latency.count}")
+
+        lines = [
+            "# HELP bumpers_validator_calls_total Validator calls by outcome",
+            "# TYPE bumpers_validator_calls_total counter",
+            *calls,
+            "# HELP bumpers_validator_exceptions_total Exceptions raised by validators, by type",
+            "# TYPE bumpers_validator_exceptions_total counter",
+            *exceptions,
+            "# HELP bumpers_validator_timeouts_total Validator calls abandoned after their timeout",
+            "# TYPE bumpers_validator_timeouts_total counter",
+            *timeouts,
+            "# HELP bumpers_validator_latency_seconds Validator call latency",
+            "# TYPE bumpers_validator_latency_seconds histogram",
+            *histograms,
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    Serves EngineMetrics in Prometheus text format at ``/metrics`` from a daemon thread.
+
+    Args:
+        metrics: Metrics to expose (e.g. ``engine.metrics``)
+        host: Interface to bind; the default only accepts local connections
+        port: Port to bind (0 picks a free one, see ``port`` after start())
+    """
+
+    def __init__(self, metrics: EngineMetrics, host: str = "127.0.0.1", port: int = 9464):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server: Optional['ThreadingHTTPServer'] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'MetricsServer':
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="bumpers-metrics", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+
+class SlowCallProfile(NamedTuple):
+    """cProfile trace of one validator call that exceeded the profiler's threshold"""
+    point: str
+    validator: str
+    seconds: float
+    timestamp: float
+    stats: str  # pstats report, sorted by cumulative time
+
+
+class SlowCallProfiler:
+    """
+    Samples validator calls under cProfile and keeps the traces of slow ones.
+
+    A sampled call is profiled from the start (whether it will be slow is only known
+    afterwards); its trace is kept if it took at least ``threshold`` seconds. Only one
+    call is profiled at a time, since profilers cannot always run concurrently.
+
+    Args:
+        threshold: Keep traces of calls at least this slow (seconds)
+        sample_rate: Fraction of calls to profile
+        max_profiles: Keep at most this many recent traces
+        on_profile: Called with each kept SlowCallProfile
+        top: Functions listed in each report
+    """
+
+    def __init__(self,
+                 threshold: float = 0.1,
+                 sample_rate: float = 0.01,
+                 max_profiles: int = 20,
+                 on_profile: Optional[Callable[[SlowCallProfile], None]] = None,
+                 top: int = 25):
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.on_profile = on_profile
+        self.top = top
+        self.profiles: Deque[SlowCallProfile] = deque(maxlen=max_profiles)
+        self._active = threading.Lock()
+
+    def start(self) -> Optional['cProfile.Profile']:
+        """Begin profiling the current call if it is sampled and no other call is being profiled"""
+        if random.random() >= self.sample_rate or not self._active.acquire(blocking=False):
+            return None
+        import cProfile
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler (e.g. a debugger or sys.monitoring tool) is active
+            self._active.release()
+            return None
+        return profile
+
+    def finish(self, profile: 'cProfile.Profile', point: str, validator: str, seconds: float):
+        """Stop profiling and keep the trace if the call was slow"""
+        try:
+            profile.disable()
+        finally:
+            self._active.release()
+        if seconds < self.threshold:
+            return
+        import pstats
+
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(self.top)
+        record = SlowCallProfile(point, validator, seconds, time.time(), out.getvalue())
+        self.profiles.append(record)
+        if self.on_profile:
+            self.on_profile(record)
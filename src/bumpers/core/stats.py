@@ -0,0 +1,48 @@
+import threading
+from dataclasses import dataclass
+from typing import Dict, Any
+
+
+@dataclass
+class ValidatorStats:
+    """
+    Running latency and failure-rate statistics for one validator at one validation point.
+
+    Latency is tracked as an exponentially weighted moving average so the
+    ordering adapts when a validator's cost drifts (e.g. a slow remote API).
+    """
+    calls: int = 0
+    failures: int = 0
+    avg_latency: float = 0.0
+    smoothing: float = 0.1
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, passed: bool):
+        with self._lock:
+            self.calls += 1
+            if not passed:
+                self.failures += 1
+            if self.calls == 1:
+                self.avg_latency = latency
+            else:
+                self.avg_latency += self.smoothing * (latency - self.avg_latency)
+
+    @property
+    def failure_rate(self) -> float:
+        # Laplace-smoothed so unseen validators neither dominate nor starve
+        return (self.failures + 1) / (self.calls + 2)
+
+    @property
+    def score(self) -> float:
+        """Expected seconds spent per rejection; validators with lower scores should run first."""
+        return self.avg_latency / self.failure_rate
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'failures': self.failures,
+            'failure_rate': self.failures / self.calls if self.calls else 0.0,
+            'avg_latency': self.avg_latency,
+        }
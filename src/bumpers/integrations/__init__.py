@@ -1,7 +1,31 @@
-from .langchain_callback import BumpersLangChainCallback
-from .self_correcting_callback import SelfCorrectingLangChainCallback
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# LangChain and the OpenAI SDK are imported when an integration is first used
+_LAZY = {
+    "BumpersLangChainCallback": ".langchain_callback",
+    "SelfCorrectingLangChainCallback": ".self_correcting_callback",
+}
+
+if TYPE_CHECKING:
+    from .langchain_callback import BumpersLangChainCallback
+    from .self_correcting_callback import SelfCorrectingLangChainCallback
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
+
 
 __all__ = [
     "BumpersLangChainCallback",
     "SelfCorrectingLangChainCallback"
-] 
\ No newline at end of file
+]
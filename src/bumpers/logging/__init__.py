@@ -1,4 +1,32 @@
-from .base import BaseLogger, LogEvent
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+from .base import BaseLogger, ContextProjection, LogEvent
+from .bus import EventBus, Subscription
 from .file_logger import FileLogger
+from .segmented_logger import SegmentedFileLogger
+
+# Loggers with backends most processes never touch (sqlite3) are imported on first
+# attribute access
+_LAZY = {
+    "SQLiteLogger": ".sqlite_logger",
+}
+
+if TYPE_CHECKING:
+    from .sqlite_logger import SQLiteLogger
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
+
 
-__all__ = ["BaseLogger", "LogEvent", "FileLogger"] 
\ No newline at end of file
+__all__ = ["BaseLogger", "LogEvent", "ContextProjection", "EventBus", "Subscription", "FileLogger", "SegmentedFileLogger", "SQLiteLogger"]
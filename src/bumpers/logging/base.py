@@ -1,10 +1,54 @@
+import atexit
+import weakref
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from dataclasses import replace
+from typing import Dict, Any, Iterable, List, Mapping, Optional
 from datetime import datetime
 import json
+from ..types import slotted_dataclass
 
-@dataclass
+class ContextProjection:
+    """
+    Which context fields a logger serializes, and how.
+
+    Contexts are shared by reference with the running agent and can hold screenshots or
+    large tool outputs; the projection decides what actually reaches the log.
+
+    Args:
+        include: Only serialize these keys (None keeps every key not excluded)
+        exclude: Keys never serialized
+        max_value_length: Truncate longer string values to this many characters
+    """
+
+    def __init__(self,
+                 include: Optional[Iterable[str]] = None,
+                 exclude: Iterable[str] = ("screenshot",),
+                 max_value_length: Optional[int] = None):
+        self.include = frozenset(include) if include is not None else None
+        self.exclude = frozenset(exclude)
+        self.max_value_length = max_value_length
+
+    def _value(self, value: Any) -> Any:
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return f"<{len(value)} bytes>"
+        if (self.max_value_length is not None and isinstance(value, str)
+                and len(value) > self.max_value_length):
+            return value[:self.max_value_length] + "..."
+        if isinstance(value, Mapping) and not isinstance(value, dict):
+            return dict(value)
+        return value
+
+    def apply(self, context: Mapping[str, Any]) -> Dict[str, Any]:
+        """JSON-ready dict of the projected context"""
+        return {
+            key: self._value(value)
+            for key, value in context.items()
+            if key not in self.exclude and (self.include is None or key in self.include)
+        }
+
+DEFAULT_PROJECTION = ContextProjection()
+
+@slotted_dataclass
 class LogEvent:
     timestamp: datetime
     event_type: str  # 'validation', 'action', 'intervention'
@@ -12,9 +56,19 @@ class LogEvent:
     validator_name: Optional[str]
     status: str  # 'pass', 'fail', 'error'
     message: str
-    context: Dict[str, Any]
+    # Shared by reference with the validated step; loggers that serialize on another
+    # thread take a snapshot() when the event is logged
+    context: Mapping[str, Any]
+
+    def snapshot(self, projection: Optional[ContextProjection] = None) -> 'LogEvent':
+        """
+        Copy of the event whose context no longer changes with the agent's: the projected
+        fields when a projection is given, otherwise a shallow copy of the whole context
+        """
+        context = projection.apply(self.context) if projection is not None else dict(self.context)
+        return replace(self, context=context)
     
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, projection: ContextProjection = DEFAULT_PROJECTION) -> Dict[str, Any]:
         return {
             'timestamp': self.timestamp.isoformat(),
             'event_type': self.event_type,
@@ -22,10 +76,35 @@ class LogEvent:
             'validator_name': self.validator_name,
             'status': self.status,
             'message': self.message,
-            'context': self.context
+            'context': projection.apply(self.context)
         }
 
+def event_datetime(event: LogEvent) -> datetime:
+    """Event timestamp as a datetime (loggers may hand back ISO strings)"""
+    timestamp = event.timestamp
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    return timestamp
+
+# Loggers with background writers, closed at interpreter exit without being kept alive
+_open_loggers: "weakref.WeakSet[BaseLogger]" = weakref.WeakSet()
+
+
+def close_at_exit(logger: 'BaseLogger'):
+    """Close ``logger`` (which must have a close method) when the interpreter exits"""
+    _open_loggers.add(logger)
+
+
+@atexit.register
+def _close_open_loggers():
+    for logger in list(_open_loggers):
+        logger.close()
+
+
 class BaseLogger(ABC):
+    # Context fields serialized by loggers that write events out
+    projection: ContextProjection = DEFAULT_PROJECTION
+
     @abstractmethod
     def log_event(self, event: LogEvent):
         """Log a single event"""
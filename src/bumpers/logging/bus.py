@@ -0,0 +1,181 @@
+import queue
+import threading
+from datetime import datetime
+from typing import Callable, List, Optional, Union
+from .base import BaseLogger, LogEvent
+
+_STOP = object()
+
+
+class _FlushRequest:
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class Subscription:
+    """
+    One consumer of an EventBus, with its own bounded queue and delivery thread.
+
+    Args:
+        handler: Called with each published event, on the subscription's thread
+        name: Label for the delivery thread
+        max_queue_size: Bound on events waiting for this subscriber
+        block_when_full: When the queue is full, block the publisher (backpressure)
+            rather than dropping the event. Dropped events are counted in dropped_events.
+    """
+
+    def __init__(self,
+                 handler: Callable[[LogEvent], None],
+                 name: str = "subscriber",
+                 max_queue_size: int = 10000,
+                 block_when_full: bool = False):
+        self.handler = handler
+        self.name = name
+        self.block_when_full = block_when_full
+        self.delivered = 0
+        self.dropped_events = 0
+        self.errors = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._closed = False
+        # Held while checking _closed and enqueueing, so nothing lands behind _STOP
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._deliver_loop, name=f"bumpers-bus-{name}", daemon=True
+        )
+        self._thread.start()
+
+    def publish(self, event: LogEvent):
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                self._queue.put(event, block=self.block_when_full)
+            except queue.Full:
+                with self._stats_lock:
+                    self.dropped_events += 1
+
+    def _deliver_loop(self):
+        while True:
+            item = self._queue.get()
+            if isinstance(item, _FlushRequest):
+                item.done.set()
+            elif item is _STOP:
+                break
+            else:
+                try:
+                    self.handler(item)
+                    self.delivered += 1
+                except Exception:
+                    # One failing sink must not stall the others or the publisher
+                    self.errors += 1
+
+    def flush(self):
+        """Block until every event published so far has been handled"""
+        request = _FlushRequest()
+        with self._lock:
+            if self._closed:
+                return
+            self._queue.put(request)
+        # Bounded waits so a delivery thread that died can never hang the caller
+        while not request.done.wait(0.1):
+            if not self._thread.is_alive():
+                return
+
+    def close(self):
+        """Handle outstanding events and stop the delivery thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+
+
+class EventBus(BaseLogger):
+    """
+    In-process publish/subscribe fan-out for LogEvents.
+
+    The bus is itself a logger, so it can be handed to CoreValidationEngine in place of
+    a single logger. Every published event is queued to each subscriber (file or SQLite
+    loggers, a BumpersMonitor, metrics callbacks), and each subscriber consumes its queue
+    on its own thread, so a slow sink never delays the engine or the other sinks.
+
+    Args:
+        store: Logger subscribed as a sink and used to answer get_events
+        max_queue_size: Default queue bound for new subscriptions
+        block_when_full: Default full-queue policy for new subscriptions
+    """
+
+    def __init__(self,
+                 store: Optional[BaseLogger] = None,
+                 max_queue_size: int = 10000,
+                 block_when_full: bool = False):
+        self.max_queue_size = max_queue_size
+        self.block_when_full = block_when_full
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self.store = store
+        self._store_subscription: Optional[Subscription] = None
+        if store is not None:
+            # Losing events from the queryable store would make get_events lie
+            self._store_subscription = self.subscribe(store, name="store", block_when_full=True)
+
+    def subscribe(self,
+                  sink: Union[BaseLogger, Callable[[LogEvent], None]],
+                  name: Optional[str] = None,
+                  max_queue_size: Optional[int] = None,
+                  block_when_full: Optional[bool] = None) -> Subscription:
+        """Deliver every subsequently published event to a logger or callable"""
+        handler = sink.log_event if isinstance(sink, BaseLogger) else sink
+        subscription = Subscription(
+            handler,
+            name=name or type(sink).__name__,
+            max_queue_size=self.max_queue_size if max_queue_size is None else max_queue_size,
+            block_when_full=self.block_when_full if block_when_full is None else block_when_full
+        )
+        with self._lock:
+            self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Stop delivering to a subscriber after draining its queue"""
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+        subscription.close()
+
+    @property
+    def subscriptions(self) -> List[Subscription]:
+        return list(self._subscriptions)
+
+    def log_event(self, event: LogEvent):
+        """Publish an event to every subscriber"""
+        # Subscribers run later on their own threads; give them the context as it is now
+        event = event.snapshot()
+        for subscription in self._subscriptions:
+            subscription.publish(event)
+
+    publish = log_event
+
+    def flush(self):
+        """Block until every subscriber has handled the events published so far"""
+        for subscription in self._subscriptions:
+            subscription.flush()
+
+    def close(self):
+        """Drain and stop every subscriber"""
+        with self._lock:
+            subscriptions, self._subscriptions = self._subscriptions, []
+        for subscription in subscriptions:
+            subscription.close()
+
+    def get_events(self,
+                   start_time: Optional[datetime] = None,
+                   end_time: Optional[datetime] = None,
+                   event_type: Optional[str] = None) -> List[LogEvent]:
+        """Query the store once it has caught up with everything published"""
+        if self.store is None:
+            raise RuntimeError("EventBus has no store logger to query")
+        if self._store_subscription is not None:
+            self._store_subscription.flush()
+        return self.store.get_events(start_time=start_time, end_time=end_time, event_type=event_type)
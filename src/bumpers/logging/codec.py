@@ -0,0 +1,160 @@
+"""
+Encoding and decoding of LogEvents.
+
+Uses orjson or msgspec when installed and falls back to the standard library, so every
+logger shares one fast path. Decoding is schema-aware: it always returns typed
+LogEvents with ``datetime`` timestamps, whichever backend wrote the data.
+
+Every backend encodes the same way: NaN and infinities become ``null``, datetimes,
+dates and times become ISO 8601 strings and UUIDs their string form. Other objects
+JSON has no form for raise TypeError.
+"""
+
+import json
+import math
+import struct
+from datetime import date, datetime, time
+from uuid import UUID
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Tuple, Union
+from .base import DEFAULT_PROJECTION, ContextProjection, LogEvent
+
+
+def _load_backend() -> Tuple[str, Callable[[Any], bytes], Callable[[Union[bytes, str]], Any]]:
+    try:
+        import orjson
+
+        def dumps(obj: Any) -> bytes:
+            # Match json.dumps, which stringifies int/float/bool keys
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+        return "orjson", dumps, orjson.loads
+    except ImportError:
+        pass
+    try:
+        import msgspec
+        return "msgspec", msgspec.json.encode, msgspec.json.decode
+    except ImportError:
+        pass
+
+    return "json", _json_dumps, json.loads
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _finite(obj: Any) -> Any:
+    """Replace NaN and infinities with None, as orjson and msgspec write them"""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    return obj
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Standard library encoder matching the orjson and msgspec output"""
+    try:
+        return json.dumps(obj, separators=(',', ':'), allow_nan=False, default=_json_default).encode()
+    except ValueError as e:
+        if "Out of range float" not in str(e):
+            raise
+        return json.dumps(_finite(obj), separators=(',', ':'), default=_json_default).encode()
+
+
+BACKEND, dumps, loads = _load_backend()
+
+# Binary records: 4-byte little-endian payload length, then a JSON array payload
+_LENGTH = struct.Struct('<I')
+
+
+def _fields(event: LogEvent, projection: ContextProjection) -> List[Any]:
+    return [
+        event.timestamp.isoformat(),
+        event.event_type,
+        event.validation_point,
+        event.validator_name,
+        event.status,
+        event.message,
+        projection.apply(event.context)
+    ]
+
+
+def _from_fields(fields: List[Any]) -> LogEvent:
+    timestamp, event_type, validation_point, validator_name, status, message, context = fields
+    return LogEvent(
+        timestamp=datetime.fromisoformat(timestamp),
+        event_type=event_type,
+        validation_point=validation_point,
+        validator_name=validator_name,
+        status=status,
+        message=message,
+        context=context
+    )
+
+
+def encode_event(event: LogEvent, projection: ContextProjection = DEFAULT_PROJECTION) -> bytes:
+    """Encode an event as a JSON object (no trailing newline)"""
+    return dumps(event.to_dict(projection))
+
+
+def decode_event(data: Union[bytes, str]) -> LogEvent:
+    """Decode a JSON object written by encode_event (or LogEvent.to_dict)"""
+    return event_from_dict(loads(data))
+
+
+def event_from_dict(event_dict: Dict[str, Any]) -> LogEvent:
+    """Build a typed LogEvent from its dict form, parsing the timestamp"""
+    timestamp = event_dict['timestamp']
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    return LogEvent(
+        timestamp=timestamp,
+        event_type=event_dict['event_type'],
+        validation_point=event_dict['validation_point'],
+        validator_name=event_dict['validator_name'],
+        status=event_dict['status'],
+        message=event_dict['message'],
+        context=event_dict['context']
+    )
+
+
+def encode_lines(events: List[LogEvent], projection: ContextProjection = DEFAULT_PROJECTION) -> bytes:
+    """Encode events as JSONL"""
+    return b''.join(encode_event(event, projection) + b'\n' for event in events)
+
+
+def encode_record(event: LogEvent, projection: ContextProjection = DEFAULT_PROJECTION) -> bytes:
+    """Encode an event as a length-prefixed binary record"""
+    payload = dumps(_fields(event, projection))
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def encode_records(events: List[LogEvent], projection: ContextProjection = DEFAULT_PROJECTION) -> bytes:
+    """Encode events as consecutive binary records"""
+    return b''.join(encode_record(event, projection) for event in events)
+
+
+def iter_records(f: BinaryIO) -> Iterator[bytes]:
+    """Yield raw record payloads from a binary log, stopping at a truncated tail"""
+    while True:
+        header = f.read(_LENGTH.size)
+        if len(header) < _LENGTH.size:
+            return
+        (length,) = _LENGTH.unpack(header)
+        payload = f.read(length)
+        if len(payload) < length:
+            return
+        yield payload
+
+
+def decode_record(payload: bytes) -> LogEvent:
+    """Decode one binary record payload"""
+    return _from_fields(loads(payload))
+
@@ -1,42 +1,219 @@
-import json
 import os
+import queue
+import threading
+import time
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from .base import BaseLogger, LogEvent
+from typing import List, Optional
+from .base import BaseLogger, ContextProjection, LogEvent, close_at_exit
+from . import codec
+
+_FSYNC_POLICIES = ("never", "flush")
+_FORMATS = {"jsonl": ".jsonl", "binary": ".bin"}
+_STOP = object()
+
+
+class _FlushRequest:
+    def __init__(self):
+        self.done = threading.Event()
+
 
 class FileLogger(BaseLogger):
-    def __init__(self, log_dir: str):
+    def __init__(self,
+                 log_dir: str,
+                 buffered: bool = False,
+                 batch_size: int = 256,
+                 flush_interval: float = 1.0,
+                 max_queue_size: int = 10000,
+                 block_when_full: bool = True,
+                 fsync: str = "never",
+                 projection: Optional[ContextProjection] = None,
+                 format: str = "jsonl"):
+        """
+        Args:
+            log_dir: Directory for the JSONL log file
+            buffered: Hand events to a background writer thread instead of opening and
+                appending to the file on every call. Events are serialized and written in
+                batches; their projected context is copied when they are logged, so the
+                agent may keep changing its context afterwards.
+            batch_size: Buffered mode writes once this many events are pending...
+            flush_interval: ...or once the oldest pending event is this many seconds old
+            max_queue_size: Bound on events waiting for the writer thread
+            block_when_full: When the queue is full, block the caller (backpressure) rather
+                than dropping the event. Dropped events are counted in dropped_events.
+            fsync: "never" leaves durability to the OS; "flush" fsyncs after every write
+                to the file (every event when unbuffered, every batch when buffered)
+            projection: Context fields to serialize (defaults to dropping screenshots)
+            format: "jsonl" for one JSON object per line, or "binary" for length-prefixed
+                records that are cheaper to write and read for high-volume logs
+        """
+        if fsync not in _FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {_FSYNC_POLICIES}, got '{fsync}'")
+        if format not in _FORMATS:
+            raise ValueError(f"format must be one of {list(_FORMATS)}, got '{format}'")
+        self.format = format
+        self._encode = codec.encode_lines if format == "jsonl" else codec.encode_records
         self.log_dir = log_dir
         os.makedirs(log_dir, exist_ok=True)
         self.current_log_file = os.path.join(
-            log_dir, 
-            f"bumpers_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+            log_dir,
+            f"bumpers_{datetime.now().strftime('%Y%m%d_%H%M%S')}{_FORMATS[format]}"
         )
-        
+        self.buffered = buffered
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block_when_full = block_when_full
+        self.fsync = fsync
+        self.dropped_events = 0
+        self.write_errors = 0
+        if projection is not None:
+            self.projection = projection
+
+        self._queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+        # Held while checking _closed and enqueueing, so nothing lands behind _STOP
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        if buffered:
+            self._queue = queue.Queue(maxsize=max_queue_size)
+            self._writer = threading.Thread(
+                target=self._write_loop, name="bumpers-file-logger", daemon=True
+            )
+            self._writer.start()
+            close_at_exit(self)
+
+    def _count(self, counter: str, increment: int = 1):
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + increment)
+
     def log_event(self, event: LogEvent):
-        """Log event to a JSONL file"""
-        with open(self.current_log_file, 'a') as f:
-            f.write(json.dumps(event.to_dict()) + '\n')
-            
+        """Log event to the log file"""
+        if self.buffered:
+            try:
+                event = event.snapshot(self.projection)
+            except Exception:
+                self._count('write_errors')
+                return
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("FileLogger is closed")
+                try:
+                    self._queue.put(event, block=self.block_when_full)
+                except queue.Full:
+                    self._count('dropped_events')
+            return
+
+        with open(self.current_log_file, 'ab') as f:
+            f.write(self._encode([event], self.projection))
+            if self.fsync == "flush":
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _write_loop(self):
+        pending: List[LogEvent] = []
+        oldest = 0.0
+
+        try:
+            f = open(self.current_log_file, 'ab')
+        except OSError:
+            f = None  # every batch counts as a write error, but flushes still complete
+
+        while True:
+            timeout = None
+            if pending:
+                timeout = max(0.0, oldest + self.flush_interval - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None  # the oldest pending event has waited flush_interval
+
+            if isinstance(item, LogEvent):
+                if not pending:
+                    oldest = time.monotonic()
+                pending.append(item)
+                if (len(pending) < self.batch_size
+                        and time.monotonic() - oldest < self.flush_interval):
+                    continue
+
+            if pending:
+                self._write_batch(f, pending)
+                pending = []
+
+            if isinstance(item, _FlushRequest):
+                item.done.set()
+            elif item is _STOP:
+                break
+
+        if f is not None:
+            f.close()
+
+    def _write_batch(self, f, events: List[LogEvent]):
+        # Never raises: the writer has to keep draining so producers and flushes never
+        # wait on a dead thread
+        try:
+            f.write(self._encode(events, self.projection))
+        except Exception:
+            # Write the events that can be encoded and count the ones that cannot
+            for event in events:
+                try:
+                    f.write(self._encode([event], self.projection))
+                except Exception:
+                    self._count('write_errors')
+        try:
+            f.flush()
+            if self.fsync == "flush":
+                os.fsync(f.fileno())
+        except Exception:
+            self._count('write_errors')
+
+    def flush(self):
+        """Block until every event logged so far has been written"""
+        if not self.buffered:
+            return
+        request = _FlushRequest()
+        with self._lock:
+            if self._closed:
+                return
+            self._queue.put(request)
+        # Bounded waits so a writer that died can never hang the caller
+        while not request.done.wait(0.1):
+            if not self._writer.is_alive():
+                return
+
+    def close(self):
+        """Write outstanding events and stop the writer thread"""
+        if not self.buffered:
+            return
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._writer.join()
+
     def get_events(self,
                   start_time: Optional[datetime] = None,
                   end_time: Optional[datetime] = None,
                   event_type: Optional[str] = None) -> List[LogEvent]:
         """Read and filter events from log file"""
+        self.flush()
         events = []
-        
-        with open(self.current_log_file, 'r') as f:
-            for line in f:
-                event_dict = json.loads(line.strip())
-                event_time = datetime.fromisoformat(event_dict['timestamp'])
-                
-                if start_time and event_time < start_time:
+        if not os.path.exists(self.current_log_file):
+            return events
+
+        with open(self.current_log_file, 'rb') as f:
+            if self.format == "jsonl":
+                decoded = (codec.decode_event(line) for line in f if line.strip())
+            else:
+                decoded = (codec.decode_record(payload) for payload in codec.iter_records(f))
+            for event in decoded:
+                if start_time and event.timestamp < start_time:
                     continue
-                if end_time and event_time > end_time:
+                if end_time and event.timestamp > end_time:
                     continue
-                if event_type and event_dict['event_type'] != event_type:
+                if event_type and event.event_type != event_type:
                     continue
-                    
-                events.append(LogEvent(**event_dict))
-                
-        return events 
\ No newline at end of file
+
+                events.append(event)
+
+        return events
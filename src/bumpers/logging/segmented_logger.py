@@ -0,0 +1,302 @@
+import glob
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+from .base import BaseLogger, ContextProjection, LogEvent, close_at_exit
+from . import codec
+
+_SEGMENT_FORMATS = {
+    "hour": ("%Y%m%d_%H", timedelta(hours=1)),
+    "day": ("%Y%m%d", timedelta(days=1)),
+}
+
+# Segments kept open for writing, so events arriving slightly out of order around a
+# segment boundary do not close and reopen segments
+_MAX_OPEN_SEGMENTS = 4
+
+
+class _Block:
+    """Index entry for a run of consecutive lines in a segment file"""
+
+    __slots__ = ("offset", "end", "count", "start_time", "end_time", "types")
+
+    def __init__(self, offset: int):
+        self.offset = offset
+        self.end = offset
+        self.count = 0
+        self.start_time: Optional[datetime] = None
+        self.end_time: Optional[datetime] = None
+        self.types: Dict[str, int] = {}
+
+    def add(self, timestamp: datetime, event_type: str, end: int):
+        self.end = end
+        self.count += 1
+        if self.start_time is None or timestamp < self.start_time:
+            self.start_time = timestamp
+        if self.end_time is None or timestamp > self.end_time:
+            self.end_time = timestamp
+        self.types[event_type] = self.types.get(event_type, 0) + 1
+
+    def matches(self,
+                start_time: Optional[datetime],
+                end_time: Optional[datetime],
+                event_type: Optional[str]) -> bool:
+        if start_time and self.end_time < start_time:
+            return False
+        if end_time and self.start_time > end_time:
+            return False
+        if event_type and event_type not in self.types:
+            return False
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'offset': self.offset,
+            'end': self.end,
+            'count': self.count,
+            'start_time': self.start_time.isoformat(),
+            'end_time': self.end_time.isoformat(),
+            'types': self.types
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> '_Block':
+        block = cls(data['offset'])
+        block.end = data['end']
+        block.count = data['count']
+        block.start_time = datetime.fromisoformat(data['start_time'])
+        block.end_time = datetime.fromisoformat(data['end_time'])
+        block.types = data['types']
+        return block
+
+
+class _Writer:
+    """An open segment: its file and the index block being filled"""
+
+    __slots__ = ("path", "file", "block")
+
+    def __init__(self, path: str, file, block: _Block):
+        self.path = path
+        self.file = file
+        self.block = block
+
+
+class SegmentedFileLogger(BaseLogger):
+    """
+    JSONL event store partitioned into hourly or daily segment files.
+
+    Each segment ``bumpers_<period>.jsonl`` has a sidecar ``.idx`` file listing blocks of
+    ``block_size`` consecutive events with their byte range, time range and per-event-type
+    counts. get_events only opens segments whose period overlaps the requested window and
+    only seeks into blocks that can contain matching events, so query cost follows the
+    size of the answer rather than the size of the log directory.
+
+    Writes are buffered: events reach the file when the buffer fills, when a block is
+    sealed, and on get_events, flush() and close(). Queries hold the writer lock only to
+    snapshot the segment list and indexes, then read without it, so log_event never waits
+    behind a large read.
+
+    Args:
+        log_dir: Directory holding the segment and index files
+        segment: Partition size, "hour" or "day"
+        block_size: Events per index block
+        projection: Context fields to serialize (defaults to dropping screenshots)
+    """
+
+    def __init__(self,
+                 log_dir: str,
+                 segment: str = "hour",
+                 block_size: int = 256,
+                 projection: Optional[ContextProjection] = None):
+        if segment not in _SEGMENT_FORMATS:
+            raise ValueError(f"segment must be one of {list(_SEGMENT_FORMATS)}, got '{segment}'")
+        self.log_dir = log_dir
+        self.segment = segment
+        self.block_size = block_size
+        if projection is not None:
+            self.projection = projection
+        self._name_format, self._span = _SEGMENT_FORMATS[segment]
+        os.makedirs(log_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._writers: "OrderedDict[str, _Writer]" = OrderedDict()  # least recently used first
+        self._index_cache: Dict[str, Tuple[int, List[_Block]]] = {}
+        close_at_exit(self)
+
+    def _segment_path(self, timestamp: datetime) -> str:
+        return os.path.join(self.log_dir, f"bumpers_{timestamp.strftime(self._name_format)}.jsonl")
+
+    def _segment_start(self, path: str) -> Optional[datetime]:
+        name = os.path.basename(path)[len("bumpers_"):-len(".jsonl")]
+        try:
+            return datetime.strptime(name, self._name_format)
+        except ValueError:
+            return None
+
+    # Writing
+
+    def log_event(self, event: LogEvent):
+        """Append an event to the segment for its timestamp and update the index"""
+        line = codec.encode_event(event, self.projection) + b'\n'
+        with self._lock:
+            writer = self._writer(self._segment_path(event.timestamp))
+            writer.file.write(line)
+            writer.block.add(event.timestamp, event.event_type, writer.block.end + len(line))
+            if writer.block.count >= self.block_size:
+                self._seal_block(writer)
+
+    def _writer(self, path: str) -> _Writer:
+        writer = self._writers.get(path)
+        if writer is not None:
+            self._writers.move_to_end(path)
+            return writer
+        while len(self._writers) >= _MAX_OPEN_SEGMENTS:
+            _, oldest = self._writers.popitem(last=False)
+            self._close_writer(oldest)
+        writer = self._writers[path] = self._open_segment(path)
+        return writer
+
+    def _open_segment(self, path: str) -> _Writer:
+        blocks = self._load_index(path)
+        indexed_end = blocks[-1].end if blocks else 0
+        block = _Block(indexed_end)
+        sealed: List[_Block] = []
+
+        # Index anything written after the last sealed block (e.g. before a crash), and
+        # drop a line cut short by the crash so new events start on a line of their own
+        if os.path.exists(path) and os.path.getsize(path) > indexed_end:
+            with open(path, 'rb') as f:
+                f.seek(indexed_end)
+                for raw in f:
+                    if not raw.endswith(b'\n'):
+                        break
+                    event_dict = codec.loads(raw)
+                    block.add(
+                        datetime.fromisoformat(event_dict['timestamp']),
+                        event_dict['event_type'],
+                        block.end + len(raw)
+                    )
+                    if block.count >= self.block_size:
+                        sealed.append(block)
+                        block = _Block(block.end)
+            os.truncate(path, block.end)
+            if sealed:
+                self._write_index(path, sealed)
+
+        return _Writer(path, open(path, 'ab'), block)
+
+    def _write_index(self, path: str, blocks: List[_Block]):
+        with open(path + '.idx', 'a') as f:
+            f.write(''.join(json.dumps(block.to_dict()) + '\n' for block in blocks))
+
+    def _seal_block(self, writer: _Writer):
+        block = writer.block
+        if block.count:
+            # The index must never point past what is in the file
+            writer.file.flush()
+            self._write_index(writer.path, [block])
+        writer.block = _Block(block.end)
+
+    def _close_writer(self, writer: _Writer):
+        self._seal_block(writer)
+        writer.file.close()
+
+    def flush(self):
+        """Write buffered events to their segment files"""
+        with self._lock:
+            for writer in self._writers.values():
+                writer.file.flush()
+
+    def close(self):
+        """Seal the open index blocks and close the open segments"""
+        with self._lock:
+            while self._writers:
+                _, writer = self._writers.popitem(last=False)
+                self._close_writer(writer)
+
+    # Reading
+
+    def _load_index(self, path: str) -> List[_Block]:
+        index_path = path + '.idx'
+        try:
+            size = os.path.getsize(index_path)
+        except OSError:
+            return []
+        cached = self._index_cache.get(path)
+        if cached and cached[0] == size:
+            return cached[1]
+        with open(index_path, 'r') as f:
+            blocks = [_Block.from_dict(json.loads(line)) for line in f if line.strip()]
+        self._index_cache[path] = (size, blocks)
+        return blocks
+
+    def _segments(self,
+                  start_time: Optional[datetime],
+                  end_time: Optional[datetime]) -> List[str]:
+        segments = []
+        for path in sorted(glob.glob(os.path.join(self.log_dir, "bumpers_*.jsonl"))):
+            segment_start = self._segment_start(path)
+            if segment_start is None:
+                continue
+            if start_time and segment_start + self._span <= start_time:
+                continue
+            if end_time and segment_start > end_time:
+                continue
+            segments.append(path)
+        return segments
+
+    def _read_range(self,
+                    f,
+                    offset: int,
+                    end: Optional[int],
+                    start_time: Optional[datetime],
+                    end_time: Optional[datetime],
+                    event_type: Optional[str]) -> List[LogEvent]:
+        f.seek(offset)
+        data = f.read() if end is None else f.read(end - offset)
+        events = []
+        for raw in data.splitlines():
+            if not raw:
+                continue
+            event_dict = codec.loads(raw)
+            if event_type and event_dict['event_type'] != event_type:
+                continue
+            event_time = datetime.fromisoformat(event_dict['timestamp'])
+            if start_time and event_time < start_time:
+                continue
+            if end_time and event_time > end_time:
+                continue
+            event_dict['timestamp'] = event_time
+            events.append(codec.event_from_dict(event_dict))
+        return events
+
+    def get_events(self,
+                   start_time: Optional[datetime] = None,
+                   end_time: Optional[datetime] = None,
+                   event_type: Optional[str] = None) -> List[LogEvent]:
+        """Retrieve events, reading only the segments and index blocks that can match"""
+        # Snapshot under the lock; read after releasing it so writers are not held up
+        snapshot = []
+        with self._lock:
+            for writer in self._writers.values():
+                writer.file.flush()
+            for path in self._segments(start_time, end_time):
+                writer = self._writers.get(path)
+                end = writer.block.end if writer is not None else os.path.getsize(path)
+                snapshot.append((path, self._load_index(path), end))
+
+        events = []
+        for path, blocks, end in snapshot:
+            with open(path, 'rb') as f:
+                for block in blocks:
+                    if block.matches(start_time, end_time, event_type):
+                        events.extend(self._read_range(
+                            f, block.offset, block.end, start_time, end_time, event_type
+                        ))
+                # Tail written since the last sealed block, up to the snapshot
+                tail = blocks[-1].end if blocks else 0
+                events.extend(self._read_range(f, tail, end, start_time, end_time, event_type))
+        return events
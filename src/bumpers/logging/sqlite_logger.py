@@ -0,0 +1,178 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from . import codec
+from .base import BaseLogger, ContextProjection, LogEvent, close_at_exit
+
+# Fixed-width timestamps so string comparison in SQL matches chronological order
+_TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+
+def _sql_timestamp(timestamp: datetime) -> str:
+    """Fixed-width text for ``timestamp``; timezone-aware timestamps are stored in UTC"""
+    if timestamp.utcoffset() is None:
+        return timestamp.strftime(_TIMESTAMP_FORMAT)
+    return timestamp.astimezone(timezone.utc).strftime(_TIMESTAMP_FORMAT) + '+00:00'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    validation_point TEXT,
+    validator_name TEXT,
+    status TEXT,
+    message TEXT,
+    context TEXT
+);
+CREATE INDEX IF NOT EXISTS events_timestamp ON events (timestamp);
+CREATE INDEX IF NOT EXISTS events_event_type ON events (event_type, timestamp);
+CREATE INDEX IF NOT EXISTS events_validator_name ON events (validator_name);
+CREATE INDEX IF NOT EXISTS events_validation_point ON events (validation_point);
+"""
+
+
+class SQLiteLogger(BaseLogger):
+    """
+    Logger backed by a local SQLite database in WAL mode.
+
+    Events are buffered and inserted in batches (one transaction per batch) by a writer
+    thread, so log_event never waits on the database. get_events pushes its time and
+    event-type filters into indexed SQL queries instead of scanning every event in Python.
+    Timezone-aware timestamps are stored and returned in UTC.
+
+    Args:
+        db_path: SQLite database file
+        batch_size: Wake the writer once this many events are pending
+        flush_interval: Seconds between background flushes of a partial batch
+        projection: Context fields to serialize (defaults to dropping screenshots)
+    """
+
+    def __init__(self,
+                 db_path: str,
+                 batch_size: int = 500,
+                 flush_interval: float = 1.0,
+                 projection: Optional[ContextProjection] = None):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        if projection is not None:
+            self.projection = projection
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+
+        # _lock guards the pending rows and is never held across database work;
+        # _db_lock serializes inserts and queries on the shared connection
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._pending: List[Tuple] = []
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        self._closed = False
+        self._wake = threading.Event()
+        self._writer = threading.Thread(
+            target=self._write_loop, name="bumpers-sqlite-logger", daemon=True
+        )
+        self._writer.start()
+        close_at_exit(self)
+
+    def log_event(self, event: LogEvent):
+        """Buffer an event for the next batched insert"""
+        row = (
+            _sql_timestamp(event.timestamp),
+            event.event_type,
+            event.validation_point,
+            event.validator_name,
+            event.status,
+            event.message,
+            codec.dumps(self.projection.apply(event.context)).decode()
+        )
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("SQLiteLogger is closed")
+            self._pending.append(row)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def _insert_pending(self):
+        # Caller holds _db_lock, so batches are inserted in the order they were logged
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO events (timestamp, event_type, validation_point, validator_name,"
+                " status, message, context) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def flush(self):
+        """Insert any buffered events"""
+        with self._db_lock:
+            self._insert_pending()
+
+    def _write_loop(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def close(self):
+        """Flush buffered events and close the database"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._wake.set()
+        self._writer.join()
+        with self._db_lock:
+            self._insert_pending()
+            self._conn.close()
+
+    def get_events(self,
+                   start_time: Optional[datetime] = None,
+                   end_time: Optional[datetime] = None,
+                   event_type: Optional[str] = None) -> List[LogEvent]:
+        """Retrieve events matching the given criteria using indexed SQL filters"""
+        clauses = []
+        params = []
+        if start_time:
+            clauses.append("timestamp >= ?")
+            params.append(_sql_timestamp(start_time))
+        if end_time:
+            clauses.append("timestamp <= ?")
+            params.append(_sql_timestamp(end_time))
+        if event_type:
+            clauses.append("event_type = ?")
+            params.append(event_type)
+
+        query = ("SELECT timestamp, event_type, validation_point, validator_name, status,"
+                 " message, context FROM events")
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY id"
+
+        with self._db_lock:
+            self._insert_pending()
+            rows = self._conn.execute(query, params).fetchall()
+
+        return [
+            LogEvent(
+                timestamp=datetime.fromisoformat(timestamp),
+                event_type=event_type_,
+                validation_point=validation_point,
+                validator_name=validator_name,
+                status=status,
+                message=message,
+                context=codec.loads(context) if context else {}
+            )
+            for timestamp, event_type_, validation_point, validator_name, status, message, context in rows
+        ]
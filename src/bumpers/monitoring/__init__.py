@@ -1,9 +1,19 @@
-from .conditions import create_high_failure_rate_condition, create_repeated_intervention_condition
-from .monitor import AlertCondition, BumpersMonitor
+from .conditions import (
+    FailureRateCondition,
+    RepeatedInterventionCondition,
+    create_high_failure_rate_condition,
+    create_repeated_intervention_condition
+)
+from .monitor import AlertCondition, BumpersMonitor, StreamingAlertCondition
+from .windows import SlidingWindowCounter
 
 __all__ = [
     "AlertCondition",
     "BumpersMonitor",
+    "StreamingAlertCondition",
+    "FailureRateCondition",
+    "RepeatedInterventionCondition",
+    "SlidingWindowCounter",
     "create_high_failure_rate_condition",
     "create_repeated_intervention_condition"
 ] 
\ No newline at end of file
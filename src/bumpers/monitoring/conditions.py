@@ -1,47 +1,82 @@
 from datetime import timedelta
-from typing import List
+from typing import Optional
 from ..logging.base import LogEvent
-from .monitor import AlertCondition
+from .monitor import AlertCondition, StreamingAlertCondition
+from .windows import SlidingWindowCounter, event_time
+
+class FailureRateCondition(StreamingAlertCondition):
+    """Validation failure rate over a sliding window, from per-second counters"""
+
+    def __init__(self, threshold: float, window: timedelta, cooldown: Optional[timedelta] = None):
+        super().__init__(
+            name="high_failure_rate",
+            alert_message=f"Validation failure rate exceeded {threshold*100}%",
+            cooldown=window if cooldown is None else cooldown
+        )
+        self.threshold = threshold
+        self.validations = SlidingWindowCounter(window)
+        self.failures = SlidingWindowCounter(window)
+
+    def observe(self, event: LogEvent):
+        if event.event_type != 'validation':
+            return
+        timestamp = event_time(event)
+        self.validations.add(timestamp)
+        self.failures.add(timestamp, 1 if event.status == 'fail' else 0)
+
+    def triggered(self, now: Optional[float] = None) -> bool:
+        total = self.validations.total(now)
+        if not total:
+            return False
+        return self.failures.total(now) / total > self.threshold
+
+class RepeatedInterventionCondition(StreamingAlertCondition):
+    """Blocks of one action over a sliding window, from per-second counters"""
+
+    def __init__(self, action: str, count: int, window: timedelta, cooldown: Optional[timedelta] = None):
+        super().__init__(
+            name=f"repeated_{action}_blocks",
+            alert_message=f"Action '{action}' blocked {count} times in {window}",
+            cooldown=window if cooldown is None else cooldown
+        )
+        self.action = action
+        self.count = count
+        self.blocks = SlidingWindowCounter(window)
+
+    def observe(self, event: LogEvent):
+        if (event.event_type == 'intervention' and
+            event.context.get('intervention_type') == 'block_action' and
+            event.context.get('action') == self.action):
+            self.blocks.add(event_time(event))
+
+    def triggered(self, now: Optional[float] = None) -> bool:
+        return self.blocks.total(now) >= self.count
 
 def create_high_failure_rate_condition(
     threshold: float = 0.3,
-    window: timedelta = timedelta(minutes=15)
+    window: timedelta = timedelta(minutes=15),
+    cooldown: Optional[timedelta] = None
 ) -> AlertCondition:
-    """Alert when validation failure rate exceeds threshold"""
-    def check_failure_rate(events: List[LogEvent]) -> bool:
-        validation_events = [e for e in events if e.event_type == 'validation']
-        if not validation_events:
-            return False
-        
-        failed = len([e for e in validation_events if e.status == 'fail'])
-        rate = failed / len(validation_events)
-        return rate > threshold
-        
-    return AlertCondition(
-        name="high_failure_rate",
-        condition_fn=check_failure_rate,
-        alert_message=f"Validation failure rate exceeded {threshold*100}%",
-        cooldown=window
-    )
-    
+    """
+    Alert when validation failure rate exceeds threshold.
+
+    The rate is computed over the last ``window`` of events. Before conditions were
+    streamed it covered the monitor's one-hour lookback and ``window`` only set the
+    cooldown; ``cooldown`` still defaults to ``window``.
+    """
+    return FailureRateCondition(threshold, window, cooldown)
+
 def create_repeated_intervention_condition(
     action: str,
     count: int = 3,
-    window: timedelta = timedelta(minutes=5)
+    window: timedelta = timedelta(minutes=5),
+    cooldown: Optional[timedelta] = None
 ) -> AlertCondition:
-    """Alert when same action is blocked multiple times"""
-    def check_repeated_blocks(events: List[LogEvent]) -> bool:
-        blocks = [
-            e for e in events 
-            if (e.event_type == 'intervention' and 
-                e.context.get('intervention_type') == 'block_action' and
-                e.context.get('action') == action)
-        ]
-        return len(blocks) >= count
-        
-    return AlertCondition(
-        name=f"repeated_{action}_blocks",
-        condition_fn=check_repeated_blocks,
-        alert_message=f"Action '{action}' blocked {count} times in {window}",
-        cooldown=window
-    ) 
\ No newline at end of file
+    """
+    Alert when same action is blocked multiple times.
+
+    Blocks are counted over the last ``window`` of events (previously the monitor's
+    one-hour lookback, with ``window`` only setting the cooldown); ``cooldown``
+    defaults to ``window``.
+    """
+    return RepeatedInterventionCondition(action, count, window, cooldown)
@@ -1,8 +1,11 @@
-from typing import Dict, Any, List, Optional, Callable
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from datetime import datetime, timedelta
 import threading
 import time
-from ..logging.base import BaseLogger, LogEvent
+from ..logging.base import BaseLogger, LogEvent, event_datetime
+from ..logging.bus import EventBus, Subscription
 
 class AlertCondition:
     def __init__(self, 
@@ -15,43 +18,171 @@ class AlertCondition:
         self.alert_message = alert_message
         self.cooldown = cooldown
         self.last_triggered = None
+        # Conditions are fired from the bus thread and the monitor thread
+        self._fire_lock = threading.Lock()
         
     def check(self, events: List[LogEvent]) -> Optional[str]:
         if self.condition_fn(events):
+            return self._fire()
+        return None
+
+    def _fire(self) -> Optional[str]:
+        """Return the alert message unless the condition is still cooling down"""
+        with self._fire_lock:
             now = datetime.now()
-            if (not self.last_triggered or 
+            if (not self.last_triggered or
                 now - self.last_triggered > self.cooldown):
                 self.last_triggered = now
                 return self.alert_message
+            return None
+
+class StreamingAlertCondition(AlertCondition, ABC):
+    """
+    Condition that keeps its own sliding-window state and is fed one event at a time.
+
+    Subclasses implement observe() to update their counters and triggered() to decide
+    from those counters alone, so evaluating the condition never re-reads the log
+    (fetching new events to feed it still does, unless the monitor is attached to a bus).
+    """
+
+    def __init__(self,
+                 name: str,
+                 alert_message: str,
+                 cooldown: timedelta = timedelta(minutes=5)):
+        super().__init__(name, self._check_events, alert_message, cooldown)
+
+    @abstractmethod
+    def observe(self, event: LogEvent):
+        """Update the condition's counters with a new event"""
+        pass
+
+    @abstractmethod
+    def triggered(self, now: Optional[float] = None) -> bool:
+        """Whether the condition holds for the window ending at ``now`` (POSIX seconds)"""
+        pass
+
+    def evaluate(self, now: Optional[float] = None) -> Optional[str]:
+        """Alert message if the condition holds and is not cooling down"""
+        if self.triggered(now):
+            return self._fire()
         return None
 
+    def _check_events(self, events: List[LogEvent]) -> bool:
+        # List-based check() for callers outside the monitor: feeds the events into
+        # the counters, so each event should only be passed once
+        for event in events:
+            self.observe(event)
+        return self.triggered()
+
+def _event_key(event: LogEvent) -> Tuple:
+    # Stable across re-reads of the same event; equal keys are told apart by count
+    return (event_datetime(event), event.event_type, event.validation_point,
+            event.validator_name, event.status, event.message)
+
+
 class BumpersMonitor:
+    """
+    Evaluates alert conditions over the events in a logger.
+
+    Without a bus, every check_interval tick asks the logger for the events since the
+    newest one already seen, minus ``reorder_grace``: events from several threads or
+    agents may be logged slightly out of timestamp order, and the overlap lets late
+    ones still be counted (events already seen are recognized and skipped). Events
+    that arrive more than reorder_grace behind the newest one are missed. Each tick is
+    a get_events call, which for FileLogger parses the whole file; attach() the monitor
+    to an EventBus to receive events as they are logged without reading the log.
+    """
+
     def __init__(self, 
                  logger: BaseLogger,
                  alert_handlers: List[Callable[[str], None]],
-                 check_interval: int = 60):
+                 check_interval: int = 60,
+                 reorder_grace: timedelta = timedelta(minutes=1)):
         self.logger = logger
         self.alert_handlers = alert_handlers
         self.check_interval = check_interval
+        self.reorder_grace = reorder_grace
         self.conditions: List[AlertCondition] = []
         self._stop_flag = False
         self._monitor_thread = None
+        # Newest timestamp seen, and how often each event in the grace window before
+        # it was seen, so overlapping queries only yield events not counted yet
+        self._newest: Optional[datetime] = None
+        self._seen: Counter = Counter()
+        self._subscription: Optional[Subscription] = None
         
     def add_condition(self, condition: AlertCondition):
         """Add a monitoring condition"""
         self.conditions.append(condition)
+
+    def _streaming_conditions(self) -> List[StreamingAlertCondition]:
+        return [c for c in self.conditions if isinstance(c, StreamingAlertCondition)]
+
+    def _alert(self, alert: str):
+        for handler in self.alert_handlers:
+            handler(alert)
+
+    def observe(self, event: LogEvent):
+        """Feed one event to the streaming conditions and alert on any that now hold"""
+        for condition in self._streaming_conditions():
+            condition.observe(event)
+            if alert := condition.evaluate():
+                self._alert(alert)
+
+    def attach(self, bus: EventBus, **subscription_options) -> Subscription:
+        """
+        Receive events pushed from an EventBus instead of polling the logger.
+
+        Streaming conditions are then evaluated as each event arrives, so alerts fire
+        within milliseconds rather than on the next check_interval tick.
+        """
+        self._subscription = bus.subscribe(self.observe, name="monitor", **subscription_options)
+        return self._subscription
+
+    def _new_events(self, now: datetime) -> List[LogEvent]:
+        """Events logged since the previous tick (the last hour on the first one)"""
+        if self._newest is None:
+            start_time = now - timedelta(hours=1)
+        else:
+            start_time = self._newest - self.reorder_grace
+        events = []
+        scanned: Counter = Counter()
+        for event in self.logger.get_events(start_time=start_time):
+            key = _event_key(event)
+            scanned[key] += 1
+            if scanned[key] <= self._seen[key]:
+                continue
+            self._seen[key] = scanned[key]
+            if self._newest is None or key[0] > self._newest:
+                self._newest = key[0]
+            events.append(event)
+
+        if self._newest is not None:
+            # Older events fall before the next query's start and are never seen again
+            cutoff = self._newest - self.reorder_grace
+            self._seen = Counter({key: n for key, n in self._seen.items() if key[0] >= cutoff})
+        return events
         
     def _check_conditions(self):
         """Check all monitoring conditions"""
-        # Get recent events (last hour)
-        end_time = datetime.now()
-        start_time = end_time - timedelta(hours=1)
-        events = self.logger.get_events(start_time=start_time)
-        
-        for condition in self.conditions:
-            if alert := condition.check(events):
-                for handler in self.alert_handlers:
-                    handler(alert)
+        now = datetime.now()
+        streaming = self._streaming_conditions()
+        if streaming:
+            if self._subscription is None:
+                for event in self._new_events(now):
+                    self.observe(event)
+            # Re-evaluate at wall-clock time so windows slide even without new events
+            for condition in streaming:
+                if alert := condition.evaluate(now.timestamp()):
+                    self._alert(alert)
+
+        legacy = [c for c in self.conditions if not isinstance(c, StreamingAlertCondition)]
+        if legacy:
+            # Get recent events (last hour)
+            events = self.logger.get_events(start_time=now - timedelta(hours=1))
+            for condition in legacy:
+                if alert := condition.check(events):
+                    self._alert(alert)
                     
     def start(self):
         """Start the monitoring thread"""
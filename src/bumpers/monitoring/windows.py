@@ -0,0 +1,66 @@
+import math
+import threading
+from datetime import timedelta
+from typing import Optional, Union
+from ..logging.base import LogEvent, event_datetime
+
+
+def event_time(event: LogEvent) -> float:
+    """Event timestamp as POSIX seconds"""
+    return event_datetime(event).timestamp()
+
+
+class SlidingWindowCounter:
+    """
+    Count of events over a sliding time window, kept in a ring of fixed-width buckets.
+
+    Adding an event and reading the total are O(1) amortized: buckets that fall out of
+    the window are cleared as the head of the ring advances, and a running total is kept
+    alongside the buckets.
+
+    Args:
+        window: Length of the window
+        bucket_seconds: Bucket width; the window edge is accurate to one bucket
+    """
+
+    def __init__(self, window: Union[timedelta, float], bucket_seconds: float = 1.0):
+        seconds = window.total_seconds() if isinstance(window, timedelta) else float(window)
+        self.bucket_seconds = bucket_seconds
+        self._size = max(1, math.ceil(seconds / bucket_seconds))
+        self._counts = [0] * self._size
+        self._head: Optional[int] = None  # Absolute index of the newest bucket
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def _advance(self, index: int):
+        if self._head is None:
+            self._head = index
+            return
+        if index <= self._head:
+            return
+        if index - self._head >= self._size:
+            self._counts = [0] * self._size
+            self._total = 0
+        else:
+            for stale in range(self._head + 1, index + 1):
+                slot = stale % self._size
+                self._total -= self._counts[slot]
+                self._counts[slot] = 0
+        self._head = index
+
+    def add(self, timestamp: float, count: int = 1):
+        """Count ``count`` events at ``timestamp`` (POSIX seconds); events older than the window are ignored"""
+        index = int(timestamp // self.bucket_seconds)
+        with self._lock:
+            self._advance(index)
+            if index <= self._head - self._size:
+                return
+            self._counts[index % self._size] += count
+            self._total += count
+
+    def total(self, now: Optional[float] = None) -> int:
+        """Events in the window ending at ``now``, or at the newest event seen when omitted"""
+        with self._lock:
+            if now is not None:
+                self._advance(int(now // self.bucket_seconds))
+            return self._total
@@ -1,3 +1,7 @@
+from .compiler import CompiledPolicy, PolicyCompiler, RuleType, register_rule_type
 from .parser import PolicyParser
+from .replay import ReplayReport, replay, shadow_replay
+from .watcher import PolicyWatcher
 
-__all__ = ["PolicyParser"] 
\ No newline at end of file
+__all__ = ["CompiledPolicy", "PolicyCompiler", "PolicyParser", "PolicyWatcher", "ReplayReport", "RuleType",
+           "register_rule_type", "replay", "shadow_replay"]
@@ -0,0 +1,272 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+import yaml
+from .. import __version__
+from ..core.engine import CoreValidationEngine, ValidationPoint
+from ..types import FailStrategy
+from ..validators.action import ActionWhitelistValidator
+from ..validators.base import BaseValidator
+from ..validators.content import ContentFilterValidator
+
+# Bump when the compiled representation changes so stale cache entries are ignored
+_CACHE_FORMAT = 1
+
+
+class RuleType(NamedTuple):
+    """How to build (and optionally merge) validators for one policy ``type``"""
+    build: Callable[[str, Dict[str, Any], FailStrategy], BaseValidator]
+    default_point: ValidationPoint
+    # Combines the parameters of several rules into one rule's parameters
+    merge: Optional[Callable[[List[Dict[str, Any]]], Dict[str, Any]]] = None
+    # Parameters that must be equal for rules to be merged
+    merge_options: Tuple[str, ...] = ()
+
+
+def _merge_whitelists(params: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Every whitelist must admit the action, so the merged rule allows the intersection
+    allowed = [set(p['allowed_actions']) for p in params]
+    first = list(dict.fromkeys(params[0]['allowed_actions']))
+    return {'allowed_actions': [a for a in first if all(a in s for s in allowed)]}
+
+
+def _merge_content_filters(params: List[Dict[str, Any]]) -> Dict[str, Any]:
+    words = [w for p in params for w in (p.get('forbidden_words') or [])]
+    lengths = [p['max_length'] for p in params if p.get('max_length')]
+    return {
+        **params[0],
+        'forbidden_words': list(dict.fromkeys(words)),
+        'max_length': min(lengths) if lengths else None
+    }
+
+
+RULE_TYPES: Dict[str, RuleType] = {
+    'ActionWhitelist': RuleType(
+        build=lambda name, params, fail_strategy: ActionWhitelistValidator(
+            allowed_actions=params['allowed_actions'],
+            name=name,
+            fail_strategy=fail_strategy
+        ),
+        default_point=ValidationPoint.PRE_ACTION,
+        merge=_merge_whitelists
+    ),
+    'ContentFilter': RuleType(
+        build=lambda name, params, fail_strategy: ContentFilterValidator(
+            forbidden_words=params.get('forbidden_words'),
+            max_length=params.get('max_length'),
+            name=name,
+            fail_strategy=fail_strategy,
+            case_sensitive=params.get('case_sensitive', False),
+            whole_words=params.get('whole_words', False)
+        ),
+        default_point=ValidationPoint.PRE_OUTPUT,
+        merge=_merge_content_filters,
+        merge_options=('case_sensitive', 'whole_words')
+    ),
+}
+
+
+def register_rule_type(name: str, rule_type: RuleType):
+    """Make a validator type available to policy files"""
+    RULE_TYPES[name] = rule_type
+
+
+def _parse_point(value: str) -> ValidationPoint:
+    try:
+        return ValidationPoint[value.upper()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown validation point '{value}', expected one of {[p.name for p in ValidationPoint]}"
+        ) from None
+
+
+@dataclass(frozen=True, eq=False)
+class CompiledPolicy:
+    """
+    Immutable execution plan: the validators to run at each validation point.
+
+    Apply it to an engine with ``engine.apply_policy(policy)`` (or ``policy.bind(engine)``).
+    """
+    plan: Mapping[ValidationPoint, Tuple[BaseValidator, ...]]
+    digest: str
+    source: Optional[str] = None
+
+    def validators(self, point: ValidationPoint) -> Tuple[BaseValidator, ...]:
+        return self.plan.get(point, ())
+
+    def bind(self, engine: CoreValidationEngine) -> CoreValidationEngine:
+        engine.apply_policy(self)
+        return engine
+
+    def __reduce__(self):
+        # The read-only plan proxy cannot be pickled (e.g. to spawned replay workers)
+        return _unpickle_policy, (dict(self.plan), self.digest, self.source)
+
+
+def _unpickle_policy(plan: Dict[ValidationPoint, Tuple[BaseValidator, ...]],
+                     digest: str,
+                     source: Optional[str]) -> CompiledPolicy:
+    return CompiledPolicy(MappingProxyType(plan), digest, source)
+
+
+def _qualname(obj: Any) -> str:
+    return f"{getattr(obj, '__module__', None)}.{getattr(obj, '__qualname__', repr(obj))}"
+
+
+def _rule_types_key() -> bytes:
+    """Registered rule types and the code that builds them, for cache keys"""
+    return "\0".join(
+        f"{name}={_qualname(rule_type.build)},{_qualname(rule_type.merge)}"
+        for name, rule_type in sorted(RULE_TYPES.items())
+    ).encode()
+
+
+class PolicyCompiler:
+    """
+    Compiles policy YAML into a CompiledPolicy.
+
+    Each rule's ``applies_to`` (a point name or list of names) decides where it runs, and
+    ``on_fail`` becomes the intervention type logged when it rejects an input. Rules of a
+    mergeable type at the same point with the same on_fail and fail_strategy are merged,
+    so e.g. several content filters become one automaton and one scan. Sets, matchers and
+    other per-validator structures are built at compile time.
+
+    When a ``cache_dir`` is given, compiled plans are pickled there keyed by a hash of the
+    policy file and the registered rule types, so later processes load the built
+    validators instead of re-parsing and rebuilding them. The key cannot see edits to
+    validator code itself, so clear the directory after changing it. Only point cache_dir
+    at a directory you trust, since cache entries are unpickled.
+
+    Args:
+        cache_dir: Directory for compiled plans; nothing is cached on disk when omitted
+        use_cache: Set False to always compile from source even with a cache_dir
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, use_cache: bool = True):
+        self.cache_dir = cache_dir
+        self.use_cache = use_cache and cache_dir is not None
+
+    def compile(self,
+                policy: Dict[str, Any],
+                digest: Optional[str] = None,
+                source: Optional[str] = None) -> CompiledPolicy:
+        """Compile an already-parsed policy dict"""
+        if digest is None:
+            digest = hashlib.sha256(repr(policy).encode()).hexdigest()
+        return self._freeze(self._build(policy), digest, source)
+
+    def compile_file(self, filepath: str) -> CompiledPolicy:
+        """Compile a policy file, loading it from the cache (if any) when unchanged"""
+        return self.compile_files([filepath])
+
+    def compile_files(self, filepaths: List[str]) -> CompiledPolicy:
+        """Compile several policy files as one policy (their rules concatenated in order)"""
+        sources = []
+        for filepath in filepaths:
+            with open(filepath, 'rb') as f:
+                sources.append(f.read())
+        hasher = hashlib.sha256(f"{_CACHE_FORMAT}:{__version__}".encode())
+        hasher.update(b"\0" + _rule_types_key())
+        for raw in sources:
+            hasher.update(b"\0" + hashlib.sha256(raw).digest())
+        digest = hasher.hexdigest()
+
+        plan = self._load_cached(digest) if self.use_cache else None
+        if plan is None:
+            rules = []
+            for raw in sources:
+                rules.extend((yaml.safe_load(raw) or {}).get('validators') or [])
+            plan = self._build({'validators': rules})
+            if self.use_cache:
+                self._store_cached(digest, plan)
+        return self._freeze(plan, digest, os.pathsep.join(filepaths))
+
+    @staticmethod
+    def _freeze(plan: Dict[ValidationPoint, List[BaseValidator]],
+                digest: str,
+                source: Optional[str]) -> CompiledPolicy:
+        return CompiledPolicy(
+            plan=MappingProxyType({point: tuple(validators) for point, validators in plan.items()}),
+            digest=digest,
+            source=source
+        )
+
+    def _build(self, policy: Dict[str, Any]) -> Dict[ValidationPoint, List[BaseValidator]]:
+        # Group rules per point, keeping first-appearance order of the groups
+        groups: Dict[ValidationPoint, Dict[Any, List[Tuple[str, Dict[str, Any]]]]] = {
+            point: {} for point in ValidationPoint
+        }
+        for index, config in enumerate(policy.get('validators') or []):
+            validator_type = config.get('type')
+            rule_type = RULE_TYPES.get(validator_type)
+            if rule_type is None:
+                raise ValueError(f"Unknown validator type '{validator_type}' in policy")
+            params = dict(config.get('parameters') or {})
+            name = config.get('name', f"{validator_type}_{index}")
+            on_fail = config.get('on_fail', 'block_action')
+            fail_strategy = FailStrategy(config.get('fail_strategy', FailStrategy.RAISE_ERROR.value))
+
+            applies_to = config.get('applies_to')
+            if applies_to is None:
+                points = [rule_type.default_point]
+            elif isinstance(applies_to, str):
+                points = [_parse_point(applies_to)]
+            else:
+                points = [_parse_point(p) for p in applies_to]
+
+            if rule_type.merge is not None:
+                group = tuple(repr(params.get(option)) for option in rule_type.merge_options)
+            else:
+                group = index  # never merged
+            key = (validator_type, on_fail, fail_strategy, group)
+            for point in dict.fromkeys(points):
+                groups[point].setdefault(key, []).append((name, params))
+
+        plan: Dict[ValidationPoint, List[BaseValidator]] = {}
+        for point, point_groups in groups.items():
+            for key, rules in point_groups.items():
+                validator_type, on_fail, fail_strategy, _ = key
+                rule_type = RULE_TYPES[validator_type]
+                names = list(dict.fromkeys(name for name, _ in rules))
+                params = rule_type.merge([p for _, p in rules]) if len(rules) > 1 else rules[0][1]
+                validator = rule_type.build("+".join(names), params, fail_strategy)
+                validator.intervention_type = on_fail
+                plan.setdefault(point, []).append(validator)
+        return plan
+
+    def _cache_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, f"{digest}.pickle")
+
+    def _load_cached(self, digest: str) -> Optional[Dict[ValidationPoint, List[BaseValidator]]]:
+        try:
+            with open(self._cache_path(digest), 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupt or incompatible entry: recompile and overwrite it
+            return None
+
+    def _store_cached(self, digest: str, plan: Dict[ValidationPoint, List[BaseValidator]]):
+        tmp = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(plan, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._cache_path(digest))
+            tmp = None
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            # The cache is an optimization; compiling still succeeded. Validators holding
+            # locks or other unpicklable state just aren't cached.
+            pass
+        finally:
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
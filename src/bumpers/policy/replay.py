@@ -0,0 +1,492 @@
+"""
+Offline re-evaluation of a policy over recorded validation events.
+
+Sources are FileLogger logs (JSONL or binary) and datasets written by
+``bumpers.analytics.columnar.export_events`` (Parquet or Arrow IPC). They are cut into
+shards (byte ranges of JSONL files, row groups or record batches of columnar files) and
+the shards are replayed on a process pool, each worker running the policy with
+CoreValidationEngine.validate_batch.
+
+replay returns the candidate's verdict for every recorded step; shadow_replay compares
+those verdicts with the recorded decisions and keeps only a fixed-size report.
+"""
+
+import glob
+import multiprocessing
+import os
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+from ..core.batch import BatchResults
+from ..core.engine import STEP_ID_KEY, CoreValidationEngine, ValidationPoint
+from ..logging import codec
+from .compiler import CompiledPolicy, PolicyCompiler
+
+_EXTENSIONS = (".jsonl", ".bin", ".parquet", ".arrow")
+
+PolicySource = Union[str, Sequence[str], Dict[str, Any], CompiledPolicy]
+
+
+class Shard(NamedTuple):
+    """A unit of replay work: ``[start, stop)`` bytes of a JSONL file, or row groups/batches"""
+    path: str
+    start: int
+    stop: int
+
+
+def _expand(sources: Union[str, Sequence[str]]) -> List[str]:
+    if isinstance(sources, str):
+        sources = [sources]
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            paths.extend(sorted(
+                path for path in glob.glob(os.path.join(source, "**", "*"), recursive=True)
+                if path.endswith(_EXTENSIONS)
+            ))
+        else:
+            paths.append(source)
+    return paths
+
+
+def plan_shards(sources: Union[str, Sequence[str]], shard_bytes: int = 64 * 1024 * 1024) -> List[Shard]:
+    """
+    Split sources into shards of about ``shard_bytes`` that can be replayed independently.
+
+    JSONL files are cut into byte ranges (each line belongs to the range its first byte
+    falls in), Parquet files into runs of row groups and Arrow files into record batches.
+    Binary FileLogger logs are replayed one file per shard.
+    """
+    shards = []
+    for path in _expand(sources):
+        if path.endswith(".parquet"):
+            from ..analytics.columnar import _pyarrow
+            metadata = _pyarrow().parquet.ParquetFile(path).metadata
+            start, size = 0, 0
+            for group in range(metadata.num_row_groups):
+                size += metadata.row_group(group).total_byte_size
+                if size >= shard_bytes:
+                    shards.append(Shard(path, start, group + 1))
+                    start, size = group + 1, 0
+            if start < metadata.num_row_groups:
+                shards.append(Shard(path, start, metadata.num_row_groups))
+        elif path.endswith(".arrow"):
+            from ..analytics.columnar import _pyarrow
+            with _pyarrow().ipc.open_file(path) as reader:
+                batches = reader.num_record_batches
+            shards.extend(Shard(path, batch, batch + 1) for batch in range(batches))
+        elif path.endswith(".bin"):
+            shards.append(Shard(path, 0, -1))
+        else:
+            size = os.path.getsize(path)
+            shards.extend(
+                Shard(path, start, min(start + shard_bytes, size))
+                for start in range(0, size, shard_bytes)
+            )
+    return shards
+
+
+# Readers yield (where, event_type, validation_point, validator_name, status, context):
+# where is 0 for the shard's own events, -1 for events read back from before the shard
+# and 1 for events after it, so a step split across two shards is read whole by the
+# shard its first event belongs to and skipped by the next one.
+
+# How far back a shard reads to find the steps in progress at its start
+_LOOKBACK_BYTES = 512 * 1024
+_LOOKBACK_ROWS = 1000
+
+# A step is taken to be complete once this many events have been read since its last
+# one; read-ahead past the end of a shard stops after as many events
+_STEP_SPAN = 1000
+
+
+def _event_fields(event: Dict[str, Any]) -> Tuple[str, str, str, str, Any]:
+    return (event['event_type'], event['validation_point'], event['validator_name'],
+            event['status'], event['context'])
+
+
+def _read_jsonl(shard: Shard) -> Iterator[Tuple[int, str, str, str, str, Any]]:
+    with open(shard.path, 'rb') as f:
+        if shard.start:
+            # Skip the line that started in the previous shard
+            f.seek(shard.start - 1)
+            f.readline()
+            position = f.tell()
+            lookback = max(0, position - _LOOKBACK_BYTES)
+            f.seek(lookback)
+            if lookback:
+                f.readline()  # partial line
+            while f.tell() < position:
+                line = f.readline()
+                if line.strip():
+                    yield (-1, *_event_fields(codec.loads(line)))
+        while True:
+            where = 0 if f.tell() < shard.stop else 1
+            line = f.readline()
+            if not line:
+                break
+            if line.strip():
+                yield (where, *_event_fields(codec.loads(line)))
+
+
+def _read_binary(shard: Shard) -> Iterator[Tuple[int, str, str, str, str, Any]]:
+    with open(shard.path, 'rb') as f:
+        for payload in codec.iter_records(f):
+            fields = codec.loads(payload)
+            yield 0, fields[1], fields[2], fields[3], fields[4], fields[6]
+
+
+def _read_columnar(shard: Shard) -> Iterator[Tuple[int, str, str, str, str, Any]]:
+    from ..analytics.columnar import _pyarrow
+    pa = _pyarrow()
+    columns = ["event_type", "validation_point", "validator_name", "status", "context"]
+
+    if shard.path.endswith(".parquet"):
+        parquet = pa.parquet.ParquetFile(shard.path)
+        count = parquet.metadata.num_row_groups
+
+        def chunk(index):
+            return parquet.read_row_group(index, columns=columns)
+    else:
+        reader = pa.ipc.open_file(pa.memory_map(shard.path))
+        count = reader.num_record_batches
+
+        def chunk(index):
+            return pa.Table.from_batches([reader.get_batch(index)]).select(columns)
+
+    def rows(table, where):
+        values = zip(*(table[name].to_pylist() for name in columns))
+        for event_type, point, validator_name, status, context in values:
+            yield where, event_type, point, validator_name, status, codec.loads(context) if context else {}
+
+    if shard.start:
+        previous = chunk(shard.start - 1)
+        yield from rows(previous.slice(max(0, previous.num_rows - _LOOKBACK_ROWS)), -1)
+    for index in range(shard.start, shard.stop):
+        yield from rows(chunk(index), 0)
+    if shard.stop < count:
+        yield from rows(chunk(shard.stop), 1)
+
+
+class Step(NamedTuple):
+    """One agent step as recorded: its point, context and the validator that blocked it, if any"""
+    point: str
+    context: Dict[str, Any]
+    blocked_by: Optional[str]
+
+
+def iter_steps(shard: Shard, points: Optional[Sequence[str]] = None) -> Iterator[Step]:
+    """
+    Yield the agent steps recorded in a shard, in the order they started.
+
+    The engine logs a step (one validate call) as one validation event per validator
+    that ran, followed by an intervention event if one of them failed, and tags each of
+    them with the step's id. Events are grouped by that id, so steps of concurrent agents
+    sharing a logger may interleave, and validators may add findings to the context they
+    log. A step is blocked by the first of its validators that failed; it is complete at
+    its intervention, or once _STEP_SPAN events have gone by without another of its own.
+    Other events, such as shadow_validation events, are ignored.
+
+    Logs written before events carried step ids are grouped by position instead: a step
+    ends at an intervention, at a change of point or context, or when a validator that
+    already ran in it appears again (a repeat of the same step).
+    """
+    if shard.path.endswith((".parquet", ".arrow")):
+        events = _read_columnar(shard)
+    elif shard.path.endswith(".bin"):
+        events = _read_binary(shard)
+    else:
+        events = _read_jsonl(shard)
+
+    # Open steps by key, in the order they started: [point, context, blocked_by, last, done]
+    steps: "OrderedDict[Any, list]" = OrderedDict()
+    foreign = set()  # steps that began before the shard; the previous shard yields them
+    legacy = None  # [key, point, context, names] of the step being read from a log without ids
+    legacy_keys = 0
+    read_ahead = None
+
+    for index, (where, event_type, point, validator_name, status, context) in enumerate(events):
+        if where > 0:
+            read_ahead = index if read_ahead is None else read_ahead
+            if not steps or index - read_ahead >= _STEP_SPAN:
+                break  # the steps running over the end of the shard are complete
+        if event_type not in ('validation', 'intervention'):
+            continue
+        key = context.get(STEP_ID_KEY) if isinstance(context, dict) else None
+        if key is None:
+            if (event_type == 'validation' and legacy is not None and legacy[1] == point
+                    and legacy[2] == context and validator_name not in legacy[3]):
+                legacy[3].add(validator_name)
+            else:
+                if legacy is not None and legacy[0] in steps:
+                    steps[legacy[0]][4] = True
+                legacy = None
+                if event_type == 'validation':
+                    legacy_keys += 1
+                    legacy = [('legacy', legacy_keys), point, context, {validator_name}]
+            if legacy is None:
+                continue
+            key = legacy[0]
+            if event_type == 'intervention':
+                legacy = None
+
+        if where < 0:
+            foreign.add(key)
+            continue
+        if key in foreign:
+            continue
+        step = steps.get(key)
+        if step is None:
+            if where > 0 or event_type != 'validation':
+                continue  # only steps that start in the shard belong to it
+            step = steps[key] = [point, {k: v for k, v in context.items() if k != STEP_ID_KEY},
+                                 None, index, False]
+        step[3] = index
+        if event_type == 'intervention':
+            step[4] = True
+        elif status == 'fail' and step[2] is None:
+            step[2] = validator_name
+
+        while steps:
+            first = next(iter(steps.values()))
+            if not first[4] and index - first[3] < _STEP_SPAN:
+                break
+            steps.popitem(last=False)
+            if points is None or first[0] in points:
+                yield Step(first[0], first[1], first[2])
+
+    for step in steps.values():
+        if points is None or step[0] in points:
+            yield Step(step[0], step[1], step[2])
+
+
+def iter_contexts(shard: Shard, points: Optional[Sequence[str]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield ``(validation point, context)`` for each agent step recorded in a shard"""
+    for step in iter_steps(shard, points):
+        yield step.point, step.context
+
+
+def build_engine(policy: PolicySource) -> CoreValidationEngine:
+    """
+    An engine running ``policy``: a CompiledPolicy, policy file path(s), or a policy dict
+    as returned by PolicyParser.load_policy_file
+    """
+    if isinstance(policy, dict):
+        policy = PolicyCompiler(use_cache=False).compile(policy)
+    elif not isinstance(policy, CompiledPolicy):
+        policy = PolicyCompiler().compile_files([policy] if isinstance(policy, str) else list(policy))
+    engine = CoreValidationEngine()
+    engine.apply_policy(policy)
+    return engine
+
+
+def _replay_shard(engine: CoreValidationEngine,
+                  shard: Shard,
+                  points: Optional[Sequence[str]],
+                  batch_size: int) -> Dict[str, BatchResults]:
+    results: Dict[str, BatchResults] = {}
+    pending: Dict[str, List[Dict[str, Any]]] = {}
+
+    def run(point: str):
+        batch = engine.validate_batch(ValidationPoint(point), pending.pop(point))
+        if point in results:
+            results[point].extend(batch)
+        else:
+            results[point] = batch
+
+    for point, context in iter_contexts(shard, points):
+        contexts = pending.setdefault(point, [])
+        contexts.append(context)
+        if len(contexts) >= batch_size:
+            run(point)
+    for point in list(pending):
+        run(point)
+    return results
+
+
+@dataclass
+class VerdictChange:
+    """A recorded step on which the candidate policy decides differently"""
+    point: str
+    context: Dict[str, Any]
+    original: Optional[str]  # validator that blocked the step when recorded, or None
+    candidate: Optional[str]  # validator of the candidate policy that blocks it, or None
+    message: Optional[str]
+    source: str
+
+
+@dataclass
+class ReplayReport:
+    """
+    Verdicts of a candidate policy compared with the decisions recorded in the logs.
+
+    ``outcomes`` counts steps per ``(point, originally blocked, blocked by candidate)``.
+    Up to ``max_examples`` changed steps of each direction are kept as examples; the
+    report's size does not grow with the amount of traffic replayed.
+    """
+    max_examples: int = 100
+    steps: int = 0
+    outcomes: Counter = field(default_factory=Counter)
+    candidate_blocks: Counter = field(default_factory=Counter)
+    newly_blocked: List[VerdictChange] = field(default_factory=list)
+    newly_allowed: List[VerdictChange] = field(default_factory=list)
+
+    def _count(self, original: bool, candidate: bool) -> int:
+        return sum(n for (_, was, now), n in self.outcomes.items() if was == original and now == candidate)
+
+    @property
+    def blocked_before(self) -> int:
+        return self._count(True, True) + self._count(True, False)
+
+    @property
+    def blocked_after(self) -> int:
+        return self._count(True, True) + self._count(False, True)
+
+    @property
+    def changed(self) -> int:
+        """Steps whose verdict (blocked or allowed) differs"""
+        return self._count(True, False) + self._count(False, True)
+
+    def add(self, point: str, step: Step, candidate: Optional[str], message: Optional[str], source: str):
+        self.steps += 1
+        self.outcomes[(point, step.blocked_by is not None, candidate is not None)] += 1
+        if candidate is not None:
+            self.candidate_blocks[candidate] += 1
+        if (step.blocked_by is None) != (candidate is None):
+            examples = self.newly_blocked if candidate is not None else self.newly_allowed
+            if len(examples) < self.max_examples:
+                examples.append(VerdictChange(point, step.context, step.blocked_by, candidate, message, source))
+
+    def merge(self, other: 'ReplayReport'):
+        self.steps += other.steps
+        self.outcomes.update(other.outcomes)
+        self.candidate_blocks.update(other.candidate_blocks)
+        self.newly_blocked.extend(other.newly_blocked[:self.max_examples - len(self.newly_blocked)])
+        self.newly_allowed.extend(other.newly_allowed[:self.max_examples - len(self.newly_allowed)])
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'steps': self.steps,
+            'blocked_before': self.blocked_before,
+            'blocked_after': self.blocked_after,
+            'newly_blocked': self._count(False, True),
+            'newly_allowed': self._count(True, False),
+            'candidate_blocks': dict(self.candidate_blocks)
+        }
+
+
+def _shadow_shard(engine: CoreValidationEngine,
+                  shard: Shard,
+                  points: Optional[Sequence[str]],
+                  batch_size: int,
+                  max_examples: int) -> ReplayReport:
+    report = ReplayReport(max_examples=max_examples)
+    pending: Dict[str, List[Step]] = {}
+
+    def run(point: str):
+        steps = pending.pop(point)
+        results = engine.validate_batch(ValidationPoint(point), [step.context for step in steps])
+        for row, step in enumerate(steps):
+            report.add(point, step, results.blocked_by(row), results.messages.get(row), shard.path)
+
+    for step in iter_steps(shard, points):
+        steps = pending.setdefault(step.point, [])
+        steps.append(step)
+        if len(steps) >= batch_size:
+            run(step.point)
+    for point in list(pending):
+        run(point)
+    return report
+
+
+_worker_engine: Optional[CoreValidationEngine] = None
+
+
+def _init_worker(policy: PolicySource):
+    global _worker_engine
+    _worker_engine = build_engine(policy)
+
+
+def _run_in_worker(args):
+    function, *task = args
+    return function(_worker_engine, *task)
+
+
+def _map_shards(function, policy: PolicySource, tasks: List[tuple], processes: Optional[int]) -> Iterator[Any]:
+    """Run ``function(engine, *task)`` for each task, on a process pool unless processes is 1"""
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(tasks) <= 1:
+        engine = build_engine(policy)
+        for task in tasks:
+            yield function(engine, *task)
+        return
+    with multiprocessing.Pool(min(processes, len(tasks)), _init_worker, (policy,)) as pool:
+        yield from pool.imap(_run_in_worker, [(function, *task) for task in tasks])
+
+
+def replay(sources: Union[str, Sequence[str]],
+           policy: PolicySource,
+           points: Optional[Sequence[ValidationPoint]] = None,
+           processes: Optional[int] = None,
+           shard_bytes: int = 64 * 1024 * 1024,
+           batch_size: int = 10000) -> Dict[ValidationPoint, BatchResults]:
+    """
+    Re-run a policy over recorded validation events on all cores.
+
+    Args:
+        sources: Log files, directories, or exported datasets (see plan_shards)
+        policy: The policy to evaluate (see build_engine). Each
+            worker process builds its own engine from it.
+        points: Only replay events recorded at these validation points
+        processes: Worker processes (defaults to the CPU count; 1 replays in-process)
+        shard_bytes: Approximate size of a shard
+        batch_size: Contexts per validate_batch call
+
+    Returns:
+        One BatchResults per validation point, rows in the order the events were recorded
+    """
+    point_values = [point.value for point in points] if points is not None else None
+    tasks = [(shard, point_values, batch_size) for shard in plan_shards(sources, shard_bytes)]
+
+    combined: Dict[ValidationPoint, BatchResults] = {}
+    for partial in _map_shards(_replay_shard, policy, tasks, processes):
+        for point, batch in partial.items():
+            point = ValidationPoint(point)
+            if point in combined:
+                combined[point].extend(batch)
+            else:
+                combined[point] = batch
+    return combined
+
+
+def shadow_replay(sources: Union[str, Sequence[str]],
+                  candidate: PolicySource,
+                  points: Optional[Sequence[ValidationPoint]] = None,
+                  processes: Optional[int] = None,
+                  shard_bytes: int = 64 * 1024 * 1024,
+                  batch_size: int = 10000,
+                  max_examples: int = 100) -> ReplayReport:
+    """
+    Evaluate a candidate policy against recorded traffic and report where its verdicts differ.
+
+    Every recorded step is run through the candidate in shadow mode (validate_batch:
+    nothing is raised or logged) and its verdict compared with the decision recorded at
+    the time. Logs are streamed shard by shard, batch_size steps at a time, so memory
+    stays constant however large the logs are, and shards are spread over all cores.
+
+    Args:
+        sources: Log files, directories, or exported datasets (see plan_shards)
+        candidate: The policy to trial (see build_engine)
+        points: Only replay steps recorded at these validation points
+        processes: Worker processes (defaults to the CPU count; 1 replays in-process)
+        shard_bytes: Approximate size of a shard
+        batch_size: Steps per validate_batch call
+        max_examples: Changed steps kept as examples for each direction
+    """
+    point_values = [point.value for point in points] if points is not None else None
+    tasks = [(shard, point_values, batch_size, max_examples) for shard in plan_shards(sources, shard_bytes)]
+
+    report = ReplayReport(max_examples=max_examples)
+    for partial in _map_shards(_shadow_shard, candidate, tasks, processes):
+        report.merge(partial)
+    return report
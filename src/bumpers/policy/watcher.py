@@ -0,0 +1,118 @@
+import glob
+import logging
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from ..core.engine import CoreValidationEngine
+from .compiler import CompiledPolicy, PolicyCompiler
+
+_log = logging.getLogger(__name__)
+
+
+class PolicyWatcher:
+    """
+    Keeps a CoreValidationEngine running the latest version of its policy files.
+
+    A background thread polls the files' modification time and size. When they change
+    (or files are added or removed), the policy is recompiled on that thread and swapped
+    into the engine with CoreValidationEngine.apply_policy, a single reference assignment:
+    validations in progress finish on the old plan and nothing on the validation path
+    waits for the reload. If the new policy fails to compile, the engine keeps the last
+    good plan and on_error is called. If every policy file disappears (e.g. mid-deploy),
+    the engine also keeps its plan and a warning is logged, so guardrails never turn off.
+
+    Args:
+        engine: Engine to keep up to date
+        paths: Policy file, list of files, or directory (every ``*.yaml``/``*.yml`` in it)
+        compiler: Compiler to use (defaults to PolicyCompiler())
+        interval: Seconds between polls
+        on_reload: Called with each newly applied CompiledPolicy
+        on_error: Called with the exception when a changed policy cannot be compiled
+    """
+
+    def __init__(self,
+                 engine: CoreValidationEngine,
+                 paths: Union[str, List[str]],
+                 compiler: Optional[PolicyCompiler] = None,
+                 interval: float = 1.0,
+                 on_reload: Optional[Callable[[CompiledPolicy], None]] = None,
+                 on_error: Optional[Callable[[Exception], None]] = None):
+        self.engine = engine
+        self.paths = paths
+        self.compiler = compiler or PolicyCompiler()
+        self.interval = interval
+        self.on_reload = on_reload
+        self.on_error = on_error
+        self.reloads = 0
+        self.last_error: Optional[Exception] = None
+        self._signature: Optional[Dict[str, Tuple[int, int]]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _files(self) -> List[str]:
+        if isinstance(self.paths, str):
+            if os.path.isdir(self.paths):
+                return sorted(
+                    glob.glob(os.path.join(self.paths, "*.yaml"))
+                    + glob.glob(os.path.join(self.paths, "*.yml"))
+                )
+            return [self.paths]
+        return list(self.paths)
+
+    def _current_signature(self, files: List[str]) -> Dict[str, Tuple[int, int]]:
+        signature = {}
+        for path in files:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature[path] = (stat.st_mtime_ns, stat.st_size)
+        return signature
+
+    def check(self) -> bool:
+        """Reload if the policy files changed since the last check; return whether a new plan was applied"""
+        files = self._files()
+        signature = self._current_signature(files)
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        if not signature:
+            _log.warning("No policy files found at %r; keeping the current policy", self.paths)
+            return False
+        try:
+            policy = self.compiler.compile_files(list(signature))
+        except Exception as e:
+            self.last_error = e
+            if self.on_error:
+                self.on_error(e)
+            return False
+
+        current = self.engine.policy
+        if current is not None and current.digest == policy.digest:
+            return False  # touched but unchanged
+        self.engine.apply_policy(policy)
+        self.reloads += 1
+        self.last_error = None
+        if self.on_reload:
+            self.on_reload(policy)
+        return True
+
+    def start(self):
+        """Apply the current policy, then watch for changes in the background"""
+        self.check()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch_loop, name="bumpers-policy-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def _watch_loop(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def stop(self):
+        """Stop watching; the engine keeps its current plan"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
@@ -1,8 +1,16 @@
 # File: /src/bumpers/types.py
 
+import sys
 from dataclasses import dataclass
-from enum import Enum
-from typing import Dict, Any
+from enum import Enum, IntEnum
+from typing import Dict, Any, Iterable, Iterator, Mapping, Optional
+
+
+def slotted_dataclass(cls):
+    """``@dataclass(slots=True)`` where supported (3.10+), a plain dataclass before"""
+    if sys.version_info >= (3, 10):
+        return dataclass(slots=True)(cls)
+    return dataclass(cls)
 
 
 class ValidationPoint(Enum):
@@ -22,11 +30,73 @@ class FailStrategy(Enum):
     SELF_CORRECT = "self_correct"  # Attempt to rewind and fix mid-chain
 
 
-@dataclass
+class CostTier(IntEnum):
+    """Rough cost class of a validator, used by cost-aware engines to order and skip work."""
+    CHEAP = 0      # In-process checks: set lookups, string scans
+    MODERATE = 1   # Local models or heavier in-process work
+    EXPENSIVE = 2  # Remote model calls (e.g. Gemini vision)
+
+
+class ContextView(Mapping[str, Any]):
+    """
+    Read-only view of a context dict with some keys added or hidden, without copying it.
+
+    Validators use this to attach their findings to a result (and drop bulky inputs such
+    as screenshot bytes) while the underlying context is shared by reference. Views of
+    views stay flat, so stacking findings never builds deep chains.
+    """
+
+    __slots__ = ("_base", "_extra", "_exclude")
+
+    def __init__(self,
+                 base: Mapping[str, Any],
+                 extra: Optional[Mapping[str, Any]] = None,
+                 exclude: Iterable[str] = ()):
+        exclude = frozenset(exclude)
+        if isinstance(base, ContextView):
+            merged = {k: v for k, v in base._extra.items() if k not in exclude}
+            merged.update(extra or {})
+            extra = merged
+            exclude = (base._exclude | exclude) - extra.keys()
+            base = base._base
+        self._base = base
+        self._extra = extra or {}
+        self._exclude = frozenset(exclude) - self._extra.keys()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._extra:
+            return self._extra[key]
+        if key in self._exclude:
+            raise KeyError(key)
+        return self._base[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._base:
+            if key not in self._exclude and key not in self._extra:
+                yield key
+        yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._extra:
+            return True
+        return key not in self._exclude and key in self._base
+
+    def __repr__(self) -> str:
+        return f"ContextView({dict(self)!r})"
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self)
+
+
+@slotted_dataclass
 class ValidationResult:
     passed: bool
     message: str
     validator_name: str
     validation_point: ValidationPoint
-    context: Dict[str, Any]
+    # Shared by reference (often a ContextView); treat as read-only
+    context: Mapping[str, Any]
     fail_strategy: FailStrategy = FailStrategy.RAISE_ERROR
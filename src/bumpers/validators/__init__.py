@@ -1,12 +1,43 @@
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from .action import ActionWhitelistValidator
 from .content import ContentFilterValidator
-from .vision import VisionValidator
 from .base import BaseValidator, FailStrategy
 
+# Validators with heavy optional backends (Gemini, PIL, NumPy) are imported on first
+# attribute access, so workers that only need the lightweight validators start fast
+_LAZY = {
+    "VisionValidator": ".vision",
+    "SemanticDriftValidator": ".semantic_drift",
+    "ScreenshotValidator": ".screenshot",
+}
+
+if TYPE_CHECKING:
+    from .vision import VisionValidator
+    from .semantic_drift import SemanticDriftValidator
+    from .screenshot import ScreenshotValidator
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
+
+
 __all__ = [
     "ActionWhitelistValidator",
     "ContentFilterValidator",
     "BaseValidator",
     "FailStrategy",
-    "VisionValidator"
-] 
\ No newline at end of file
+    "VisionValidator",
+    "SemanticDriftValidator",
+    "ScreenshotValidator"
+]
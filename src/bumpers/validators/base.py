@@ -1,8 +1,24 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
-from ..types import FailStrategy, ValidationResult
+from typing import Dict, Any, List, Optional, Sequence
+from ..types import FailStrategy, ValidationResult, CostTier
 
 class BaseValidator(ABC):
+    # How expensive this validator is to run. Cost-aware engines run cheaper tiers
+    # first and skip more expensive tiers once a cheaper one has rejected the input.
+    cost_tier: CostTier = CostTier.CHEAP
+
+    # Optional per-validator timeout (seconds) used by CoreValidationEngine.validate_async
+    # and by validate on a concurrent engine. None falls back to the engine's validator_timeout.
+    timeout: Optional[float] = None
+
+    # Optional asynchronous hook. Validators that spend their time waiting on I/O
+    # can define ``async def avalidate(self, context) -> ValidationResult``; when it
+    # is left as None the engine runs validate() on its thread pool instead.
+    avalidate = None
+
+    # Intervention type logged when this validator rejects an input (a policy's on_fail)
+    intervention_type: str = 'block_action'
+
     def __init__(self, name: str, fail_strategy: FailStrategy = FailStrategy.RAISE_ERROR):
         self.name = name
         self.fail_strategy = fail_strategy
@@ -11,3 +27,12 @@ class BaseValidator(ABC):
     def validate(self, context: Dict[str, Any]) -> ValidationResult:
         """Validate the given context and return a ValidationResult."""
         pass
+
+    def validate_many(self, contexts: Sequence[Dict[str, Any]]) -> List[ValidationResult]:
+        """
+        Validate several contexts, returning one result per context in the same order.
+
+        Used by CoreValidationEngine.validate_batch. Override it when a batch can be
+        checked in a single vectorized pass; the default calls validate on each context.
+        """
+        return [self.validate(context) for context in contexts]
@@ -0,0 +1,220 @@
+import asyncio
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Any, List, NamedTuple, Optional
+
+import google.generativeai as genai
+
+
+class BatchAnswer(NamedTuple):
+    """One image's share of a batched answer; ``analysis`` is None when it could not be parsed."""
+    analysis: Optional[Dict[str, Any]]
+    text: str
+
+
+class BatchFallback(Exception):
+    """
+    Raised through a submitted future when its image has to be sent on its own: it had
+    nothing to batch with, or its batch's answer could not be matched up. analyze and
+    aanalyze make that single request on the caller's side.
+    """
+
+
+class _Request(NamedTuple):
+    prompt: str
+    payload: Any
+    future: Future
+
+
+def _extract_json(text: str):
+    """Parse the JSON inside a ```json fenced block, or the whole text if there is none."""
+    start = text.find('```json')
+    if start != -1:
+        start = text.find('\n', start) + 1
+        end = text.find('```', start)
+        text = text[start:end if end != -1 else len(text)]
+    return json.loads(text.strip())
+
+
+def _single_answer(text: str) -> BatchAnswer:
+    try:
+        analysis = _extract_json(text)
+    except ValueError:
+        analysis = None
+    return BatchAnswer(analysis if isinstance(analysis, dict) else None, text)
+
+
+class GeminiBatchScheduler:
+    """
+    Micro-batches screenshot analyses from many callers into multi-image Gemini requests.
+
+    Requests that arrive within ``max_wait`` seconds of each other (up to ``max_batch_size``)
+    are sent as one request: every image is preceded by its own instructions and the model
+    is asked for a JSON array with one answer per image. The answers are fanned back to
+    the waiting callers. If a batched answer can't be matched up, each caller retries its
+    own image alone so callers never get another caller's verdict. Single-image requests are
+    made by the callers, never by the scheduler thread, so one slow request can't hold up
+    the batches behind it.
+
+    Share one scheduler between validators (VisionValidator(..., batcher=scheduler)) to
+    cut round trips when several agents step at the same time.
+
+    Args:
+        model: A GenerativeModel to use; created from model_name/api_key when omitted
+        model_name: Gemini model to create when no model is given
+        api_key: Gemini API key
+        max_batch_size: Maximum number of images per request
+        max_wait: Seconds to wait for more requests after the first one arrives
+    """
+
+    def __init__(self,
+                 model=None,
+                 model_name: str = "gemini-1.5-flash",
+                 api_key: str = os.getenv("GOOGLE_API_KEY"),
+                 max_batch_size: int = 8,
+                 max_wait: float = 0.05):
+        if model is None:
+            genai.configure(api_key=api_key)
+            model = genai.GenerativeModel(model_name)
+        self.model = model
+        self.model_name = model_name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'images': 0, 'batches': 0, 'fallbacks': 0}
+
+    def submit(self, prompt: str, payload: Any) -> Future:
+        """
+        Queue an image (PIL image or inline image part) with its prompt. The future resolves
+        to a BatchAnswer or raises BatchFallback if the image must be sent on its own.
+        """
+        future: Future = Future()
+        # Checked and queued under the lock so nothing can land behind close()'s sentinel
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Batch scheduler is closed")
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="bumpers-gemini-batcher", daemon=True
+                )
+                self._worker.start()
+            self._queue.put(_Request(prompt, payload, future))
+        return future
+
+    def analyze(self, prompt: str, payload: Any, timeout: Optional[float] = None) -> BatchAnswer:
+        """Blocking helper around submit that sends the image on its own when the batch can't"""
+        try:
+            return self.submit(prompt, payload).result(timeout)
+        except BatchFallback:
+            self._count(requests=1)
+            return _single_answer(self.model.generate_content([prompt, payload]).text)
+
+    async def aanalyze(self, prompt: str, payload: Any) -> BatchAnswer:
+        """Non-blocking variant of analyze"""
+        try:
+            return await asyncio.wrap_future(self.submit(prompt, payload))
+        except BatchFallback:
+            self._count(requests=1)
+            response = await self.model.generate_content_async([prompt, payload])
+            return _single_answer(response.text)
+
+    def close(self):
+        """Flush outstanding requests and stop the worker thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            worker = self._worker
+            self._queue.put(None)
+        if worker:
+            worker.join()
+        # Whatever the worker left behind would otherwise never resolve
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None and request.future.set_running_or_notify_cancel():
+                request.future.set_exception(RuntimeError("Batch scheduler is closed"))
+
+    def _count(self, **increments: int):
+        with self._stats_lock:
+            for key, value in increments.items():
+                self.stats[key] += value
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+            try:
+                self._dispatch(batch)
+            except Exception as e:
+                # Keep serving later requests; this batch's callers get the error
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+
+    def _dispatch(self, batch: List[_Request]):
+        batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        self._count(images=len(batch))
+        if len(batch) == 1:
+            batch[0].future.set_exception(BatchFallback("nothing to batch with"))
+            return
+
+        self._count(requests=1, batches=1)
+        try:
+            response = self.model.generate_content(self._batch_parts(batch))
+            answers = _extract_json(response.text)
+            if not isinstance(answers, list) or len(answers) != len(batch):
+                raise ValueError("batched answer does not have one entry per image")
+        except Exception:
+            # Never guess which verdict belongs to whom: each caller asks about its own image
+            self._count(fallbacks=1)
+            for request in batch:
+                request.future.set_exception(BatchFallback("batched answer could not be matched up"))
+            return
+
+        for request, answer in zip(batch, answers):
+            analysis = answer if isinstance(answer, dict) else None
+            request.future.set_result(BatchAnswer(analysis, json.dumps(answer)))
+
+    def _batch_parts(self, batch: List[_Request]) -> List[Any]:
+        parts: List[Any] = [
+            f"You will be shown {len(batch)} images. Each image is preceded by its own "
+            "instructions. Answer every image independently, following only its own instructions."
+        ]
+        for index, request in enumerate(batch, 1):
+            parts.append(f"Image {index} instructions:\n{request.prompt}")
+            parts.append(request.payload)
+        parts.append(
+            f"Respond with a single JSON array containing exactly {len(batch)} objects, in image "
+            "order, where object i is the JSON answer requested for image i. Wrap the array in "
+            "```json fences and include nothing else."
+        )
+        return parts
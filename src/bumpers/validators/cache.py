@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional
+
+
+def make_cache_key(image_data: bytes, prompt: str, model_name: str, variant: str = "") -> str:
+    """
+    Content address for a model verdict: hash of the image bytes, prompt and model.
+    ``variant`` covers anything else that changes what the model sees (e.g. preprocessing).
+    """
+    digest = hashlib.sha256()
+    for part in (model_name.encode(), prompt.encode(), variant.encode(), image_data):
+        # Length-prefix each part so different splits can't collide
+        digest.update(len(part).to_bytes(8, 'big'))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheMetrics:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0    # Entries dropped to stay within capacity
+    expirations: int = 0  # Entries dropped because their TTL elapsed
+    errors: int = 0       # Backend errors, treated as misses
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), 'hit_rate': self.hit_rate}
+
+
+class ResultCache(ABC):
+    """Key/value store for model analyses (JSON-serializable dicts)."""
+
+    def __init__(self):
+        self.metrics = CacheMetrics()
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached analysis for ``key`` or None"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Dict[str, Any]):
+        """Store an analysis under ``key``"""
+        pass
+
+
+class LRUCache(ResultCache):
+    """
+    In-memory least-recently-used cache with an optional time-to-live.
+
+    Args:
+        max_size: Maximum number of entries kept in memory
+        ttl: Seconds an entry stays valid, or None to keep entries until evicted
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = 300.0):
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.metrics.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.metrics.expirations += 1
+                self.metrics.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.metrics.hits += 1
+            return value
+
+    def set(self, key: str, value: Dict[str, Any]):
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.metrics.evictions += 1
+
+
+class SQLiteCache(ResultCache):
+    """
+    On-disk cache that survives restarts and can be shared by worker processes on one host.
+
+    Args:
+        path: SQLite database file
+        ttl: Seconds an entry stays valid, or None to keep entries indefinitely
+        max_entries: Optional cap; the oldest entries are pruned once it is exceeded
+    """
+
+    _PRUNE_EVERY = 100
+
+    def __init__(self, path: str, ttl: Optional[float] = 24 * 3600.0, max_entries: Optional[int] = None):
+        super().__init__()
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_created ON results (created)")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value, created FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.metrics.misses += 1
+                    return None
+                value, created = row
+                if self.ttl is not None and created + self.ttl <= time.time():
+                    self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                    self.metrics.expirations += 1
+                    self.metrics.misses += 1
+                    return None
+                self.metrics.hits += 1
+                return json.loads(value)
+            except (sqlite3.Error, ValueError):
+                self.metrics.errors += 1
+                self.metrics.misses += 1
+                return None
+
+    def set(self, key: str, value: Dict[str, Any]):
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results (key, value, created) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), time.time())
+                )
+                self._writes += 1
+                if self.max_entries and self._writes % self._PRUNE_EVERY == 0:
+                    self._prune()
+            except (sqlite3.Error, TypeError, ValueError):
+                self.metrics.errors += 1
+
+    def _prune(self):
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM results WHERE key IN "
+                "(SELECT key FROM results ORDER BY created LIMIT ?)",
+                (excess,)
+            )
+            self.metrics.evictions += excess
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class TieredCache(ResultCache):
+    """
+    Memory cache in front of a slower (usually on-disk) cache.
+
+    Disk hits are promoted into memory. ``metrics`` counts lookups against the
+    cache as a whole; each tier keeps its own metrics as well.
+    """
+
+    def __init__(self, memory: ResultCache, disk: ResultCache):
+        super().__init__()
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.memory.get(key)
+        if value is None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        if value is None:
+            self.metrics.misses += 1
+        else:
+            self.metrics.hits += 1
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]):
+        self.memory.set(key, value)
+        self.disk.set(key, value)
@@ -1,5 +1,6 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence
 from .base import BaseValidator, FailStrategy
+from .matcher import KeywordMatcher
 from ..core.engine import ValidationResult, ValidationPoint
 
 class ContentFilterValidator(BaseValidator):
@@ -8,53 +9,73 @@ class ContentFilterValidator(BaseValidator):
         forbidden_words: List[str] = None,
         max_length: int = None,
         name: str = "content_filter",
-        fail_strategy: FailStrategy = FailStrategy.RAISE_ERROR
+        fail_strategy: FailStrategy = FailStrategy.RAISE_ERROR,
+        case_sensitive: bool = False,
+        whole_words: bool = False
     ):
         super().__init__(name, fail_strategy)
         self.forbidden_words = set(forbidden_words or [])
         self.max_length = max_length
+        # Compiled once so each output is scanned a single time, regardless
+        # of how many forbidden words there are
+        self._matcher = KeywordMatcher(
+            self.forbidden_words,
+            case_sensitive=case_sensitive,
+            whole_words=whole_words
+        )
+
+    def _result(self, passed: bool, message: str, context: Dict[str, Any]) -> ValidationResult:
+        return ValidationResult(
+            passed=passed,
+            message=message,
+            validator_name=self.name,
+            validation_point=ValidationPoint.PRE_OUTPUT,
+            context=context,
+            fail_strategy=self.fail_strategy
+        )
 
     def validate(self, context: Dict[str, Any]) -> ValidationResult:
         content = context.get("output")
         if not content:
-            return ValidationResult(
-                passed=False,
-                message="No content to validate",
-                validator_name=self.name,
-                validation_point=ValidationPoint.PRE_OUTPUT,
-                context=context,
-                fail_strategy=self.fail_strategy
-            )
-            
+            return self._result(False, "No content to validate", context)
+
         # Check forbidden words
         if self.forbidden_words:
-            found_words = [word for word in self.forbidden_words if word.lower() in content.lower()]
+            found_words = self._matcher.matched_patterns(content)
             if found_words:
-                return ValidationResult(
-                    passed=False,
-                    message=f"Found forbidden words: {found_words}",
-                    validator_name=self.name,
-                    validation_point=ValidationPoint.PRE_OUTPUT,
-                    context=context,
-                    fail_strategy=self.fail_strategy
-                )
+                return self._result(False, f"Found forbidden words: {found_words}", context)
 
         # Check content length
         if self.max_length and len(content) > self.max_length:
-            return ValidationResult(
-                passed=False,
-                message=f"Content exceeds maximum length of {self.max_length}",
-                validator_name=self.name,
-                validation_point=ValidationPoint.PRE_OUTPUT,
-                context=context,
-                fail_strategy=self.fail_strategy
-            )
-            
-        return ValidationResult(
-            passed=True,
-            message="Content validation passed",
-            validator_name=self.name,
-            validation_point=ValidationPoint.PRE_OUTPUT,
-            context=context,
-            fail_strategy=self.fail_strategy
-        )
+            return self._result(False, f"Content exceeds maximum length of {self.max_length}", context)
+
+        return self._result(True, "Content validation passed", context)
+
+    def validate_many(self, contexts: Sequence[Dict[str, Any]]) -> List[ValidationResult]:
+        """Batch form of validate: one keyword scan over all outputs, then the length check"""
+        outputs = [context.get("output") for context in contexts]
+        if not all(isinstance(output, str) for output in outputs if output):
+            return super().validate_many(contexts)
+
+        present = [row for row, output in enumerate(outputs) if output]
+        found: List[List[str]] = [[] for _ in outputs]
+        if self.forbidden_words:
+            for row, words in zip(present, self._matcher.matched_patterns_many([outputs[row] for row in present])):
+                found[row] = words
+        too_long = [False] * len(outputs)
+        if self.max_length:
+            too_long = [bool(output) and len(output) > self.max_length for output in outputs]
+
+        results = []
+        for context, output, words, long in zip(contexts, outputs, found, too_long):
+            if not output:
+                results.append(self._result(False, "No content to validate", context))
+            elif words:
+                results.append(self._result(False, f"Found forbidden words: {words}", context))
+            elif long:
+                results.append(self._result(
+                    False, f"Content exceeds maximum length of {self.max_length}", context
+                ))
+            else:
+                results.append(self._result(True, "Content validation passed", context))
+        return results
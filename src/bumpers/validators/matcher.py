@@ -0,0 +1,191 @@
+from collections import deque
+from itertools import accumulate
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+# Up to this many keywords, one str.find per keyword (a C loop over the text) beats the
+# automaton's Python-level scan: benchmarks/test_engine_bench.py::test_content_filter
+# puts the crossover near 150 keywords for both 1KB and 100KB outputs
+SUBSTRING_SCAN_LIMIT = 128
+
+
+class Match(NamedTuple):
+    """A single pattern hit in the scanned text (``text[start:end]``)."""
+    start: int
+    end: int
+    pattern: str
+
+
+def _fold_char(ch: str) -> str:
+    # Fold one character at a time so folded offsets line up with the
+    # original text (some characters lower() to more than one code point).
+    folded = ch.lower()
+    return folded if len(folded) == 1 else ch
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of keywords.
+
+    The automaton is built once and each text is scanned in a single pass,
+    so scan cost depends on the length of the text rather than on the number
+    of keywords. matched_patterns on small keyword sets (SUBSTRING_SCAN_LIMIT
+    or fewer) searches for each keyword with str.find instead, which is faster
+    there and gives the same answer.
+
+    Args:
+        patterns: Keywords to search for. Empty strings are ignored.
+        case_sensitive: Match keywords exactly instead of case-folding both
+            keywords and text.
+        whole_words: Only report hits that are not embedded in a larger word.
+    """
+
+    def __init__(self,
+                 patterns: Iterable[str],
+                 case_sensitive: bool = False,
+                 whole_words: bool = False):
+        self.case_sensitive = case_sensitive
+        self.whole_words = whole_words
+
+        # State 0 is the root. Each state has a goto table, a failure link
+        # and the ids of the patterns that end there (including via the
+        # failure chain, merged during construction).
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self._patterns: List[str] = []
+        self._keys: List[str] = []  # folded patterns
+        self._lengths: List[int] = []
+
+        seen = set()
+        for pattern in patterns:
+            if not pattern or pattern in seen:
+                continue
+            seen.add(pattern)
+            self._add(pattern)
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    @property
+    def patterns(self) -> List[str]:
+        return list(self._patterns)
+
+    def _fold(self, text: str) -> str:
+        if self.case_sensitive:
+            return text
+        if text.isascii():
+            return text.lower()
+        return "".join(map(_fold_char, text))
+
+    def _add(self, pattern: str):
+        key = self._fold(pattern)
+        state = 0
+        for ch in key:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = nxt
+        self._output[state].append(len(self._patterns))
+        self._patterns.append(pattern)
+        self._keys.append(key)
+        self._lengths.append(len(pattern))
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                if self._output[self._fail[nxt]]:
+                    self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def _boundary_ok(self, text: str, start: int, end: int) -> bool:
+        if start > 0 and _is_word_char(text[start - 1]):
+            return False
+        if end < len(text) and _is_word_char(text[end]):
+            return False
+        return True
+
+    def finditer(self, text: str):
+        """Yield a ``Match`` for every (possibly overlapping) keyword hit, in scan order."""
+        goto, fail, output, lengths = self._goto, self._fail, self._output, self._lengths
+        state = 0
+        for end, ch in enumerate(self._fold(text), 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                for pattern_id in output[state]:
+                    start = end - lengths[pattern_id]
+                    if self.whole_words and not self._boundary_ok(text, start, end):
+                        continue
+                    yield Match(start, end, self._patterns[pattern_id])
+
+    def findall(self, text: str) -> List[Match]:
+        """Return all keyword hits in ``text``."""
+        return list(self.finditer(text))
+
+    def search(self, text: str) -> Optional[Match]:
+        """Return the first hit found while scanning ``text``, or None."""
+        return next(self.finditer(text), None)
+
+    def _first_end(self, text: str, folded: str, pattern_id: int) -> Optional[int]:
+        key = self._keys[pattern_id]
+        start = folded.find(key)
+        while start != -1:
+            end = start + len(key)
+            if not self.whole_words or self._boundary_ok(text, start, end):
+                return end
+            start = folded.find(key, start + 1)
+        return None
+
+    def matched_patterns(self, text: str) -> List[str]:
+        """Return the distinct keywords found in ``text`` in order of first appearance."""
+        if len(self._patterns) <= SUBSTRING_SCAN_LIMIT:
+            folded = self._fold(text)
+            hits = []
+            for pattern_id in range(len(self._patterns)):
+                end = self._first_end(text, folded, pattern_id)
+                if end is not None:
+                    # The automaton's order: by end, longer keywords first at the same end
+                    hits.append((end, -self._lengths[pattern_id], pattern_id))
+            return [self._patterns[pattern_id] for _, _, pattern_id in sorted(hits)]
+
+        found = {}
+        for match in self.finditer(text):
+            found.setdefault(match.pattern, None)
+        return list(found)
+
+    def matched_patterns_many(self, texts: List[str], separator: str = "\x00") -> List[List[str]]:
+        """
+        ``matched_patterns`` for each of ``texts``, found in one scan of the joined texts.
+
+        The separator resets the automaton between texts, so it must not occur in any
+        keyword; if it does, or the keyword set is small, each text is scanned on its own.
+        """
+        if (len(self._patterns) <= SUBSTRING_SCAN_LIMIT
+                or any(separator in pattern for pattern in self._patterns)):
+            return [self.matched_patterns(text) for text in texts]
+        found: List[Dict[str, None]] = [{} for _ in texts]
+        # Offset one past each text's separator; a match belongs to the first text ending after it
+        ends = list(accumulate(len(text) + len(separator) for text in texts))
+        index = 0
+        for match in self.finditer(separator.join(texts)):
+            while match.start >= ends[index]:
+                index += 1
+            found[index].setdefault(match.pattern, None)
+        return [list(patterns) for patterns in found]
@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Hashable, Optional
+
+import numpy as np
+from PIL import Image
+
+
+def dhash(image: Image.Image, hash_size: int = 8) -> int:
+    """
+    Difference hash of an image.
+
+    The image is reduced to a (hash_size + 1) x hash_size grayscale thumbnail and each
+    bit records whether a pixel is brighter than its right-hand neighbour. Small changes
+    such as a blinking cursor or a ticking clock flip few or no bits.
+    """
+    # Sample a 4x-oversized grid with nearest-neighbour (touches ~1k pixels, not the
+    # whole frame), then box-average it down; a full-frame resize of a 4K screenshot
+    # costs ~10ms whereas this stays well under a millisecond
+    grid = (hash_size + 1) * 4, hash_size * 4
+    small = image.resize(grid, Image.NEAREST).resize((hash_size + 1, hash_size), Image.BOX).convert("L")
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class FrameDeduplicator:
+    """
+    Remembers the perceptual hashes of recently validated frames and their verdicts.
+
+    A new frame whose hash is within ``max_distance`` bits of a remembered frame reuses
+    that frame's analysis instead of going back to the model. Verdicts are remembered per
+    ``scope`` (the prompt and model that produced them), so validators sharing one
+    deduplicator never reuse each other's verdicts.
+
+    Args:
+        max_distance: Largest Hamming distance (out of hash_size**2 bits) still treated
+            as the same frame
+        hash_size: Side of the hash grid; 8 gives a 64-bit hash
+        history: Number of recent frames to remember
+        ttl: Seconds a remembered verdict stays reusable, or None for no limit
+    """
+
+    def __init__(self,
+                 max_distance: int = 4,
+                 hash_size: int = 8,
+                 history: int = 32,
+                 ttl: Optional[float] = 60.0):
+        self.max_distance = max_distance
+        self.hash_size = hash_size
+        self.ttl = ttl
+        self._frames: deque = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def hash(self, image: Image.Image) -> int:
+        return dhash(image, self.hash_size)
+
+    def lookup(self, frame_hash: int, scope: Hashable = None) -> Optional[Dict[str, Any]]:
+        """Return the analysis of the closest recent frame in ``scope`` within max_distance, or None"""
+        now = time.monotonic()
+        best = None
+        best_distance = self.max_distance + 1
+        with self._lock:
+            for seen_hash, seen_at, seen_scope, analysis in reversed(self._frames):
+                if seen_scope != scope:
+                    continue
+                if self.ttl is not None and now - seen_at > self.ttl:
+                    continue
+                distance = hamming_distance(frame_hash, seen_hash)
+                if distance < best_distance:
+                    best, best_distance = analysis, distance
+                    if distance == 0:
+                        break
+            if best is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return best
+
+    def remember(self, frame_hash: int, analysis: Dict[str, Any], scope: Hashable = None):
+        with self._lock:
+            self._frames.append((frame_hash, time.monotonic(), scope, analysis))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'hits': self.hits, 'misses': self.misses, 'frames': len(self._frames)}
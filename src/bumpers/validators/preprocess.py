@@ -0,0 +1,121 @@
+import threading
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Dict, Any, Optional, Tuple
+
+from PIL import Image
+
+
+_MIME_TYPES = {
+    "JPEG": "image/jpeg",
+    "WEBP": "image/webp",
+    "PNG": "image/png",
+}
+
+
+class ScreenshotPreprocessor:
+    """
+    Shrinks screenshots before they are uploaded to a vision model.
+
+    Steps run in order: region-of-interest crop, downscale so the longest edge is at most
+    ``max_edge``, optional grayscale and palette quantization, then re-encoding.
+
+    Args:
+        max_edge: Longest edge in pixels after downscaling, or None to keep the resolution
+        grayscale: Convert to 8-bit grayscale
+        colors: Quantize to this many palette colours (useful with PNG)
+        format: Output encoding, one of "JPEG", "WEBP" or "PNG"
+        quality: Encoder quality for JPEG/WEBP (1-100)
+        crop: Region of interest as (left, top, right, bottom) in source pixels
+    """
+
+    def __init__(self,
+                 max_edge: Optional[int] = 1568,
+                 grayscale: bool = False,
+                 colors: Optional[int] = None,
+                 format: str = "JPEG",
+                 quality: int = 80,
+                 crop: Optional[Tuple[int, int, int, int]] = None):
+        format = format.upper()
+        if format not in _MIME_TYPES:
+            raise ValueError(f"Unsupported screenshot format '{format}', expected one of {list(_MIME_TYPES)}")
+        self.max_edge = max_edge
+        self.grayscale = grayscale
+        self.colors = colors
+        self.format = format
+        self.quality = quality
+        self.crop = crop
+
+    @property
+    def signature(self) -> str:
+        """Stable description of the settings, used to keep cached verdicts apart"""
+        return (f"crop={self.crop};max_edge={self.max_edge};gray={self.grayscale};"
+                f"colors={self.colors};format={self.format};quality={self.quality}")
+
+    def process(self, image: Image.Image) -> Dict[str, Any]:
+        """Return an inline image part (``{"mime_type", "data"}``) ready to send to Gemini"""
+        if self.crop:
+            image = image.crop(self.crop)
+
+        if self.max_edge and max(image.size) > self.max_edge:
+            scale = self.max_edge / max(image.size)
+            size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+            image = image.resize(size, Image.LANCZOS, reducing_gap=3.0)
+
+        if self.grayscale:
+            image = image.convert("L")
+        elif image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        if self.colors:
+            image = image.quantize(self.colors)
+            if self.format != "PNG":
+                # JPEG/WEBP can't store palettes; the reduced colour set still compresses better
+                image = image.convert("L" if self.grayscale else "RGB")
+
+        buffer = BytesIO()
+        if self.format == "PNG":
+            image.save(buffer, format="PNG", optimize=True)
+        else:
+            image.save(buffer, format=self.format, quality=self.quality)
+        return {"mime_type": _MIME_TYPES[self.format], "data": buffer.getvalue()}
+
+
+@dataclass
+class PayloadMetrics:
+    """
+    Upload size and model latency for a screenshot validator.
+
+    ``original_bytes`` is what the agent supplied and ``sent_bytes`` what was actually
+    uploaded, so the two show the effect of a ScreenshotPreprocessor.
+    """
+    requests: int = 0
+    original_bytes: int = 0
+    sent_bytes: int = 0
+    preprocess_seconds: float = 0.0
+    model_seconds: float = 0.0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def record_payload(self, original_bytes: int, sent_bytes: int, preprocess_seconds: float = 0.0):
+        with self._lock:
+            self.original_bytes += original_bytes
+            self.sent_bytes += sent_bytes
+            self.preprocess_seconds += preprocess_seconds
+
+    def record_model_call(self, seconds: float):
+        with self._lock:
+            self.requests += 1
+            self.model_seconds += seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        requests = self.requests or 1
+        return {
+            'requests': self.requests,
+            'original_bytes': self.original_bytes,
+            'sent_bytes': self.sent_bytes,
+            'compression_ratio': self.sent_bytes / self.original_bytes if self.original_bytes else 1.0,
+            'avg_preprocess_ms': self.preprocess_seconds / requests * 1000,
+            'avg_model_latency_ms': self.model_seconds / requests * 1000,
+        }
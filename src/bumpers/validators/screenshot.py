@@ -0,0 +1,243 @@
+import os
+import time
+from abc import abstractmethod
+from typing import Dict, Any, Optional, Tuple, Union
+import google.generativeai as genai
+from PIL import Image
+from io import BytesIO
+
+from .base import BaseValidator
+from .cache import ResultCache, make_cache_key
+from .phash import FrameDeduplicator
+from .preprocess import ScreenshotPreprocessor, PayloadMetrics
+from .batching import GeminiBatchScheduler, _extract_json
+from ..types import ValidationResult, ValidationPoint, FailStrategy, CostTier, ContextView
+
+class ScreenshotValidator(BaseValidator):
+    """
+    Base class for validators that send a screenshot to Gemini and turn its structured
+    JSON answer into a ValidationResult.
+
+    Subclasses set ``analysis_prompt`` and implement ``_fallback_analysis`` (used when
+    the model's answer cannot be parsed) and ``_build_result``.
+    """
+
+    cost_tier = CostTier.EXPENSIVE
+    model_name = "gemini-1.5-flash"
+    missing_screenshot_message = "No screenshot provided for validation"
+    failure_prefix = "Validation failed"
+
+    def __init__(self,
+                 name: str,
+                 fail_strategy: FailStrategy = FailStrategy.RAISE_ERROR,
+                 api_key: str = os.getenv("GOOGLE_API_KEY"),
+                 cache: Optional[ResultCache] = None,
+                 frame_dedup: Optional[FrameDeduplicator] = None,
+                 preprocessor: Optional[ScreenshotPreprocessor] = None,
+                 batcher: Optional[GeminiBatchScheduler] = None):
+        """
+        Args:
+            name: Name of the validator
+            fail_strategy: How to handle validation failures
+            api_key: Gemini API key
+            cache: Optional result cache. Verdicts are keyed on a hash of the screenshot
+                bytes, the prompt and the model, so repeated frames skip the model call.
+            frame_dedup: Optional perceptual-hash stage. Frames that are near-duplicates
+                of a recently validated frame (cursor blink, clock tick) reuse its verdict
+                if it came from the same prompt and model, so one stage can be shared.
+            preprocessor: Optional stage that crops, downscales and re-encodes screenshots
+                before upload. Upload sizes and model latency are tracked in payload_metrics.
+            batcher: Optional shared scheduler that micro-batches screenshots from many
+                callers into multi-image Gemini requests
+        """
+        super().__init__(name, fail_strategy)
+
+        # Configure Gemini
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(self.model_name)
+        self.cache = cache
+        self.frame_dedup = frame_dedup
+        self.preprocessor = preprocessor
+        self.batcher = batcher
+        self.payload_metrics = PayloadMetrics()
+        self.analysis_prompt = ""
+
+    def _process_screenshot(self, screenshot_data: bytes) -> Image.Image:
+        """Process the screenshot data into a format suitable for Gemini."""
+        try:
+            return Image.open(BytesIO(screenshot_data))
+        except Exception as e:
+            raise ValueError(f"Failed to process screenshot: {str(e)}")
+
+    def _cache_key(self, screenshot_data: bytes) -> Optional[str]:
+        if self.cache is None:
+            return None
+        variant = self.preprocessor.signature if self.preprocessor else ""
+        return make_cache_key(screenshot_data, self.analysis_prompt, self.model_name, variant)
+
+    def _dedup_scope(self) -> Tuple[str, str, str]:
+        """What a remembered frame verdict depends on besides the frame itself"""
+        variant = self.preprocessor.signature if self.preprocessor else ""
+        return self.model_name, self.analysis_prompt, variant
+
+    def _prepare_payload(self, image: Image.Image, screenshot_data: bytes) -> Union[Image.Image, Dict[str, Any]]:
+        """Image part to upload: the preprocessed encoding if configured, else the decoded image"""
+        if self.preprocessor is None:
+            self.payload_metrics.record_payload(len(screenshot_data), len(screenshot_data))
+            return image
+
+        started = time.perf_counter()
+        try:
+            payload = self.preprocessor.process(image)
+        except Exception as e:
+            raise ValueError(f"Failed to preprocess screenshot: {str(e)}")
+        self.payload_metrics.record_payload(
+            len(screenshot_data), len(payload["data"]), time.perf_counter() - started
+        )
+        return payload
+
+    def _recall(self, image: Image.Image, cache_key: Optional[str]) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+        """Perceptual hash of ``image`` and the verdict of a near-duplicate recent frame, if any"""
+        if self.frame_dedup is None:
+            return None, None
+        frame_hash = self.frame_dedup.hash(image)
+        analysis = self.frame_dedup.lookup(frame_hash, self._dedup_scope())
+        if analysis is not None and cache_key is not None:
+            self.cache.set(cache_key, analysis)
+        return frame_hash, analysis
+
+    @abstractmethod
+    def _fallback_analysis(self, response_text: str) -> Dict[str, Any]:
+        """Analysis to use when the model's answer is not valid JSON."""
+        pass
+
+    @abstractmethod
+    def _build_result(self, context: Dict[str, Any], analysis: Dict[str, Any]) -> ValidationResult:
+        """Turn the model's analysis into a ValidationResult."""
+        pass
+
+    def _parse_analysis(self, response) -> Optional[Dict[str, Any]]:
+        """Extract the structured JSON analysis from a Gemini response, or None."""
+        try:
+            analysis = _extract_json(response.text)
+        except ValueError:
+            return None
+        return analysis if isinstance(analysis, dict) else None
+
+    def _finish(self,
+                analysis: Optional[Dict[str, Any]],
+                response_text: str,
+                cache_key: Optional[str],
+                frame_hash: Optional[int]) -> Dict[str, Any]:
+        if analysis is None:
+            # Fallbacks are not remembered so the next identical frame gets another try
+            return self._fallback_analysis(response_text)
+        if cache_key is not None:
+            self.cache.set(cache_key, analysis)
+        if frame_hash is not None:
+            self.frame_dedup.remember(frame_hash, analysis, self._dedup_scope())
+        return analysis
+
+    def _analyze(self,
+                 payload: Union[Image.Image, Dict[str, Any]],
+                 cache_key: Optional[str] = None,
+                 frame_hash: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Send screenshot to Gemini for analysis with the structured prompt.
+        Returns parsed JSON response.
+        """
+        try:
+            started = time.perf_counter()
+            if self.batcher is not None:
+                answer = self.batcher.analyze(self.analysis_prompt, payload)
+                self.payload_metrics.record_model_call(time.perf_counter() - started)
+                return self._finish(answer.analysis, answer.text, cache_key, frame_hash)
+
+            response = self.model.generate_content([self.analysis_prompt, payload])
+            self.payload_metrics.record_model_call(time.perf_counter() - started)
+            return self._finish(self._parse_analysis(response), response.text, cache_key, frame_hash)
+        except Exception as e:
+            raise RuntimeError(f"Gemini analysis failed: {str(e)}")
+
+    async def _analyze_async(self,
+                             payload: Union[Image.Image, Dict[str, Any]],
+                             cache_key: Optional[str] = None,
+                             frame_hash: Optional[int] = None) -> Dict[str, Any]:
+        """Non-blocking variant of _analyze."""
+        try:
+            started = time.perf_counter()
+            if self.batcher is not None:
+                answer = await self.batcher.aanalyze(self.analysis_prompt, payload)
+                self.payload_metrics.record_model_call(time.perf_counter() - started)
+                return self._finish(answer.analysis, answer.text, cache_key, frame_hash)
+
+            response = await self.model.generate_content_async([self.analysis_prompt, payload])
+            self.payload_metrics.record_model_call(time.perf_counter() - started)
+            return self._finish(self._parse_analysis(response), response.text, cache_key, frame_hash)
+        except Exception as e:
+            raise RuntimeError(f"Gemini analysis failed: {str(e)}")
+
+    def _missing_screenshot_result(self, context: Dict[str, Any]) -> ValidationResult:
+        return ValidationResult(
+            passed=False,
+            message=self.missing_screenshot_message,
+            validator_name=self.name,
+            validation_point=ValidationPoint.PRE_ACTION,
+            context=context,
+            fail_strategy=self.fail_strategy
+        )
+
+    def _error_result(self, context: Dict[str, Any], error: Exception) -> ValidationResult:
+        return ValidationResult(
+            passed=False,
+            message=f"{self.failure_prefix}: {str(error)}",
+            validator_name=self.name,
+            validation_point=ValidationPoint.PRE_ACTION,
+            # Never keep the raw screenshot bytes in the result
+            context=ContextView(context, exclude=("screenshot",)),
+            fail_strategy=self.fail_strategy
+        )
+
+    def validate(self, context: Dict[str, Any]) -> ValidationResult:
+        screenshot_data = context.get("screenshot")
+        if not screenshot_data:
+            return self._missing_screenshot_result(context)
+
+        try:
+            cache_key = self._cache_key(screenshot_data)
+            analysis = self.cache.get(cache_key) if cache_key is not None else None
+            if analysis is None:
+                image = self._process_screenshot(screenshot_data)
+                frame_hash, analysis = self._recall(image, cache_key)
+                if analysis is None:
+                    payload = self._prepare_payload(image, screenshot_data)
+                    analysis = self._analyze(payload, cache_key, frame_hash)
+
+            return self._build_result(context, analysis)
+
+        except Exception as e:
+            return self._error_result(context, e)
+
+    async def avalidate(self, context: Dict[str, Any]) -> ValidationResult:
+        """
+        Asynchronous validate used by CoreValidationEngine.validate_async, so the
+        Gemini round trip does not block the event loop.
+        """
+        screenshot_data = context.get("screenshot")
+        if not screenshot_data:
+            return self._missing_screenshot_result(context)
+
+        try:
+            cache_key = self._cache_key(screenshot_data)
+            analysis = self.cache.get(cache_key) if cache_key is not None else None
+            if analysis is None:
+                image = self._process_screenshot(screenshot_data)
+                frame_hash, analysis = self._recall(image, cache_key)
+                if analysis is None:
+                    payload = self._prepare_payload(image, screenshot_data)
+                    analysis = await self._analyze_async(payload, cache_key, frame_hash)
+
+            return self._build_result(context, analysis)
+
+        except Exception as e:
+            return self._error_result(context, e)
@@ -1,24 +1,32 @@
 import os
 from typing import Dict, Any, Optional
-import google.generativeai as genai
-from PIL import Image
-from io import BytesIO
 
-from .base import BaseValidator
-from ..types import ValidationResult, ValidationPoint, FailStrategy
+from .screenshot import ScreenshotValidator
+from .cache import ResultCache
+from .phash import FrameDeduplicator
+from .preprocess import ScreenshotPreprocessor
+from .batching import GeminiBatchScheduler
+from ..types import ValidationResult, ValidationPoint, FailStrategy, ContextView
 
-class SemanticDriftValidator(BaseValidator):
+class SemanticDriftValidator(ScreenshotValidator):
     """
     Validator that checks if agent actions semantically align with the user's initial goal.
     Uses Gemini to analyze screenshots and determine if the agent is staying on track.
     """
+
+    missing_screenshot_message = "No screenshot provided for drift validation"
+    failure_prefix = "Drift validation failed"
     
     def __init__(self, 
                  initial_goal: str,
                  api_key: str = os.getenv("GOOGLE_API_KEY"),
                  name: str = "semantic_drift_validator",
                  fail_strategy: FailStrategy = FailStrategy.RAISE_ERROR,
-                 drift_threshold: float = 0.7):  # How strict we are about drift
+                 drift_threshold: float = 0.7,  # How strict we are about drift
+                 cache: Optional[ResultCache] = None,
+                 frame_dedup: Optional[FrameDeduplicator] = None,
+                 preprocessor: Optional[ScreenshotPreprocessor] = None,
+                 batcher: Optional[GeminiBatchScheduler] = None):
         """
         Initialize the semantic drift validator.
         
@@ -28,15 +36,19 @@ class SemanticDriftValidator(BaseValidator):
             name: Name of the validator
             fail_strategy: How to handle validation failures
             drift_threshold: How much drift to allow before failing (0.0 to 1.0)
+            cache: Optional result cache shared across calls (see validators.cache)
+            frame_dedup: Optional perceptual-hash stage that reuses verdicts for
+                near-duplicate frames (see validators.phash)
+            preprocessor: Optional crop/downscale/re-encode stage applied before
+                upload (see validators.preprocess)
+            batcher: Optional shared micro-batching scheduler (see validators.batching)
         """
-        super().__init__(name, fail_strategy)
-        
         if not initial_goal:
             raise ValueError("An initial goal must be provided")
             
-        # Configure Gemini
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-1.5-flash")
+        super().__init__(name, fail_strategy, api_key=api_key, cache=cache,
+                         frame_dedup=frame_dedup, preprocessor=preprocessor, batcher=batcher)
+        
         self.initial_goal = initial_goal
         self.drift_threshold = drift_threshold
         
@@ -62,112 +74,51 @@ class SemanticDriftValidator(BaseValidator):
         4. Could this action eventually lead to the goal?
         """
 
-    def _process_screenshot(self, screenshot_data: bytes) -> Image.Image:
-        """Process the screenshot data into a format suitable for Gemini."""
-        try:
-            return Image.open(BytesIO(screenshot_data))
-        except Exception as e:
-            raise ValueError(f"Failed to process screenshot: {str(e)}")
-
-    def _analyze_drift(self, image: Image.Image) -> Dict[str, Any]:
-        """
-        Send screenshot to Gemini for drift analysis.
-        Returns parsed JSON response.
-        """
-        try:
-            response = self.model.generate_content([self.analysis_prompt, image])
-            try:
-                # Extract the JSON part from the response
-                response_text = response.text
-                # Find JSON content between triple backticks
-                json_start = response_text.find('```json\n') + 8
-                json_end = response_text.find('```', json_start)
-                json_str = response_text[json_start:json_end].strip()
-                
-                import json
-                analysis = json.loads(json_str)
-                return analysis
-                
-            except (json.JSONDecodeError, ValueError) as e:
-                # If JSON parsing fails, create a structured response
-                return {
-                    "is_aligned": True,  # Default to aligned if we can't parse
-                    "alignment_score": 1.0,
-                    "current_action": "Unable to determine current action",
-                    "explanation": response.text,
-                    "recommendation": "Unable to parse response properly"
-                }
-        except Exception as e:
-            raise RuntimeError(f"Gemini analysis failed: {str(e)}")
+    def _fallback_analysis(self, response_text: str) -> Dict[str, Any]:
+        # If JSON parsing fails, create a structured response
+        return {
+            "is_aligned": True,  # Default to aligned if we can't parse
+            "alignment_score": 1.0,
+            "current_action": "Unable to determine current action",
+            "explanation": response_text,
+            "recommendation": "Unable to parse response properly"
+        }
 
-    def validate(self, context: Dict[str, Any]) -> ValidationResult:
-        """
-        Validate if the current agent action aligns with the initial goal.
+    def _build_result(self, context: Dict[str, Any], analysis: Dict[str, Any]) -> ValidationResult:
+        """Turn Gemini's drift analysis into a ValidationResult."""
+        # Check if we're within acceptable drift threshold
+        is_aligned = analysis.get("is_aligned", False)
+        alignment_score = analysis.get("alignment_score", 0.0)
+        current_action = analysis.get("current_action", "Unknown action")
+        explanation = analysis.get("explanation", "No explanation provided")
+        recommendation = analysis.get("recommendation", "No recommendation provided")
+        
+        # Determine if we've drifted too far
+        within_threshold = alignment_score >= self.drift_threshold
+        
+        message = f"""
+        Semantic Drift Analysis:
+        Current Action: {current_action}
+        Alignment Score: {alignment_score:.2f}
+        Status: {'ALIGNED' if within_threshold else 'DRIFTED'}
+        Explanation: {explanation}
+        Recommendation: {recommendation}
         """
-        screenshot_data = context.get("screenshot")
-        if not screenshot_data:
-            return ValidationResult(
-                passed=False,
-                message="No screenshot provided for drift validation",
-                validator_name=self.name,
-                validation_point=ValidationPoint.PRE_ACTION,
-                context=context,
-                fail_strategy=self.fail_strategy
-            )
-
-        try:
-            # Process the screenshot
-            image = self._process_screenshot(screenshot_data)
-            
-            # Get drift analysis from Gemini
-            analysis = self._analyze_drift(image)
-            
-            # Check if we're within acceptable drift threshold
-            is_aligned = analysis.get("is_aligned", False)
-            alignment_score = analysis.get("alignment_score", 0.0)
-            current_action = analysis.get("current_action", "Unknown action")
-            explanation = analysis.get("explanation", "No explanation provided")
-            recommendation = analysis.get("recommendation", "No recommendation provided")
-            
-            # Determine if we've drifted too far
-            within_threshold = alignment_score >= self.drift_threshold
-            
-            message = f"""
-            Semantic Drift Analysis:
-            Current Action: {current_action}
-            Alignment Score: {alignment_score:.2f}
-            Status: {'ALIGNED' if within_threshold else 'DRIFTED'}
-            Explanation: {explanation}
-            Recommendation: {recommendation}
-            """
-            
-            # Create a clean context without the screenshot
-            clean_context = context.copy()
-            clean_context.pop("screenshot", None)
-            
-            return ValidationResult(
-                passed=within_threshold,
-                message=message.strip(),
-                validator_name=self.name,
-                validation_point=ValidationPoint.PRE_ACTION,
-                context={
-                    **clean_context,
+        
+        return ValidationResult(
+            passed=within_threshold,
+            message=message.strip(),
+            validator_name=self.name,
+            validation_point=ValidationPoint.PRE_ACTION,
+            # View of the caller's context without the screenshot
+            context=ContextView(
+                context,
+                {
                     "analysis": analysis,
                     "initial_goal": self.initial_goal,
                     "alignment_score": alignment_score
                 },
-                fail_strategy=self.fail_strategy
-            )
-            
-        except Exception as e:
-            clean_context = context.copy()
-            clean_context.pop("screenshot", None)
-            
-            return ValidationResult(
-                passed=False,
-                message=f"Drift validation failed: {str(e)}",
-                validator_name=self.name,
-                validation_point=ValidationPoint.PRE_ACTION,
-                context=clean_context,
-                fail_strategy=self.fail_strategy
-            ) 
\ No newline at end of file
+                exclude=("screenshot",)
+            ),
+            fail_strategy=self.fail_strategy
+        )
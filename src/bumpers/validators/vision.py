@@ -1,24 +1,31 @@
 import os
-import base64
-from typing import Dict, Any, Optional, List
-import google.generativeai as genai
-from PIL import Image
-from io import BytesIO
+from typing import Dict, Any, Optional
 
-from .base import BaseValidator
-from ..types import ValidationResult, ValidationPoint, FailStrategy
+from .screenshot import ScreenshotValidator
+from .cache import ResultCache
+from .phash import FrameDeduplicator
+from .preprocess import ScreenshotPreprocessor
+from .batching import GeminiBatchScheduler
+from ..types import ValidationResult, ValidationPoint, FailStrategy, ContextView
 
-class VisionValidator(BaseValidator):
+class VisionValidator(ScreenshotValidator):
     """
     Vision-based validator using Gemini to analyze screenshots for safety and policy compliance.
     Supports pre-action validation of visual content to prevent unsafe or unwanted actions.
     """
+
+    missing_screenshot_message = "No screenshot provided for validation"
+    failure_prefix = "Vision validation failed"
     
     def __init__(self, 
                  prompt: str,
                  api_key: str = os.getenv("GOOGLE_API_KEY"),
                  name: str = "vision_validator",
-                 fail_strategy: FailStrategy = FailStrategy.RAISE_ERROR):
+                 fail_strategy: FailStrategy = FailStrategy.RAISE_ERROR,
+                 cache: Optional[ResultCache] = None,
+                 frame_dedup: Optional[FrameDeduplicator] = None,
+                 preprocessor: Optional[ScreenshotPreprocessor] = None,
+                 batcher: Optional[GeminiBatchScheduler] = None):
         """
         Initialize the vision validator.
         
@@ -27,15 +34,18 @@ class VisionValidator(BaseValidator):
             api_key: Gemini API key
             name: Name of the validator
             fail_strategy: How to handle validation failures
+            cache: Optional result cache shared across calls (see validators.cache)
+            frame_dedup: Optional perceptual-hash stage that reuses verdicts for
+                near-duplicate frames (see validators.phash)
+            preprocessor: Optional crop/downscale/re-encode stage applied before
+                upload (see validators.preprocess)
+            batcher: Optional shared micro-batching scheduler (see validators.batching)
         """
-        super().__init__(name, fail_strategy)
-        
         if not prompt:
             raise ValueError("A prompt must be provided for the vision validator")
             
-        # Configure Gemini
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-1.5-flash")
+        super().__init__(name, fail_strategy, api_key=api_key, cache=cache,
+                         frame_dedup=frame_dedup, preprocessor=preprocessor, batcher=batcher)
         
         # Create a structured prompt that combines user requirements with safety analysis
         self.analysis_prompt = f"""
@@ -51,104 +61,36 @@ class VisionValidator(BaseValidator):
         }}
         """
 
-    def _process_screenshot(self, screenshot_data: bytes) -> Image.Image:
-        """Process the screenshot data into a format suitable for Gemini."""
-        try:
-            return Image.open(BytesIO(screenshot_data))
-        except Exception as e:
-            raise ValueError(f"Failed to process screenshot: {str(e)}")
-
-    def _analyze_screenshot(self, image: Image.Image) -> Dict[str, Any]:
-        """
-        Send screenshot to Gemini for analysis with structured prompt.
-        Returns parsed JSON response.
-        """
-        try:
-            response = self.model.generate_content([self.analysis_prompt, image])
-            try:
-                # Extract the JSON part from the response
-                response_text = response.text
-                # Find JSON content between triple backticks
-                json_start = response_text.find('```json\n') + 8
-                json_end = response_text.find('```', json_start)
-                json_str = response_text[json_start:json_end].strip()
-                
-                import json
-                analysis = json.loads(json_str)
-                return analysis
-                
-            except (json.JSONDecodeError, ValueError) as e:
-                # If JSON parsing fails, create a structured response based on the full text
-                return {
-                    "is_safe": True,  # Default to safe if we can't parse properly
-                    "concerns": [],
-                    "explanation": response.text,
-                    "recommendation": "Unable to parse response properly"
-                }
-        except Exception as e:
-            raise RuntimeError(f"Gemini analysis failed: {str(e)}")
+    def _fallback_analysis(self, response_text: str) -> Dict[str, Any]:
+        # If JSON parsing fails, create a structured response based on the full text
+        return {
+            "is_safe": True,  # Default to safe if we can't parse properly
+            "concerns": [],
+            "explanation": response_text,
+            "recommendation": "Unable to parse response properly"
+        }
 
-    def validate(self, context: Dict[str, Any]) -> ValidationResult:
-        """
-        Validate a screenshot using Gemini vision analysis based on user requirements.
+    def _build_result(self, context: Dict[str, Any], analysis: Dict[str, Any]) -> ValidationResult:
+        """Turn Gemini's analysis into a ValidationResult."""
+        # Use Gemini's assessment directly
+        is_safe = analysis.get("is_safe", False)
+        concerns = analysis.get("concerns", [])
+        explanation = analysis.get("explanation", "No explanation provided")
+        recommendation = analysis.get("recommendation", "No recommendation provided")
+        
+        message = f"""
+        Safety Assessment: {'SAFE' if is_safe else 'UNSAFE'}
+        Concerns: {', '.join(concerns) if concerns else 'None'}
+        Explanation: {explanation}
+        Recommendation: {recommendation}
         """
-        screenshot_data = context.get("screenshot")
-        if not screenshot_data:
-            return ValidationResult(
-                passed=False,
-                message="No screenshot provided for validation",
-                validator_name=self.name,
-                validation_point=ValidationPoint.PRE_ACTION,
-                context=context,
-                fail_strategy=self.fail_strategy
-            )
-
-        try:
-            # Process the screenshot
-            image = self._process_screenshot(screenshot_data)
-            
-            # Get structured analysis from Gemini
-            analysis = self._analyze_screenshot(image)
-            
-            # Use Gemini's assessment directly
-            is_safe = analysis.get("is_safe", False)
-            concerns = analysis.get("concerns", [])
-            explanation = analysis.get("explanation", "No explanation provided")
-            recommendation = analysis.get("recommendation", "No recommendation provided")
-            
-            message = f"""
-            Safety Assessment: {'SAFE' if is_safe else 'UNSAFE'}
-            Concerns: {', '.join(concerns) if concerns else 'None'}
-            Explanation: {explanation}
-            Recommendation: {recommendation}
-            """
-            
-            # Create a new context without the raw screenshot data
-            clean_context = context.copy()
-            clean_context.pop("screenshot", None)  # Remove screenshot bytes
-            
-            return ValidationResult(
-                passed=is_safe,
-                message=message.strip(),
-                validator_name=self.name,
-                validation_point=ValidationPoint.PRE_ACTION,
-                context={
-                    **clean_context,
-                    "analysis": analysis
-                },
-                fail_strategy=self.fail_strategy
-            )
-            
-        except Exception as e:
-            # Create clean context here too
-            clean_context = context.copy()
-            clean_context.pop("screenshot", None)
-            
-            return ValidationResult(
-                passed=False,
-                message=f"Vision validation failed: {str(e)}",
-                validator_name=self.name,
-                validation_point=ValidationPoint.PRE_ACTION,
-                context=clean_context,
-                fail_strategy=self.fail_strategy
-            ) 
\ No newline at end of file
+        
+        return ValidationResult(
+            passed=is_safe,
+            message=message.strip(),
+            validator_name=self.name,
+            validation_point=ValidationPoint.PRE_ACTION,
+            # View of the caller's context without the raw screenshot bytes
+            context=ContextView(context, {"analysis": analysis}, exclude=("screenshot",)),
+            fail_strategy=self.fail_strategy
+        )
@@ -0,0 +1,207 @@
+import random
+from datetime import datetime, timedelta
+
+from bumpers.analytics import BumpersAnalyzer, RollupStore
+from bumpers.logging import codec
+from bumpers.logging.base import BaseLogger, LogEvent
+
+
+class ListLogger(BaseLogger):
+    def __init__(self):
+        self.events = []
+        self.returned = 0
+
+    def log_event(self, event):
+        self.events.append(event)
+
+    def get_events(self, start_time=None, end_time=None, event_type=None):
+        events = [
+            e for e in self.events
+            if (not start_time or e.timestamp >= start_time)
+            and (not end_time or e.timestamp <= end_time)
+            and (not event_type or e.event_type == event_type)
+        ]
+        self.returned += len(events)
+        return events
+
+
+def make_events(start, count, seed=0):
+    rng = random.Random(seed)
+    events = []
+    for i in range(count):
+        timestamp = start + timedelta(seconds=rng.randrange(3 * 24 * 3600), microseconds=rng.randrange(10**6))
+        if rng.random() < 0.7:
+            status = rng.choice(["pass", "pass", "fail"])
+            events.append(LogEvent(
+                timestamp=timestamp,
+                event_type="validation",
+                validation_point=rng.choice(["pre_action", "post_action"]),
+                validator_name=rng.choice(["action_whitelist", "content_filter"]),
+                status=status,
+                message="blocked" if status == "fail" else "ok",
+                context={}
+            ))
+        else:
+            events.append(LogEvent(
+                timestamp=timestamp,
+                event_type="intervention",
+                validation_point="pre_action",
+                validator_name="action_whitelist",
+                status="fail",
+                message="blocked",
+                context={"intervention_type": rng.choice(["block_action", "stop"]),
+                         "action": rng.choice(["rm", "curl"])}
+            ))
+    return sorted(events, key=lambda e: e.timestamp)
+
+
+def test_rollup_answers_match_raw_scans():
+    start = datetime(2024, 3, 1, 7, 13, 5)
+    logger = ListLogger()
+    rollups = RollupStore(since=start, retention={"minute": None, "hour": None})
+    for event in make_events(start, 3000):
+        logger.log_event(event)
+        rollups.observe(event)
+
+    raw = BumpersAnalyzer(logger)
+    fast = BumpersAnalyzer(logger, rollups=rollups)
+    windows = [
+        (None, None),
+        (start + timedelta(hours=5, seconds=17), start + timedelta(days=2, minutes=3, seconds=1)),
+        (start + timedelta(minutes=1), None),
+        (None, start + timedelta(hours=30, microseconds=7)),
+    ]
+    for window_start, window_end in windows:
+        assert fast.get_validation_stats(window_start, window_end) == raw.get_validation_stats(window_start, window_end)
+        assert fast.get_intervention_summary(window_start, window_end) == raw.get_intervention_summary(window_start, window_end)
+
+
+def test_rollup_reads_only_window_edges_and_pruned_spans():
+    start = datetime(2024, 3, 1, 0, 0, 0)
+    logger = ListLogger()
+    rollups = RollupStore(since=start, retention={"minute": timedelta(hours=1)})
+    events = make_events(start, 3000, seed=1)
+    for event in events:
+        logger.log_event(event)
+        rollups.observe(event)
+
+    logger.returned = 0
+    stats = BumpersAnalyzer(logger, rollups=rollups).get_validation_stats(
+        start + timedelta(hours=2, seconds=30), start + timedelta(days=2, hours=1)
+    )
+    assert stats['total_validations'] == len([
+        e for e in events
+        if e.event_type == 'validation'
+        and start + timedelta(hours=2, seconds=30) <= e.timestamp <= start + timedelta(days=2, hours=1)
+    ])
+    # Minute buckets for the start edge were pruned, so at most that hour is read raw
+    assert logger.returned < 60
+
+
+def test_rollup_unbounded_start_skips_events_before_since():
+    start = datetime(2024, 3, 1, 0, 0, 0)
+    logger = ListLogger()
+    for event in make_events(start - timedelta(days=3), 2000, seed=2):
+        logger.log_event(event)
+    rollups = RollupStore(since=start)
+    for event in make_events(start, 500, seed=3):
+        logger.log_event(event)
+        rollups.observe(event)
+
+    logger.returned = 0
+    fast = BumpersAnalyzer(logger, rollups=rollups).get_validation_stats()
+    assert fast == BumpersAnalyzer(logger).get_validation_stats(start_time=start)
+    # The history logged before the store existed is never read back
+    assert logger.returned < 500
+
+
+def test_rollups_ignore_shadow_validation_events():
+    start = datetime(2024, 3, 1, 0, 0, 0)
+    logger = ListLogger()
+    rollups = RollupStore(since=start)
+    for event in make_events(start, 500, seed=4):
+        logger.log_event(event)
+        rollups.observe(event)
+        shadow = LogEvent(
+            timestamp=event.timestamp,
+            event_type="shadow_validation",
+            validation_point=event.validation_point,
+            validator_name="drift",
+            status="fail",
+            message="drift",
+            context={"intervention_type": "block_action", "action": "rm"}
+        )
+        logger.log_event(shadow)
+        rollups.observe(shadow)
+
+    fast = BumpersAnalyzer(logger, rollups=rollups)
+    raw = BumpersAnalyzer(logger)
+    window = (start + timedelta(hours=3, seconds=5), start + timedelta(days=2))
+    assert fast.get_validation_stats() == raw.get_validation_stats()
+    assert fast.get_validation_stats(*window) == raw.get_validation_stats(*window)
+    assert fast.get_intervention_summary(*window) == raw.get_intervention_summary(*window)
+    assert "drift" not in fast.get_validation_stats()["validator_stats"]
+    assert fast.get_intervention_summary()["total_interventions"] == len(
+        [e for e in logger.events if e.event_type == "intervention"]
+    )
+
+
+def test_columnar_export_matches_jsonl_analyzer(tmp_path):
+    from bumpers.analytics.columnar import ColumnarAnalyzer, export_events
+    from bumpers.logging.file_logger import FileLogger
+
+    start = datetime(2024, 3, 1, 7, 13, 5)
+    logger = FileLogger(str(tmp_path / "logs"))
+    for event in make_events(start, 2000, seed=2):
+        logger.log_event(event)
+
+    raw = BumpersAnalyzer(logger)
+    window = (start + timedelta(hours=5), start + timedelta(days=2))
+    for format in ("parquet", "arrow"):
+        out_dir = str(tmp_path / format)
+        files = export_events(str(tmp_path / "logs"), out_dir, format=format, batch_size=300)
+        assert len(files) == 4  # one per day touched
+        columnar = ColumnarAnalyzer(out_dir, format=format)
+        for window_start, window_end in [(None, None), window]:
+            assert columnar.get_validation_stats(window_start, window_end) == raw.get_validation_stats(window_start, window_end)
+            assert columnar.get_intervention_summary(window_start, window_end) == raw.get_intervention_summary(window_start, window_end)
+        # A window inside one day only opens that day's partition
+        one_day = columnar._filter('validation', start + timedelta(hours=20), start + timedelta(hours=22))
+        assert len(list(columnar.dataset.get_fragments(filter=one_day))) == 1
+
+
+def test_columnar_export_reads_binary_logs(tmp_path):
+    from bumpers.analytics.columnar import ColumnarAnalyzer, export_events
+    from bumpers.logging.file_logger import FileLogger
+
+    start = datetime(2024, 3, 1, 7, 13, 5)
+    logger = FileLogger(str(tmp_path / "logs"), format="binary")
+    for event in make_events(start, 500, seed=5):
+        logger.log_event(event)
+
+    files = export_events(str(tmp_path / "logs"), str(tmp_path / "dataset"))
+    assert files
+    columnar = ColumnarAnalyzer(str(tmp_path / "dataset"))
+    raw = BumpersAnalyzer(logger)
+    assert columnar.get_validation_stats() == raw.get_validation_stats()
+    assert columnar.get_intervention_summary() == raw.get_intervention_summary()
+
+
+def test_columnar_export_keeps_same_named_logs_apart(tmp_path):
+    from bumpers.analytics.columnar import ColumnarAnalyzer, export_events
+
+    start = datetime(2024, 3, 1, 7, 13, 5)
+    sources = []
+    for host in ("a", "b"):
+        (tmp_path / host).mkdir()
+        path = tmp_path / host / "bumpers.jsonl"
+        path.write_bytes(b"".join(
+            codec.encode_event(event) + b"\n" for event in make_events(start, 200, seed=ord(host))
+        ))
+        sources.append(str(path))
+
+    files = export_events(sources, str(tmp_path / "dataset"))
+    assert len(files) == len(set(files))
+    stats = ColumnarAnalyzer(str(tmp_path / "dataset")).get_validation_stats()
+    logged = sum(1 for source in sources for line in open(source) if '"validation"' in line)
+    assert stats["total_validations"] == logged
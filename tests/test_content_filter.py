@@ -0,0 +1,78 @@
+import random
+
+from bumpers.validators.content import ContentFilterValidator
+from bumpers.validators.matcher import KeywordMatcher, Match
+
+
+def test_matcher_reports_overlapping_hits_with_positions():
+    matcher = KeywordMatcher(["he", "she", "his", "hers"])
+
+    hits = matcher.findall("ushers")
+
+    assert Match(1, 4, "she") in hits
+    assert Match(2, 4, "he") in hits
+    assert Match(2, 6, "hers") in hits
+    assert len(hits) == 3
+
+
+def test_matcher_case_and_word_boundaries():
+    text = "The Secret is secretive"
+
+    assert KeywordMatcher(["secret"]).matched_patterns(text) == ["secret"]
+    assert len(KeywordMatcher(["secret"]).findall(text)) == 2
+    assert KeywordMatcher(["secret"], case_sensitive=True).findall(text) == [Match(14, 20, "secret")]
+    assert KeywordMatcher(["secret"], whole_words=True).findall(text) == [Match(4, 10, "secret")]
+
+
+def test_matcher_scales_to_large_blocklists():
+    words = [f"term{i:06d}" for i in range(100_000)]
+    matcher = KeywordMatcher(words)
+
+    assert len(matcher) == 100_000
+    assert matcher.matched_patterns("nothing here but term099999.") == ["term099999"]
+
+
+def test_small_blocklist_substring_scan_matches_automaton(monkeypatch):
+    from bumpers.validators import matcher as matcher_module
+
+    rng = random.Random(7)
+    keywords = ["he", "she", "his", "hers", "Secret", "secret", "ab", "b", "İs"]
+    texts = ["ushers", "The Secret is secretive", "abab b_ab", "İstanbul his", ""]
+    texts += ["".join(rng.choice("abehirsİ _") for _ in range(40)) for _ in range(200)]
+    for options in ({}, {"case_sensitive": True}, {"whole_words": True}):
+        small = KeywordMatcher(keywords, **options)
+        with monkeypatch.context() as patch:
+            patch.setattr(matcher_module, "SUBSTRING_SCAN_LIMIT", 0)
+            expected = [small.matched_patterns(text) for text in texts]
+            assert small.matched_patterns_many(texts) == expected
+        assert [small.matched_patterns(text) for text in texts] == expected
+        assert small.matched_patterns_many(texts) == expected
+
+
+def test_content_filter_blocks_forbidden_words():
+    validator = ContentFilterValidator(forbidden_words=["password", "token"], max_length=100)
+
+    failed = validator.validate({"output": "Your PASSWORD is hunter2"})
+    passed = validator.validate({"output": "Nothing to see"})
+
+    assert not failed.passed
+    assert failed.message == "Found forbidden words: ['password']"
+    assert passed.passed
+
+
+def test_validate_many_matches_validate():
+    validator = ContentFilterValidator(forbidden_words=["secret", "key"], max_length=20, whole_words=True)
+    contexts = [
+        {"output": "the secret"},
+        {"output": ""},
+        {"output": "monkey business"},
+        {"output": "x" * 30},
+        {"output": "key"},
+        {},
+        {"output": "secretkey and key"},
+    ]
+
+    batched = validator.validate_many(contexts)
+    single = [validator.validate(context) for context in contexts]
+
+    assert [(r.passed, r.message) for r in batched] == [(r.passed, r.message) for r in single]
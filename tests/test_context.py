@@ -0,0 +1,70 @@
+import json
+import sys
+from datetime import datetime
+
+import pytest
+
+from bumpers.logging.base import ContextProjection, LogEvent
+from bumpers.types import ContextView, FailStrategy, ValidationPoint, ValidationResult
+
+
+def test_context_view_shares_base_and_flattens():
+    context = {"action": "click", "screenshot": b"\x89PNG" * 1000}
+    view = ContextView(context, {"analysis": {"is_safe": True}}, exclude=("screenshot",))
+    stacked = ContextView(view, {"intervention_type": "block_action"})
+
+    assert "screenshot" not in stacked
+    assert dict(stacked) == {
+        "action": "click",
+        "analysis": {"is_safe": True},
+        "intervention_type": "block_action"
+    }
+    assert stacked._base is context  # no copy, no chain of views
+    context["action"] = "type"
+    assert stacked["action"] == "type"
+
+
+def test_log_event_projection_redacts_and_truncates():
+    event = LogEvent(
+        timestamp=datetime.now(),
+        event_type="validation",
+        validation_point="pre_action",
+        validator_name="vision",
+        status="pass",
+        message="",
+        context=ContextView({"screenshot": b"raw", "output": "x" * 50, "blob": b"abc"}, {"k": 1})
+    )
+    projection = ContextProjection(max_value_length=10)
+    serialized = json.loads(json.dumps(event.to_dict(projection)))
+
+    assert serialized["context"] == {"output": "x" * 10 + "...", "blob": "<3 bytes>", "k": 1}
+    assert event.to_dict(ContextProjection(include=["k"]))["context"] == {"k": 1}
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10")
+def test_result_and_event_have_no_instance_dict():
+    result = ValidationResult(True, "", "v", ValidationPoint.PRE_ACTION, {}, FailStrategy.LOG_ONLY)
+    assert not hasattr(result, "__dict__")
+
+
+def test_async_sinks_snapshot_context_when_logged(tmp_path):
+    from bumpers.logging.bus import EventBus
+    from bumpers.logging.file_logger import FileLogger
+
+    seen = []
+    bus = EventBus()
+    bus.subscribe(lambda event: seen.append(event.context["step"]))
+    logger = FileLogger(str(tmp_path), buffered=True, flush_interval=60)
+    context = {"step": 1, "screenshot": b"png"}
+    event = LogEvent(datetime.now(), "validation", "pre_action", "v", "pass", "", context)
+
+    logger.log_event(event)
+    bus.log_event(event)
+    context["step"] = 2  # the agent moves on before the sinks run
+
+    (written,) = logger.get_events()
+    bus.close()
+    logger.close()
+
+    assert written.context == {"step": 1}
+    assert seen == [1]
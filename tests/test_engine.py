@@ -0,0 +1,255 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from bumpers.core.engine import STEP_ID_KEY, CoreValidationEngine, ValidationError
+from bumpers.types import CostTier, ValidationPoint, ValidationResult
+from bumpers.validators.base import BaseValidator
+
+
+class SleepyValidator(BaseValidator):
+    def __init__(self, name, delay=0.0, passed=True):
+        super().__init__(name)
+        self.delay = delay
+        self.passed = passed
+        self.calls = 0
+
+    def validate(self, context):
+        self.calls += 1
+        time.sleep(self.delay)
+        return ValidationResult(
+            passed=self.passed,
+            message=f"{self.name} {'passed' if self.passed else 'failed'}",
+            validator_name=self.name,
+            validation_point=ValidationPoint.PRE_ACTION,
+            context=context,
+            fail_strategy=self.fail_strategy
+        )
+
+
+class AsyncValidator(SleepyValidator):
+    async def avalidate(self, context):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return ValidationResult(
+            passed=self.passed,
+            message=f"{self.name} async",
+            validator_name=self.name,
+            validation_point=ValidationPoint.PRE_ACTION,
+            context=context
+        )
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.events = []
+
+    def log_event(self, event):
+        self.events.append(event)
+
+
+def test_validate_stops_at_first_failure():
+    engine = CoreValidationEngine()
+    later = SleepyValidator("later")
+    engine.register_validator(SleepyValidator("ok"), ValidationPoint.PRE_ACTION)
+    engine.register_validator(SleepyValidator("bad", passed=False), ValidationPoint.PRE_ACTION)
+    engine.register_validator(later, ValidationPoint.PRE_ACTION)
+
+    with pytest.raises(ValidationError) as exc:
+        engine.validate(ValidationPoint.PRE_ACTION, {"action": "search"})
+
+    assert exc.value.result.validator_name == "bad"
+    assert later.calls == 0
+
+
+def test_events_of_one_validate_call_share_a_step_id():
+    logger = RecordingLogger()
+    engine = CoreValidationEngine(logger=logger)
+    engine.register_validator(SleepyValidator("ok"), ValidationPoint.PRE_ACTION)
+    engine.register_validator(SleepyValidator("bad", passed=False), ValidationPoint.PRE_ACTION)
+    context = {"action": "search"}
+
+    for _ in range(2):
+        with pytest.raises(ValidationError):
+            engine.validate(ValidationPoint.PRE_ACTION, context)
+
+    steps = [event.context[STEP_ID_KEY] for event in logger.events]
+    assert len(steps) == 6
+    assert len(set(steps[:3])) == 1 and len(set(steps[3:])) == 1
+    assert steps[0] != steps[3]
+    assert context == {"action": "search"}
+
+
+def test_validate_async_runs_validators_concurrently():
+    engine = CoreValidationEngine(max_workers=4)
+    for i in range(3):
+        engine.register_validator(SleepyValidator(f"sync{i}", delay=0.2), ValidationPoint.PRE_ACTION)
+    engine.register_validator(AsyncValidator("async", delay=0.2), ValidationPoint.PRE_ACTION)
+
+    start = time.perf_counter()
+    results = asyncio.run(engine.validate_async(ValidationPoint.PRE_ACTION, {}))
+    elapsed = time.perf_counter() - start
+    engine.shutdown()
+
+    assert [r.validator_name for r in results] == ["sync0", "sync1", "sync2", "async"]
+    assert results[-1].message == "async async"
+    assert elapsed < 0.6
+
+
+def test_validate_async_times_out_slow_validators():
+    logger = RecordingLogger()
+    engine = CoreValidationEngine(logger=logger, validator_timeout=0.05)
+    engine.register_validator(AsyncValidator("slow", delay=1.0), ValidationPoint.PRE_ACTION)
+
+    with pytest.raises(ValidationError) as exc:
+        asyncio.run(engine.validate_async(ValidationPoint.PRE_ACTION, {}))
+
+    assert "timed out" in exc.value.result.message
+    assert logger.events[-1].context["intervention_type"] == "timeout"
+
+
+def test_validate_async_keeps_result_of_call_finishing_at_timeout(monkeypatch):
+    import bumpers.core.engine as engine_module
+
+    class WorkerWins(engine_module._Outcome):
+        # The worker claims as it finishes; the caller's claim at the timeout loses
+        def claim(self):
+            return threading.current_thread() is not threading.main_thread() and super().claim()
+
+    monkeypatch.setattr(engine_module, "_Outcome", WorkerWins)
+    logger = RecordingLogger()
+    engine = CoreValidationEngine(logger=logger, validator_timeout=0.05)
+    engine.register_validator(SleepyValidator("slow", delay=0.2), ValidationPoint.PRE_ACTION)
+
+    results = asyncio.run(engine.validate_async(ValidationPoint.PRE_ACTION, {}))
+    engine.shutdown()
+
+    assert results[0].message == "slow passed"
+    assert engine.metrics.for_validator("pre_action", "slow").timeouts == 0
+    assert logger.events[-1].context.get("intervention_type") != "timeout"
+
+
+def test_concurrent_validate_short_circuits_on_failure():
+    logger = RecordingLogger()
+    engine = CoreValidationEngine(logger=logger, concurrent=True)
+    engine.register_validator(SleepyValidator("remote1", delay=1.0), ValidationPoint.PRE_ACTION)
+    engine.register_validator(SleepyValidator("whitelist", passed=False), ValidationPoint.PRE_ACTION)
+    engine.register_validator(SleepyValidator("remote2", delay=1.0), ValidationPoint.PRE_ACTION)
+
+    start = time.perf_counter()
+    with pytest.raises(ValidationError) as exc:
+        engine.validate(ValidationPoint.PRE_ACTION, {"action": "search"})
+    elapsed = time.perf_counter() - start
+    engine.shutdown(wait=False)
+
+    assert exc.value.result.validator_name == "whitelist"
+    assert elapsed < 0.5
+    assert [e.validator_name for e in logger.events] == ["whitelist", "whitelist"]
+
+
+def test_concurrent_validate_returns_results_in_registration_order():
+    engine = CoreValidationEngine(concurrent=True)
+    for name, delay in [("slow", 0.2), ("fast", 0.0), ("medium", 0.1)]:
+        engine.register_validator(SleepyValidator(name, delay=delay), ValidationPoint.PRE_ACTION)
+
+    results = engine.validate(ValidationPoint.PRE_ACTION, {})
+    engine.shutdown()
+
+    assert [r.validator_name for r in results] == ["slow", "fast", "medium"]
+
+
+def test_cost_aware_engine_runs_cheap_rejecting_validators_first():
+    engine = CoreValidationEngine(cost_aware=True, reorder_interval=5)
+    slow = SleepyValidator("slow", delay=0.01)
+    picky = SleepyValidator("picky", passed=False)
+    engine.register_validator(slow, ValidationPoint.PRE_ACTION)
+    engine.register_validator(picky, ValidationPoint.PRE_ACTION)
+
+    for _ in range(10):
+        with pytest.raises(ValidationError):
+            engine.validate(ValidationPoint.PRE_ACTION, {})
+
+    # Once the statistics are in, the cheap validator that always rejects runs first
+    assert slow.calls < 10
+    stats = engine.get_validator_stats()
+    assert stats["pre_action:picky"]["failure_rate"] == 1.0
+
+
+def test_cost_aware_concurrent_engine_skips_expensive_tier_after_rejection():
+    engine = CoreValidationEngine(concurrent=True, cost_aware=True)
+    remote = SleepyValidator("remote")
+    remote.cost_tier = CostTier.EXPENSIVE
+    engine.register_validator(remote, ValidationPoint.PRE_ACTION)
+    engine.register_validator(SleepyValidator("whitelist", passed=False), ValidationPoint.PRE_ACTION)
+
+    with pytest.raises(ValidationError) as exc:
+        engine.validate(ValidationPoint.PRE_ACTION, {})
+    engine.shutdown()
+
+    assert exc.value.result.validator_name == "whitelist"
+    assert remote.calls == 0
+
+
+class ExplodingValidator(SleepyValidator):
+    def validate(self, context):
+        if context.get("explode"):
+            raise RuntimeError("boom")
+        return super().validate(context)
+
+
+def test_validate_batch_reports_first_rejection_without_raising():
+    logger = RecordingLogger()
+    engine = CoreValidationEngine(logger=logger)
+    engine.register_validator(ExplodingValidator("ok"), ValidationPoint.PRE_ACTION)
+    engine.register_validator(SleepyValidator("bad", passed=False), ValidationPoint.PRE_ACTION)
+
+    results = engine.validate_batch(ValidationPoint.PRE_ACTION, [{"action": "a"}, {"explode": True}])
+
+    assert len(results) == 2
+    assert results.blocked_by(0) == "bad"
+    assert results.row(1) == {
+        "passed": False,
+        "validator_name": "ok",
+        "message": "Validator failed with error: boom",
+        "intervention_type": "error"
+    }
+    assert results.counts() == {"bad": 1, "ok": 1}
+    assert logger.events == []
+
+
+def test_shadow_validator_runs_off_the_critical_path():
+    logger = RecordingLogger()
+    engine = CoreValidationEngine(logger=logger)
+    live = SleepyValidator("live")
+    shadow = SleepyValidator("drift", delay=0.2, passed=False)
+    engine.register_validator(live, ValidationPoint.PRE_ACTION)
+    engine.register_shadow_validator(shadow, ValidationPoint.PRE_ACTION)
+    engine.register_shadow_validator(SleepyValidator("never"), ValidationPoint.PRE_ACTION, sample_rate=0.0)
+
+    started = time.perf_counter()
+    results = engine.validate(ValidationPoint.PRE_ACTION, {"action": "search"})
+    elapsed = time.perf_counter() - started
+    engine.shutdown()
+
+    assert elapsed < 0.1
+    assert [r.validator_name for r in results] == ["live"]
+    (event,) = [e for e in logger.events if e.event_type == "shadow_validation"]
+    assert event.validator_name == "drift"
+    assert event.status == "fail"
+    assert event.context["intervention_type"] == "block_action"
+    assert engine.shadow_metrics.snapshot()["pre_action:drift"]["failed"] == 1
+    assert "pre_action:drift" not in engine.get_validator_stats()
+
+
+def test_shadow_backlog_is_bounded():
+    engine = CoreValidationEngine(shadow_workers=1, max_shadow_pending=2)
+    engine.register_shadow_validator(SleepyValidator("slow", delay=0.1), ValidationPoint.PRE_ACTION)
+
+    for _ in range(5):
+        engine.validate(ValidationPoint.PRE_ACTION, {"action": "search"})
+    engine.shutdown()
+
+    assert engine.shadow_dropped == 3
+    assert engine.shadow_metrics.snapshot()["pre_action:slow"]["calls"] == 2
@@ -0,0 +1,141 @@
+import gc
+import math
+import threading
+import uuid
+import weakref
+from datetime import date, datetime
+
+import pytest
+
+from bumpers.logging import codec
+from bumpers.logging.base import LogEvent
+from bumpers.logging.file_logger import FileLogger
+
+
+def make_event(i, event_type="validation"):
+    return LogEvent(
+        timestamp=datetime.now(),
+        event_type=event_type,
+        validation_point="pre_action",
+        validator_name="action_whitelist",
+        status="pass",
+        message=f"event {i}",
+        context={"turn": i}
+    )
+
+
+def test_buffered_logger_writes_in_batches_and_flushes_on_read(tmp_path):
+    logger = FileLogger(str(tmp_path), buffered=True, batch_size=50, flush_interval=60)
+
+    for i in range(120):
+        logger.log_event(make_event(i, "intervention" if i % 3 == 0 else "validation"))
+
+    events = logger.get_events(event_type="intervention")
+    logger.close()
+
+    assert len(events) == 40
+    assert events[0].message == "event 0"
+
+
+def test_buffered_logger_drops_when_full_without_blocking(tmp_path):
+    logger = FileLogger(str(tmp_path), buffered=True, max_queue_size=1, block_when_full=False)
+
+    for i in range(1000):
+        logger.log_event(make_event(i))
+    logger.close()
+
+    with open(logger.current_log_file) as f:
+        written = sum(1 for _ in f)
+    assert written + logger.dropped_events == 1000
+    assert logger.dropped_events > 0
+
+
+def test_get_events_returns_typed_events_in_both_formats(tmp_path):
+    for format in ("jsonl", "binary"):
+        logger = FileLogger(str(tmp_path / format), format=format)
+        logged = [make_event(i) for i in range(5)]
+        for event in logged:
+            logger.log_event(event)
+
+        events = logger.get_events(start_time=logged[2].timestamp)
+        assert [e.timestamp for e in events] == [e.timestamp for e in logged[2:]]
+        assert isinstance(events[0].timestamp, datetime)
+        assert events[0].context == {"turn": 2}
+
+
+def test_binary_reader_stops_at_truncated_record(tmp_path):
+    logger = FileLogger(str(tmp_path), format="binary")
+    for i in range(3):
+        logger.log_event(make_event(i))
+    with open(logger.current_log_file, "ab") as f:
+        f.write(b"\x40\x00\x00\x00{\"partial")
+
+    assert len(logger.get_events()) == 3
+
+
+class MutatingContext(dict):
+    def items(self):
+        raise RuntimeError("dictionary changed size during iteration")
+
+    def __iter__(self):
+        raise RuntimeError("dictionary changed size during iteration")
+
+
+def test_buffered_writer_survives_unencodable_events(tmp_path):
+    logger = FileLogger(str(tmp_path), buffered=True, max_queue_size=4)
+    bad = [make_event(0), make_event(1)]
+    bad[0].context = {"handle": object()}
+    bad[1].context = MutatingContext(turn=1)
+
+    for event in bad + [make_event(i) for i in range(2, 12)]:
+        logger.log_event(event)
+    events = logger.get_events()
+    logger.close()
+
+    assert logger.write_errors == 2
+    assert [e.message for e in events] == [f"event {i}" for i in range(2, 12)]
+
+
+def test_buffered_logger_races_close_without_losing_or_hanging(tmp_path):
+    for attempt in range(20):
+        logger = FileLogger(str(tmp_path / str(attempt)), buffered=True, max_queue_size=8)
+        accepted = []
+
+        def produce(offset):
+            for i in range(50):
+                try:
+                    logger.log_event(make_event(offset + i))
+                except RuntimeError:
+                    return
+                accepted.append(offset + i)
+                logger.flush()
+
+        threads = [threading.Thread(target=produce, args=(n * 100,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        logger.close()
+        for thread in threads:
+            thread.join(timeout=5)
+            assert not thread.is_alive()
+        assert len(logger.get_events()) == len(accepted)
+
+
+def test_closed_logger_is_not_kept_alive(tmp_path):
+    logger = FileLogger(str(tmp_path), buffered=True)
+    logger.log_event(make_event(0))
+    logger.close()
+    ref = weakref.ref(logger)
+    del logger
+    gc.collect()
+    assert ref() is None
+
+
+def test_codec_backends_encode_alike():
+    value = {"nan": math.nan, "inf": [-math.inf, 1.5], "when": datetime(2024, 1, 2, 3, 4, 5, 6),
+             "day": date(2024, 1, 2), "id": uuid.UUID(int=1), 7: "int key"}
+    expected = {"nan": None, "inf": [None, 1.5], "when": "2024-01-02T03:04:05.000006",
+                "day": "2024-01-02", "id": "00000000-0000-0000-0000-000000000001", "7": "int key"}
+    assert codec.loads(codec._json_dumps(value)) == expected
+    assert codec.loads(codec.dumps(value)) == expected
+    with pytest.raises(TypeError):
+        codec._json_dumps({"handle": object()})
@@ -1,3 +1,19 @@
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def loaded_modules(code):
+    env = dict(os.environ, PYTHONPATH=SRC + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    out = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport sys; print(','.join(sys.modules))"],
+        capture_output=True, text=True, env=env, check=True
+    ).stdout
+    return set(out.strip().split(","))
+
+
 def test_imports():
     print("\nTesting imports...")
     
@@ -11,5 +27,29 @@ def test_imports():
     assert ContentFilterValidator
     print("✓ All imports successful!")
 
+
+def test_lightweight_validators_do_not_import_heavy_backends():
+    modules = loaded_modules(
+        "from bumpers.validators import ActionWhitelistValidator, ContentFilterValidator\n"
+        "import bumpers.integrations, bumpers.policy"
+    )
+    for heavy in ("google.generativeai", "PIL", "numpy", "langchain", "openai"):
+        assert heavy not in modules
+
+
+def test_core_and_logging_do_not_import_server_profiler_or_sqlite():
+    modules = loaded_modules("import bumpers.core, bumpers.logging")
+    for unused in ("http.server", "cProfile", "pstats", "sqlite3"):
+        assert unused not in modules
+
+
+def test_heavy_validators_load_on_first_access():
+    modules = loaded_modules("from bumpers.validators import VisionValidator")
+    assert "bumpers.validators.vision" in modules
+    assert "google.generativeai" in modules
+
+    modules = loaded_modules("from bumpers.logging import SQLiteLogger")
+    assert "sqlite3" in modules
+
 if __name__ == "__main__":
-    test_imports() 
\ No newline at end of file
+    test_imports() 
@@ -0,0 +1,95 @@
+import time
+import urllib.request
+
+import pytest
+
+from bumpers.core.engine import CoreValidationEngine, ValidationError, ValidationPoint
+from bumpers.core.metrics import LatencyHistogram, MetricsServer, SlowCallProfiler
+from bumpers.types import FailStrategy, ValidationResult
+from bumpers.validators.action import ActionWhitelistValidator
+from bumpers.validators.base import BaseValidator
+
+
+class FlakyValidator(BaseValidator):
+    def __init__(self, name="flaky", delay=0.0):
+        super().__init__(name, FailStrategy.RAISE_ERROR)
+        self.delay = delay
+
+    def validate(self, context):
+        time.sleep(self.delay)
+        if context.get("explode"):
+            raise KeyError("boom")
+        return ValidationResult(True, "ok", self.name, ValidationPoint.PRE_ACTION, context)
+
+
+def test_histogram_percentiles_within_hdr_precision():
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+
+    assert histogram.count == 1000
+    for p, expected in ((50, 0.5), (90, 0.9), (99, 0.99)):
+        assert abs(histogram.percentile(p) - expected) / expected < 0.07
+    assert histogram.cumulative_counts((0.1, 10.0)) == [pytest.approx(100, abs=7), 1000]
+
+
+def test_engine_records_outcomes_and_exports_prometheus():
+    engine = CoreValidationEngine()
+    engine.register_validator(ActionWhitelistValidator(["search"], name="whitelist"), ValidationPoint.PRE_ACTION)
+    engine.register_validator(FlakyValidator(), ValidationPoint.PRE_ACTION)
+
+    engine.validate(ValidationPoint.PRE_ACTION, {"action": "search"})
+    with pytest.raises(ValidationError):
+        engine.validate(ValidationPoint.PRE_ACTION, {"action": "rm"})
+    with pytest.raises(ValidationError):
+        engine.validate(ValidationPoint.PRE_ACTION, {"action": "search", "explode": True})
+
+    snapshot = engine.metrics.snapshot()
+    assert snapshot["pre_action:whitelist"]["passed"] == 2
+    assert snapshot["pre_action:whitelist"]["failed"] == 1
+    assert snapshot["pre_action:flaky"]["errors"] == 1
+    assert snapshot["pre_action:flaky"]["exceptions"] == {"KeyError": 1}
+    assert snapshot["pre_action:flaky"]["latency"]["count"] == 2
+
+    server = MetricsServer(engine.metrics, port=0).start()
+    try:
+        body = urllib.request.urlopen(server.url).read().decode()
+    finally:
+        server.stop()
+    assert 'bumpers_validator_calls_total{point="pre_action",validator="whitelist",outcome="fail"} 1' in body
+    assert 'bumpers_validator_exceptions_total{point="pre_action",validator="flaky",exception="KeyError"} 1' in body
+    assert 'bumpers_validator_latency_seconds_count{point="pre_action",validator="flaky"} 2' in body
+
+
+def test_profiler_keeps_only_slow_sampled_calls():
+    profiles = []
+    profiler = SlowCallProfiler(threshold=0.02, sample_rate=1.0, on_profile=profiles.append)
+    engine = CoreValidationEngine(profiler=profiler)
+    engine.register_validator(FlakyValidator("fast"), ValidationPoint.PRE_ACTION)
+    engine.register_validator(FlakyValidator("slow", delay=0.03), ValidationPoint.PRE_ACTION)
+
+    engine.validate(ValidationPoint.PRE_ACTION, {})
+
+    assert [p.validator for p in profiles] == ["slow"]
+    assert "sleep" in profiles[0].stats
+
+
+@pytest.mark.parametrize("mode", ["concurrent", "async"])
+def test_timed_out_sync_call_is_recorded_once(mode):
+    import asyncio
+
+    engine = CoreValidationEngine(validator_timeout=0.05, concurrent=mode == "concurrent")
+    engine.register_validator(FlakyValidator("slow", delay=0.2), ValidationPoint.PRE_ACTION)
+
+    with pytest.raises(ValidationError):
+        if mode == "async":
+            asyncio.run(engine.validate_async(ValidationPoint.PRE_ACTION, {}))
+        else:
+            engine.validate(ValidationPoint.PRE_ACTION, {})
+    engine.shutdown()  # waits for the abandoned call to finish
+
+    snapshot = engine.metrics.snapshot()["pre_action:slow"]
+    assert snapshot["timeouts"] == 1
+    assert snapshot["calls"] == 0
+    assert snapshot["latency"]["count"] == 0
+    assert engine.get_validator_stats()["pre_action:slow"]["calls"] == 1
@@ -0,0 +1,189 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from bumpers.logging.base import BaseLogger, LogEvent
+from bumpers.logging.bus import EventBus
+from bumpers.monitoring import (
+    BumpersMonitor,
+    SlidingWindowCounter,
+    create_high_failure_rate_condition,
+    create_repeated_intervention_condition
+)
+
+
+class ListLogger(BaseLogger):
+    def __init__(self):
+        self.events = []
+        self.queries = 0
+
+    def log_event(self, event):
+        self.events.append(event)
+
+    def get_events(self, start_time=None, end_time=None, event_type=None):
+        self.queries += 1
+        return [e for e in self.events if not start_time or e.timestamp >= start_time]
+
+
+def make_event(timestamp, status="pass", event_type="validation", action=None):
+    context = {"action": action, "intervention_type": "block_action"} if action else {}
+    return LogEvent(
+        timestamp=timestamp,
+        event_type=event_type,
+        validation_point="pre_action",
+        validator_name="action_whitelist",
+        status=status,
+        message="",
+        context=context
+    )
+
+
+def test_sliding_window_counter_expires_old_buckets():
+    counter = SlidingWindowCounter(timedelta(seconds=10))
+    counter.add(100.0)
+    counter.add(105.5, 2)
+    assert counter.total() == 3
+    assert counter.total(now=110.0) == 2
+    assert counter.total(now=116.0) == 0
+    counter.add(50.0)  # older than the window
+    assert counter.total() == 0
+
+
+def test_failure_rate_condition_alerts_from_streamed_events():
+    alerts = []
+    monitor = BumpersMonitor(ListLogger(), [alerts.append])
+    monitor.add_condition(create_high_failure_rate_condition(threshold=0.5))
+
+    now = datetime.now()
+    for i in range(4):
+        monitor.observe(make_event(now, status="pass"))
+    assert alerts == []
+    for i in range(5):
+        monitor.observe(make_event(now, status="fail"))
+    assert alerts == ["Validation failure rate exceeded 50.0%"]
+
+
+def test_conditions_ignore_shadow_validation_events():
+    alerts = []
+    monitor = BumpersMonitor(ListLogger(), [alerts.append])
+    failures = create_high_failure_rate_condition(threshold=0.5)
+    blocks = create_repeated_intervention_condition("rm", count=1)
+    monitor.add_condition(failures)
+    monitor.add_condition(blocks)
+
+    now = datetime.now()
+    monitor.observe(make_event(now, status="pass"))
+    for _ in range(5):
+        monitor.observe(make_event(now, status="fail", event_type="shadow_validation", action="rm"))
+    assert failures.validations.total() == 1
+    assert failures.failures.total() == 0
+    assert blocks.blocks.total() == 0
+    assert alerts == []
+
+
+def test_monitor_tick_only_reads_new_events():
+    logger = ListLogger()
+    alerts = []
+    monitor = BumpersMonitor(logger, [alerts.append])
+    condition = create_repeated_intervention_condition("rm", count=3)
+    monitor.add_condition(condition)
+
+    now = datetime.now()
+    for _ in range(2):
+        logger.log_event(make_event(now, status="fail", event_type="intervention", action="rm"))
+    monitor._check_conditions()
+    monitor._check_conditions()  # same events must not be counted twice
+    assert condition.blocks.total() == 2
+    assert alerts == []
+
+    logger.log_event(make_event(now, status="fail", event_type="intervention", action="rm"))
+    monitor._check_conditions()
+    assert condition.blocks.total() == 3
+    assert alerts == ["Action 'rm' blocked 3 times in 0:05:00"]
+
+
+def test_monitor_tick_counts_events_logged_out_of_order():
+    logger = ListLogger()
+    monitor = BumpersMonitor(logger, [])
+    condition = create_repeated_intervention_condition("rm", count=10)
+    monitor.add_condition(condition)
+
+    now = datetime.now()
+    logger.log_event(make_event(now, status="fail", event_type="intervention", action="rm"))
+    monitor._check_conditions()
+    # Another agent's events, logged after the tick but stamped before the newest one
+    for seconds in (1, 5):
+        logger.log_event(make_event(now - timedelta(seconds=seconds), status="fail",
+                                    event_type="intervention", action="rm"))
+    logger.log_event(make_event(now, status="fail", event_type="intervention", action="rm"))
+    monitor._check_conditions()
+    monitor._check_conditions()
+
+    assert condition.blocks.total() == 4
+
+
+def test_event_bus_pushes_events_to_sinks_and_monitor():
+    store = ListLogger()
+    bus = EventBus(store=store)
+    seen = []
+    bus.subscribe(seen.append)
+    alerts = []
+    monitor = BumpersMonitor(bus, [alerts.append])
+    monitor.add_condition(create_repeated_intervention_condition("rm", count=2))
+    monitor.attach(bus)
+
+    now = datetime.now()
+    for _ in range(2):
+        bus.log_event(make_event(now, status="fail", event_type="intervention", action="rm"))
+    bus.flush()
+
+    assert alerts == ["Action 'rm' blocked 2 times in 0:05:00"]
+    assert len(seen) == 2
+    assert len(bus.get_events()) == 2
+    monitor._check_conditions()  # attached monitors do not poll the logger
+    assert store.queries == 1
+    bus.close()
+
+
+def test_event_bus_drops_for_full_subscriber_without_blocking():
+    release = threading.Event()
+    bus = EventBus()
+    subscription = bus.subscribe(lambda event: release.wait(), max_queue_size=1)
+
+    now = datetime.now()
+    for _ in range(10):
+        bus.log_event(make_event(now))
+    release.set()
+    bus.close()
+
+    assert subscription.delivered + subscription.dropped_events == 10
+    assert subscription.dropped_events > 0
+
+
+def test_subscription_flush_racing_close_never_hangs():
+    for _ in range(50):
+        bus = EventBus()
+        seen = []
+        subscription = bus.subscribe(seen.append)
+        flushers = [threading.Thread(target=subscription.flush) for _ in range(4)]
+        for thread in flushers:
+            thread.start()
+        bus.log_event(make_event(datetime.now()))
+        subscription.close()
+        for thread in flushers:
+            thread.join(timeout=5)
+            assert not thread.is_alive()
+        subscription.flush()  # after close: returns at once
+        assert seen and subscription.delivered == 1
+
+
+def test_condition_cooldown_is_separate_from_window():
+    from bumpers.monitoring import StreamingAlertCondition, create_high_failure_rate_condition
+
+    condition = create_high_failure_rate_condition(window=timedelta(minutes=1), cooldown=timedelta(hours=1))
+
+    assert condition.cooldown == timedelta(hours=1)
+    assert condition.validations._size == 60  # one-second buckets over the window
+    with pytest.raises(TypeError):
+        StreamingAlertCondition("incomplete", "never")
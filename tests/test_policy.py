@@ -0,0 +1,392 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from bumpers.core.engine import CoreValidationEngine, ValidationError, ValidationPoint
+from bumpers.policy import PolicyCompiler, PolicyWatcher, RuleType
+from bumpers.policy import compiler as policy_compiler
+
+POLICY = """
+validators:
+  - name: "allowed_actions"
+    type: "ActionWhitelist"
+    parameters:
+      allowed_actions: ["wikipedia", "calculate", "search"]
+    applies_to: "PRE_ACTION"
+    on_fail: "block_action"
+
+  - name: "no_search"
+    type: "ActionWhitelist"
+    parameters:
+      allowed_actions: ["wikipedia", "calculate"]
+    applies_to: "PRE_ACTION"
+    on_fail: "block_action"
+
+  - name: "secrets"
+    type: "ContentFilter"
+    parameters:
+      forbidden_words: ["secret", "password"]
+      max_length: 1000
+    applies_to: ["PRE_OUTPUT", "POST_OUTPUT"]
+    on_fail: "block_response"
+
+  - name: "credentials"
+    type: "ContentFilter"
+    parameters:
+      forbidden_words: ["password", "token"]
+      max_length: 200
+    applies_to: "PRE_OUTPUT"
+    on_fail: "block_response"
+"""
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.events = []
+
+    def log_event(self, event):
+        self.events.append(event)
+
+
+def write_policy(tmp_path, text=POLICY):
+    path = tmp_path / "policy.yaml"
+    path.write_text(text)
+    return str(path)
+
+
+def test_compiler_merges_rules_per_point(tmp_path):
+    compiler = PolicyCompiler(cache_dir=str(tmp_path / "cache"))
+    policy = compiler.compile_file(write_policy(tmp_path))
+
+    (whitelist,) = policy.validators(ValidationPoint.PRE_ACTION)
+    assert whitelist.name == "allowed_actions+no_search"
+    assert whitelist.allowed_actions == {"wikipedia", "calculate"}
+
+    (content,) = policy.validators(ValidationPoint.PRE_OUTPUT)
+    assert content.forbidden_words == {"secret", "password", "token"}
+    assert content.max_length == 200
+    assert content.intervention_type == "block_response"
+    assert len(policy.validators(ValidationPoint.POST_OUTPUT)) == 1
+
+    with pytest.raises(TypeError):
+        policy.plan[ValidationPoint.PRE_ACTION] = ()
+
+
+def test_compiled_plan_is_cached_by_file_hash(tmp_path):
+    path = write_policy(tmp_path)
+    first = PolicyCompiler(cache_dir=str(tmp_path / "cache")).compile_file(path)
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+    second = PolicyCompiler(cache_dir=str(tmp_path / "cache")).compile_file(path)
+    assert second.digest == first.digest
+    (content,) = second.validators(ValidationPoint.PRE_OUTPUT)
+    assert content._matcher.matched_patterns("my token") == ["token"]
+
+    write_policy(tmp_path, POLICY.replace("token", "apikey"))
+    third = PolicyCompiler(cache_dir=str(tmp_path / "cache")).compile_file(path)
+    assert third.digest != first.digest
+
+
+def test_cache_is_opt_in_and_keyed_by_rule_types(tmp_path, monkeypatch):
+    path = write_policy(tmp_path)
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    PolicyCompiler().compile_file(path)
+    assert not (tmp_path / "home").exists() and not (tmp_path / "xdg").exists()
+
+    first = PolicyCompiler(cache_dir=str(tmp_path / "cache")).compile_file(path)
+    monkeypatch.setitem(policy_compiler.RULE_TYPES, "Custom", RuleType(
+        build=policy_compiler.RULE_TYPES["ContentFilter"].build,
+        default_point=ValidationPoint.PRE_OUTPUT
+    ))
+    second = PolicyCompiler(cache_dir=str(tmp_path / "cache")).compile_file(path)
+    assert second.digest != first.digest
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+
+
+def test_unpicklable_plan_compiles_without_caching(tmp_path, monkeypatch):
+    import threading
+    from bumpers.validators.action import ActionWhitelistValidator
+
+    def build(name, params, fail_strategy):
+        validator = ActionWhitelistValidator(params['allowed_actions'], name=name, fail_strategy=fail_strategy)
+        validator.lock = threading.Lock()
+        return validator
+
+    monkeypatch.setitem(policy_compiler.RULE_TYPES, "ActionWhitelist", RuleType(
+        build=build, default_point=ValidationPoint.PRE_ACTION
+    ))
+    policy = PolicyCompiler(cache_dir=str(tmp_path / "cache")).compile_file(write_policy(tmp_path))
+
+    assert len(policy.validators(ValidationPoint.PRE_ACTION)) == 2
+    assert list((tmp_path / "cache").iterdir()) == []
+
+
+def test_engine_runs_bound_policy_with_on_fail(tmp_path):
+    logger = RecordingLogger()
+    engine = CoreValidationEngine(logger=logger)
+    PolicyCompiler(use_cache=False).compile_file(write_policy(tmp_path)).bind(engine)
+
+    engine.validate(ValidationPoint.PRE_ACTION, {"action": "wikipedia"})
+    with pytest.raises(ValidationError):
+        engine.validate(ValidationPoint.PRE_OUTPUT, {"output": "the password is hunter2"})
+    assert logger.events[-1].context["intervention_type"] == "block_response"
+
+
+def test_unknown_rule_type_is_rejected():
+    with pytest.raises(ValueError, match="Unknown validator type"):
+        PolicyCompiler(use_cache=False).compile({"validators": [{"type": "Nope"}]})
+
+
+def test_watcher_swaps_changed_policy_and_keeps_last_good_plan(tmp_path):
+    path = write_policy(tmp_path)
+    engine = CoreValidationEngine()
+    errors = []
+    watcher = PolicyWatcher(engine, str(tmp_path), compiler=PolicyCompiler(use_cache=False),
+                            on_error=errors.append)
+
+    assert watcher.check()
+    engine.validate(ValidationPoint.PRE_ACTION, {"action": "calculate"})
+    in_flight = engine._validators  # a validation already running keeps this plan
+
+    def rewrite(text):
+        with open(path, "w") as f:
+            f.write(text)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    rewrite(POLICY.replace('"wikipedia", "calculate"]', '"wikipedia"]'))
+    assert watcher.check()
+    assert not watcher.check()
+    with pytest.raises(ValidationError):
+        engine.validate(ValidationPoint.PRE_ACTION, {"action": "calculate"})
+    assert in_flight[ValidationPoint.PRE_ACTION][0].allowed_actions == {"wikipedia", "calculate"}
+
+    rewrite("validators: [{type: Nope}]")
+    assert not watcher.check()
+    assert len(errors) == 1
+    engine.validate(ValidationPoint.PRE_ACTION, {"action": "wikipedia"})
+    assert watcher.reloads == 2
+
+
+def test_watcher_keeps_policy_when_every_file_disappears(tmp_path, caplog):
+    policy_dir = tmp_path / "policies"
+    policy_dir.mkdir()
+    path = write_policy(policy_dir)
+    engine = CoreValidationEngine()
+    watcher = PolicyWatcher(engine, str(policy_dir), compiler=PolicyCompiler(use_cache=False))
+    assert watcher.check()
+    applied = engine.policy
+
+    os.remove(path)
+    assert not watcher.check()
+    assert engine.policy is applied
+    assert "No policy files found" in caplog.text
+    with pytest.raises(ValidationError):
+        engine.validate(ValidationPoint.PRE_ACTION, {"action": "rm"})
+
+    write_policy(policy_dir)
+    watcher.check()
+    assert engine.policy.digest == applied.digest
+
+
+def test_replay_shards_logs_across_processes(tmp_path):
+    from bumpers.logging.base import LogEvent
+    from bumpers.logging.file_logger import FileLogger
+    from bumpers.policy import replay
+
+    logger = FileLogger(str(tmp_path / "logs"))
+    actions = ["search", "rm", "calculate", "wikipedia"] * 50
+    for action in actions:
+        for validator_name in ("a", "b"):  # one event per validator, same step
+            logger.log_event(LogEvent(
+                timestamp=datetime.now(),
+                event_type="validation",
+                validation_point="pre_action",
+                validator_name=validator_name,
+                status="pass",
+                message="ok",
+                context={"action": action}
+            ))
+    logger.close()
+    policy = PolicyCompiler(cache_dir=str(tmp_path / "cache")).compile_file(write_policy(tmp_path))
+
+    serial = replay(str(tmp_path / "logs"), policy, processes=1)
+    parallel = replay(str(tmp_path / "logs"), policy, processes=2, shard_bytes=2048)
+
+    results = parallel[ValidationPoint.PRE_ACTION]
+    assert len(results) == len(actions)
+    assert list(results.failed_by) == list(serial[ValidationPoint.PRE_ACTION].failed_by)
+    assert results.blocked == [i for i, action in enumerate(actions) if action in ("search", "rm")]
+
+
+def test_replay_workers_start_with_spawn(tmp_path, monkeypatch):
+    import importlib
+    import multiprocessing
+    import pickle
+    from bumpers.policy import replay
+
+    _log_steps(tmp_path / "logs", [("validation", "a", "pass", action) for action in ["search", "rm"] * 40])
+    policy = PolicyCompiler(use_cache=False).compile_file(write_policy(tmp_path))
+    assert pickle.loads(pickle.dumps(policy)).validators(ValidationPoint.PRE_ACTION)[0].name == \
+        "allowed_actions+no_search"
+
+    # Spawned workers receive the compiled policy by pickle rather than inheriting it
+    replay_module = importlib.import_module("bumpers.policy.replay")
+    monkeypatch.setattr(replay_module, "multiprocessing", multiprocessing.get_context("spawn"))
+    import bumpers
+    src = os.path.dirname(os.path.dirname(os.path.abspath(bumpers.__file__)))
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join([src, os.environ.get("PYTHONPATH", "")]))
+    results = replay(str(tmp_path / "logs"), policy, processes=2, shard_bytes=512)[ValidationPoint.PRE_ACTION]
+    assert len(results) == 80
+    assert results.blocked == list(range(80))
+
+
+def test_shadow_replay_reports_verdict_changes(tmp_path):
+    from bumpers.logging.base import LogEvent
+    from bumpers.logging.file_logger import FileLogger
+    from bumpers.policy import PolicyParser, shadow_replay
+
+    # Recorded under a policy that allowed search but blocked rm
+    logger = FileLogger(str(tmp_path / "logs"))
+    actions = ["search", "rm", "calculate"] * 40
+    for action in actions:
+        for validator_name in ("allowed", "audit"):
+            failed = validator_name == "allowed" and action == "rm"
+            logger.log_event(LogEvent(
+                timestamp=datetime.now(),
+                event_type="validation",
+                validation_point="pre_action",
+                validator_name=validator_name,
+                status="fail" if failed else "pass",
+                message="no" if failed else "ok",
+                context={"action": action}
+            ))
+    logger.close()
+    candidate = PolicyParser.load_policy_file(write_policy(tmp_path))
+
+    report = shadow_replay(str(tmp_path / "logs"), candidate, processes=2, shard_bytes=1024, max_examples=5)
+
+    assert report.steps == len(actions)
+    assert report.summary()["newly_blocked"] == 40  # search is no longer allowed
+    assert report.summary()["newly_allowed"] == 0
+    assert report.blocked_before == 40 and report.blocked_after == 80
+    assert len(report.newly_blocked) == 5
+    assert report.newly_blocked[0].context == {"action": "search"}
+    assert report.newly_blocked[0].candidate == "allowed_actions+no_search"
+
+
+def _log_steps(path, steps):
+    from bumpers.logging.base import LogEvent
+    from bumpers.logging.file_logger import FileLogger
+
+    logger = FileLogger(str(path))
+    for event_type, validator_name, status, action in steps:
+        logger.log_event(LogEvent(
+            timestamp=datetime.now(),
+            event_type=event_type,
+            validation_point="pre_action",
+            validator_name=validator_name,
+            status=status,
+            message="",
+            context={"action": action}
+        ))
+    logger.close()
+
+
+def test_iter_steps_ignores_interleaved_shadow_events(tmp_path):
+    from bumpers.policy.replay import iter_steps, plan_shards
+
+    _log_steps(tmp_path / "logs", [
+        ("validation", "a", "pass", "rm"),
+        ("shadow_validation", "drift", "fail", "rm"),
+        ("validation", "b", "fail", "rm"),
+        ("intervention", "b", "intervention", "rm"),
+    ])
+
+    (shard,) = plan_shards(str(tmp_path / "logs"))
+    assert [step.blocked_by for step in iter_steps(shard)] == ["b"]
+
+
+def test_iter_steps_keeps_identical_consecutive_steps(tmp_path):
+    from bumpers.policy.replay import iter_steps, plan_shards
+
+    _log_steps(tmp_path / "logs", [
+        ("validation", "a", "pass", "search"),
+        ("validation", "b", "pass", "search"),
+        ("validation", "a", "pass", "search"),
+        ("validation", "b", "pass", "search"),
+        ("validation", "a", "fail", "search"),
+        ("intervention", "a", "intervention", "search"),
+        ("validation", "a", "pass", "search"),
+    ])
+
+    (shard,) = plan_shards(str(tmp_path / "logs"))
+    assert [step.blocked_by for step in iter_steps(shard)] == [None, None, "a", None]
+
+
+def test_shadow_replay_counts_live_engine_steps_once(tmp_path):
+    from bumpers.logging.file_logger import FileLogger
+    from bumpers.policy import PolicyParser, shadow_replay
+    from bumpers.validators.action import ActionWhitelistValidator
+
+    logger = FileLogger(str(tmp_path / "logs"))
+    engine = CoreValidationEngine(logger=logger)
+    engine.register_validator(ActionWhitelistValidator(["search", "calculate"], name="allowed"),
+                              ValidationPoint.PRE_ACTION)
+    engine.register_validator(ActionWhitelistValidator(["search", "calculate", "rm"], name="audit"),
+                              ValidationPoint.PRE_ACTION)
+    engine.register_shadow_validator(ActionWhitelistValidator(["calculate"], name="drift"),
+                                     ValidationPoint.PRE_ACTION)
+    actions = ["search", "search", "rm", "calculate"] * 25
+    for action in actions:
+        try:
+            engine.validate(ValidationPoint.PRE_ACTION, {"action": action})
+        except ValidationError:
+            pass
+    engine.shutdown()
+    logger.close()
+    assert len(logger.get_events(event_type="shadow_validation")) == len(actions)
+
+    candidate = PolicyParser.load_policy_file(write_policy(tmp_path))
+    report = shadow_replay(str(tmp_path / "logs"), candidate, processes=1, shard_bytes=2048)
+
+    assert report.steps == len(actions)
+    assert report.blocked_before == actions.count("rm")
+    assert report.blocked_after == actions.count("rm") + actions.count("search")
+
+
+def test_iter_steps_groups_interleaved_agents_by_step_id(tmp_path):
+    from bumpers.core.engine import STEP_ID_KEY
+    from bumpers.logging.base import LogEvent
+    from bumpers.logging.file_logger import FileLogger
+    from bumpers.policy.replay import iter_steps, plan_shards
+
+    logger = FileLogger(str(tmp_path / "logs"))
+    events = [
+        # (step, event_type, validator, status, extra context logged by the validator)
+        ("a-1", "validation", "screen", "pass", {"analysis": {"safe": True}}),
+        ("b-1", "validation", "screen", "pass", {"analysis": {"safe": False}}),
+        ("a-1", "validation", "allowed", "pass", {}),
+        ("b-1", "validation", "allowed", "fail", {}),
+        ("b-1", "intervention", "allowed", "intervention", {"intervention_type": "block_action"}),
+        ("a-2", "validation", "screen", "pass", {}),
+    ]
+    for step, event_type, validator_name, status, extra in events:
+        logger.log_event(LogEvent(
+            timestamp=datetime.now(),
+            event_type=event_type,
+            validation_point="pre_action",
+            validator_name=validator_name,
+            status=status,
+            message="",
+            context={"action": "rm" if step.startswith("b") else "search", **extra, STEP_ID_KEY: step}
+        ))
+
+    (shard,) = plan_shards(str(tmp_path / "logs"))
+    steps = list(iter_steps(shard))
+    assert [(step.context["action"], step.blocked_by) for step in steps] == [
+        ("search", None), ("rm", "allowed"), ("search", None)
+    ]
+    assert STEP_ID_KEY not in steps[0].context
@@ -0,0 +1,241 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from PIL import Image
+
+from bumpers.validators.batching import GeminiBatchScheduler
+from bumpers.validators.cache import LRUCache, SQLiteCache, TieredCache, make_cache_key
+from bumpers.validators.phash import FrameDeduplicator, dhash, hamming_distance
+from bumpers.validators.preprocess import ScreenshotPreprocessor
+from bumpers.validators.vision import VisionValidator
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    def __init__(self, text='```json\n{"is_safe": true, "concerns": []}\n```'):
+        self.text = text
+        self.calls = 0
+
+    def generate_content(self, parts):
+        self.calls += 1
+        return FakeResponse(self.text)
+
+
+def screenshot(color=(255, 255, 255)):
+    buffer = BytesIO()
+    Image.new("RGB", (32, 32), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_lru_cache_evicts_and_expires():
+    cache = LRUCache(max_size=2, ttl=0.05)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    cache.set("c", {"v": 3})
+
+    assert cache.get("a") is None
+    assert cache.get("c") == {"v": 3}
+    time.sleep(0.06)
+    assert cache.get("c") is None
+    assert cache.metrics.to_dict()["evictions"] == 1
+    assert cache.metrics.expirations == 1
+    assert cache.metrics.hits == 1
+
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    disk = SQLiteCache(str(tmp_path / "cache.db"))
+    disk.set("key", {"is_safe": False})
+    cache = TieredCache(LRUCache(), disk)
+
+    assert cache.get("key") == {"is_safe": False}
+    assert cache.memory.get("key") == {"is_safe": False}
+    assert cache.metrics.hits == 1
+
+
+def test_cache_key_depends_on_image_prompt_and_model():
+    keys = {
+        make_cache_key(b"img", "prompt", "model"),
+        make_cache_key(b"img2", "prompt", "model"),
+        make_cache_key(b"img", "prompt2", "model"),
+        make_cache_key(b"img", "prompt", "model2"),
+    }
+    assert len(keys) == 4
+
+
+def test_vision_validator_reuses_cached_verdict_for_repeated_frames():
+    validator = VisionValidator("No login pages", api_key="test", cache=LRUCache())
+    validator.model = FakeModel()
+    frame = screenshot()
+
+    first = validator.validate({"screenshot": frame, "action": "click"})
+    second = validator.validate({"screenshot": frame, "action": "click"})
+    validator.validate({"screenshot": screenshot((0, 0, 0))})
+
+    assert first.passed and second.passed
+    assert "screenshot" not in second.context
+    assert validator.model.calls == 2
+    assert validator.cache.metrics.hits == 1
+
+
+def test_unparseable_answers_are_not_cached():
+    validator = VisionValidator("No login pages", api_key="test", cache=LRUCache())
+    validator.model = FakeModel(text="I am not sure")
+    frame = screenshot()
+
+    validator.validate({"screenshot": frame})
+    validator.validate({"screenshot": frame})
+
+    assert validator.model.calls == 2
+
+
+def test_near_duplicate_frames_reuse_verdict():
+    validator = VisionValidator("No login pages", api_key="test", frame_dedup=FrameDeduplicator(max_distance=4))
+    validator.model = FakeModel()
+    base = Image.linear_gradient("L").rotate(90).convert("RGB").resize((320, 240))
+    blinked = base.copy()
+    blinked.putpixel((10, 10), (255, 0, 0))  # cursor blink
+    frames = []
+    for image in (base, blinked):
+        buffer = BytesIO()
+        image.save(buffer, "PNG")
+        frames.append(buffer.getvalue())
+
+    validator.validate({"screenshot": frames[0]})
+    result = validator.validate({"screenshot": frames[1]})
+    validator.validate({"screenshot": screenshot((0, 0, 0))})
+
+    assert result.passed
+    assert validator.model.calls == 2
+    assert validator.frame_dedup.hits == 1
+
+
+def test_shared_frame_dedup_keeps_verdicts_per_prompt():
+    dedup = FrameDeduplicator()
+    validators = [VisionValidator(rule, api_key="test", frame_dedup=dedup)
+                  for rule in ("No login pages", "No payment forms")]
+    validators[0].model = FakeModel('{"is_safe": false, "concerns": ["login form"]}')
+    validators[1].model = FakeModel()
+    frame = screenshot()
+
+    results = [validator.validate({"screenshot": frame}) for validator in validators]
+
+    assert [result.passed for result in results] == [False, True]
+    assert [validator.model.calls for validator in validators] == [1, 1]
+    assert dedup.hits == 0
+
+
+def test_dhash_distance_separates_different_frames():
+    gradient = Image.linear_gradient("L").convert("RGB")
+
+    assert hamming_distance(dhash(gradient), dhash(gradient.copy())) == 0
+    assert hamming_distance(dhash(gradient), dhash(gradient.rotate(90))) > 10
+
+
+def test_preprocessor_shrinks_uploaded_screenshots():
+    preprocessor = ScreenshotPreprocessor(max_edge=480, format="webp", quality=60, crop=(0, 0, 1920, 540))
+    validator = VisionValidator("No login pages", api_key="test", preprocessor=preprocessor)
+    validator.model = FakeModel()
+    buffer = BytesIO()
+    Image.effect_noise((1920, 1080), 40).convert("RGB").save(buffer, "PNG")
+
+    result = validator.validate({"screenshot": buffer.getvalue()})
+    payload = preprocessor.process(Image.open(BytesIO(buffer.getvalue())))
+    metrics = validator.payload_metrics.to_dict()
+
+    assert result.passed
+    assert payload["mime_type"] == "image/webp"
+    assert Image.open(BytesIO(payload["data"])).size == (480, 135)
+    assert metrics["requests"] == 1
+    assert metrics["sent_bytes"] < metrics["original_bytes"] / 10
+
+
+class FakeBatchModel:
+    def __init__(self):
+        self.requests = []
+
+    def generate_content(self, parts):
+        self.requests.append(parts)
+        images = [p for p in parts if not isinstance(p, str)]
+        if len(images) == 1:
+            return FakeResponse('```json\n{"is_safe": true, "concerns": []}\n```')
+        answers = [{"is_safe": i % 2 == 0, "concerns": [f"image {i}"]} for i in range(len(images))]
+        return FakeResponse("```json\n" + json.dumps(answers) + "\n```")
+
+
+def test_batch_scheduler_fans_answers_back_to_callers():
+    model = FakeBatchModel()
+    scheduler = GeminiBatchScheduler(model=model, max_batch_size=4, max_wait=0.2)
+    validator = VisionValidator("No login pages", api_key="test", batcher=scheduler)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(validator.validate, {"screenshot": screenshot((i, i, i))}) for i in range(4)]
+        results = [f.result() for f in futures]
+    scheduler.close()
+
+    assert len(model.requests) == 1
+    assert sorted(r.passed for r in results) == [False, False, True, True]
+    assert scheduler.stats["images"] == 4
+
+
+def test_batch_fallbacks_run_on_caller_threads():
+    import threading
+
+    class UnmatchedBatchModel(FakeModel):
+        def __init__(self):
+            super().__init__()
+            self.threads = []
+
+        def generate_content(self, parts):
+            self.threads.append(threading.current_thread().name)
+            if sum(not isinstance(p, str) for p in parts) > 1:
+                return FakeResponse("```json\n[]\n```")  # no answer for any image
+            return super().generate_content(parts)
+
+    model = UnmatchedBatchModel()
+    scheduler = GeminiBatchScheduler(model=model, max_batch_size=4, max_wait=0.2)
+    validator = VisionValidator("No login pages", api_key="test", batcher=scheduler)
+
+    with ThreadPoolExecutor(max_workers=4, thread_name_prefix="caller") as pool:
+        futures = [pool.submit(validator.validate, {"screenshot": screenshot((i, i, i))}) for i in range(4)]
+        results = [f.result() for f in futures]
+    scheduler.close()
+
+    assert all(result.passed for result in results)
+    assert scheduler.stats["fallbacks"] == 1
+    assert model.threads[0] == "bumpers-gemini-batcher"
+    assert len(model.threads) == 5
+    assert all(name.startswith("caller") for name in model.threads[1:])
+
+
+def test_batch_scheduler_resolves_every_request_when_closed_during_submits():
+    import threading
+
+    scheduler = GeminiBatchScheduler(model=FakeModel(), max_batch_size=4, max_wait=0.01)
+    futures, rejected = [], []
+    start = threading.Event()
+
+    def submit_many():
+        start.wait()
+        for _ in range(50):
+            try:
+                futures.append(scheduler.submit("prompt", b"image"))
+            except RuntimeError:
+                rejected.append(1)
+
+    threads = [threading.Thread(target=submit_many) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    start.set()
+    scheduler.close()
+    for thread in threads:
+        thread.join()
+
+    for future in futures:
+        future.exception(timeout=2)  # resolved one way or the other, never left hanging
+    assert len(futures) + len(rejected) == 200
@@ -0,0 +1,91 @@
+import threading
+from datetime import datetime, timedelta
+
+from bumpers.logging.base import LogEvent
+from bumpers.logging.segmented_logger import SegmentedFileLogger
+
+
+def make_event(timestamp, i, event_type="validation"):
+    return LogEvent(
+        timestamp=timestamp,
+        event_type=event_type,
+        validation_point="pre_action",
+        validator_name="action_whitelist",
+        status="pass",
+        message=f"event {i}",
+        context={"turn": i}
+    )
+
+
+def test_segmented_logger_partitions_and_queries_by_window(tmp_path):
+    logger = SegmentedFileLogger(str(tmp_path), segment="hour", block_size=10)
+    start = datetime(2024, 12, 21, 10, 0)
+    for i in range(300):
+        event_type = "intervention" if i % 50 == 0 else "validation"
+        logger.log_event(make_event(start + timedelta(minutes=i), i, event_type))
+
+    window = logger.get_events(start_time=start + timedelta(hours=2), end_time=start + timedelta(hours=2, minutes=9))
+    interventions = logger.get_events(event_type="intervention")
+
+    assert len(list(tmp_path.glob("bumpers_*.jsonl"))) == 5
+    assert [e.message for e in window] == [f"event {i}" for i in range(120, 130)]
+    assert isinstance(window[0].timestamp, datetime)
+    assert [e.message for e in interventions] == [f"event {i}" for i in range(0, 300, 50)]
+
+
+def test_segmented_logger_recovers_index_after_restart(tmp_path):
+    start = datetime(2024, 12, 21, 10, 0)
+    first = SegmentedFileLogger(str(tmp_path), block_size=4)
+    for i in range(6):
+        first.log_event(make_event(start + timedelta(seconds=i), i))
+    first.flush()
+    # No close(): the last two events are only covered by the unsealed block
+    with open(next(tmp_path.glob("bumpers_*.jsonl")), "ab") as f:
+        f.write(b'{"timestamp": "2024-12-21T10:00:06", "event_')  # cut short by a crash
+
+    second = SegmentedFileLogger(str(tmp_path), block_size=4)
+    for i in range(6, 10):
+        second.log_event(make_event(start + timedelta(seconds=i), i))
+    second.close()
+
+    assert len(second.get_events()) == 10
+    assert len(second.get_events(start_time=start + timedelta(seconds=8))) == 2
+
+
+def test_segmented_logger_keeps_boundary_segments_open(tmp_path):
+    logger = SegmentedFileLogger(str(tmp_path), block_size=100)
+    boundary = datetime(2024, 12, 21, 11, 0)
+    for i in range(40):
+        # Two agents straddling the hour boundary, logging slightly out of order
+        offset = timedelta(seconds=-1 if i % 2 else 1)
+        logger.log_event(make_event(boundary + offset, i))
+
+    assert len(logger.get_events()) == 40
+    logger.close()
+    indexes = sorted(tmp_path.glob("*.idx"))
+    assert [len(path.read_text().splitlines()) for path in indexes] == [1, 1]
+
+
+def test_segmented_logger_reads_do_not_block_writes(tmp_path):
+    logger = SegmentedFileLogger(str(tmp_path), block_size=50)
+    start = datetime(2024, 12, 21, 10, 0)
+    for i in range(2000):
+        logger.log_event(make_event(start + timedelta(milliseconds=i), i))
+
+    original = logger._read_range
+    written = []
+
+    def slow_read(*args):
+        if not written:
+            # A write issued while a query is reading must not wait for it
+            thread = threading.Thread(target=logger.log_event, args=(make_event(start, -1),))
+            thread.start()
+            thread.join(timeout=5)
+            written.append(not thread.is_alive())
+        return original(*args)
+
+    logger._read_range = slow_read
+    assert len(logger.get_events()) == 2000
+    logger.close()
+    assert written == [True]
+    assert len(logger.get_events()) == 2001
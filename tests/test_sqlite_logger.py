@@ -0,0 +1,88 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from bumpers.logging.base import LogEvent
+from bumpers.logging.sqlite_logger import SQLiteLogger
+
+
+def make_event(timestamp, i, event_type="validation"):
+    return LogEvent(
+        timestamp=timestamp,
+        event_type=event_type,
+        validation_point="pre_output",
+        validator_name="content_filter",
+        status="fail" if i % 2 else "pass",
+        message=f"event {i}",
+        context={"output": "x" * i}
+    )
+
+
+def test_sqlite_logger_filters_in_sql(tmp_path):
+    logger = SQLiteLogger(str(tmp_path / "events.db"), batch_size=16)
+    start = datetime(2024, 12, 21, 10, 0)
+    for i in range(100):
+        event_type = "intervention" if i % 10 == 0 else "validation"
+        logger.log_event(make_event(start + timedelta(seconds=i), i, event_type))
+
+    window = logger.get_events(start_time=start + timedelta(seconds=20), end_time=start + timedelta(seconds=29))
+    interventions = logger.get_events(event_type="intervention", start_time=start + timedelta(seconds=50))
+    logger.close()
+
+    assert [e.message for e in window] == [f"event {i}" for i in range(20, 30)]
+    assert window[0].timestamp == start + timedelta(seconds=20)
+    assert window[1].context == {"output": "x" * 21}
+    assert [e.message for e in interventions] == ["event 50", "event 60", "event 70", "event 80", "event 90"]
+
+
+def test_sqlite_logger_persists_across_instances(tmp_path):
+    path = str(tmp_path / "events.db")
+    first = SQLiteLogger(path)
+    first.log_event(make_event(datetime.now(), 1))
+    first.close()
+
+    second = SQLiteLogger(path)
+    assert len(second.get_events()) == 1
+    second.close()
+
+
+def test_sqlite_logger_rejects_events_after_close(tmp_path):
+    logger = SQLiteLogger(str(tmp_path / "events.db"))
+    logger.log_event(make_event(datetime.now(), 1))
+    logger.close()
+
+    with pytest.raises(RuntimeError, match="closed"):
+        logger.log_event(make_event(datetime.now(), 2))
+
+
+def test_sqlite_logger_inserts_full_batches_off_the_caller_thread(tmp_path):
+    logger = SQLiteLogger(str(tmp_path / "events.db"), batch_size=10, flush_interval=60)
+    inserts = []
+    logger._conn.set_trace_callback(
+        lambda sql: sql.startswith("INSERT") and inserts.append(threading.current_thread().name)
+    )
+    for i in range(25):
+        logger.log_event(make_event(datetime.now(), i))
+    deadline = time.monotonic() + 5
+    while not inserts and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert inserts and set(inserts) == {"bumpers-sqlite-logger"}
+    assert len(logger.get_events()) == 25
+    logger.close()
+
+
+def test_sqlite_logger_keeps_timezone_aware_instants(tmp_path):
+    logger = SQLiteLogger(str(tmp_path / "events.db"))
+    plus_two = timezone(timedelta(hours=2))
+    start = datetime(2024, 12, 21, 12, 0, tzinfo=plus_two)  # 10:00 UTC
+    for i in range(4):
+        logger.log_event(make_event(start + timedelta(minutes=i), i))
+
+    events = logger.get_events(start_time=datetime(2024, 12, 21, 10, 2, tzinfo=timezone.utc))
+    logger.close()
+
+    assert [e.timestamp for e in events] == [start + timedelta(minutes=2), start + timedelta(minutes=3)]
+    assert events[0].timestamp.utcoffset() == timedelta(0)